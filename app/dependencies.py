@@ -1,42 +1,130 @@
 from fastapi import HTTPException, status, Cookie
 from jose import jwt, JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+from dotenv import load_dotenv
+from collections import OrderedDict
+import hashlib
 import os
+import threading
+import time
 
-# 환경 변수 또는 하드코딩된 키
-SECRET_KEY = "RANDOM_SECRET_KEY"
-ALGORITHM = "HS256"
-ISSUER = "simple-auth-server"
+load_dotenv()
 
-def get_current_user(access_token: str | None = Cookie(default=None, alias="ACCESS_TOKEN")):
+# Java 인증 서버(JwtUtil)와 반드시 맞춰야 하는 설정
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", "RANDOM_SECRET_KEY")
+# 키 교체 중에는 이전 키로 서명된 토큰도 만료될 때까지 받아 줌 (쉼표로 구분)
+PREVIOUS_SECRET_KEYS = [key for key in os.getenv("JWT_PREVIOUS_SECRET_KEYS", "").split(",") if key]
+ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+ISSUER = os.getenv("JWT_ISSUER", "simple-auth-server")
+
+# 검증을 마친 토큰을 기억해 두는 개수. 같은 쿠키로 오는 요청은 서명 검증 없이 통과
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+# exp가 없는 토큰을 캐시에 두는 최대 시간 (초)
+AUTH_CACHE_MAX_TTL = float(os.getenv("AUTH_CACHE_MAX_TTL", "300"))
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+class TokenCache:
     """
-    Java 서버에서 발급한 쿠키를 검증하여 유저 정보를 반환합니다.
+    검증된 JWT의 사용자 정보를 토큰 해시로 보관하는 LRU. 항목은 토큰의 exp 시각에 만료되고,
+    키를 바꾸면(set_keys) 이전 키로 검증한 항목이 남지 않도록 모두 비웁니다.
+    """
+
+    def __init__(self, keys: list[str], max_entries: int = AUTH_CACHE_SIZE):
+        self.keys = list(keys)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def set_keys(self, current: str, previous: list[str] | tuple[str, ...] = ()):
+        with self._lock:
+            self.keys = [current, *previous]
+            self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def _decode(self, token: str) -> dict:
+        error: JWTError | None = None
+        for key in self.keys:
+            try:
+                return jwt.decode(token, key, algorithms=[ALGORITHM], issuer=ISSUER)
+            except (ExpiredSignatureError, JWTClaimsError):
+                # 서명은 맞았으므로 다른 키로 다시 볼 필요 없음
+                raise
+            except JWTError as e:
+                error = e
+        raise error or JWTError("서명 키가 설정되지 않았습니다.")
+
+    def authenticate(self, token: str) -> dict:
+        digest = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                if now < entry[1]:
+                    self._entries.move_to_end(digest)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[digest]
+            self.misses += 1
+            keys = self.keys
+
+        try:
+            payload = self._decode(token)
+        except JWTError:
+            raise _unauthorized("Invalid or expired token")
+
+        user_id = payload.get("sub")
+        username = payload.get("username")
+        # Java 인증 서버는 두 클레임을 항상 넣어 발급하므로, 하나라도 없으면 거절
+        if user_id is None or username is None:
+            raise _unauthorized("Invalid token payload")
+        user = {"id": user_id, "username": username}
+
+        exp = payload.get("exp")
+        expires_at = float(exp) if isinstance(exp, (int, float)) else now + AUTH_CACHE_MAX_TTL
+        with self._lock:
+            # 검증하는 사이에 키가 바뀌었다면 결과를 캐시에 남기지 않음
+            if keys is self.keys and self.max_entries > 0:
+                self._entries[digest] = (user, expires_at)
+                self._entries.move_to_end(digest)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return user
+
+
+token_cache = TokenCache([SECRET_KEY, *PREVIOUS_SECRET_KEYS])
+
+
+def authenticate(access_token: str | None) -> dict:
+    """
+    Java 서버에서 발급한 ACCESS_TOKEN(JWT)을 검증하여 유저 정보를 반환합니다.
+    WebSocket처럼 의존성을 쓸 수 없는 곳에서는 쿠키 값을 직접 넘겨 호출합니다.
     """
     if access_token is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated (no ACCESS_TOKEN cookie)",
-        )
-
-    try:
-        payload = jwt.decode(
-            access_token,
-            SECRET_KEY,
-            algorithms=[ALGORITHM],
-            issuer=ISSUER,
-        )
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-        )
-
-    user_id = payload.get("sub")
-    username = payload.get("username")
-
-    if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
-
-    return {"id": user_id, "username": username}
\ No newline at end of file
+        raise _unauthorized("Not authenticated (no ACCESS_TOKEN cookie)")
+    return token_cache.authenticate(access_token)
+
+
+async def get_current_user(access_token: str | None = Cookie(default=None, alias="ACCESS_TOKEN")):
+    """
+    Java 서버에서 발급한 쿠키를 검증하여 유저 정보를 반환합니다.
+    (async 의존성이라 요청마다 스레드 풀을 거치지 않음)
+    """
+    return authenticate(access_token)
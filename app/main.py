@@ -4,18 +4,47 @@
 from fastapi import FastAPI, Depends, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
 # 라우터 및 의존성 임포트
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, token_cache
 from app.routers.generator import router as generator_router
+from app.routers.stt_router import router as stt_router
+from app.routers.batch_router import router as batch_router
+from app.routers.tts_router import router as tts_router
+from app.routers.stt_tts_router import router as stt_tts_router
+from app.services.knowledge_service import knowledge_index
+from app.services.prompt_builder import get_encoding
+from app.services.audio_cache import audio_cache
+from app.services.voice_registry import voice_registry
+from app.services.http_clients import upstreams
+from app.services.translation_cache import translation_cache
+from app.services.stt_preprocess import upload_stats
+from app.services.job_queue import job_queue
+from app.services.upload_sweeper import upload_sweeper
+from app.services.resilience import UpstreamError
+from app.services.admission import AdmissionMiddleware
+from app.services.stt_service import STT_BACKEND
+from app.services.whisper_engine import whisper_engine
+from app.utils.concurrency import run_blocking
+from app.utils.metrics import registry, TimingMiddleware
+from app.utils.static_pages import StaticPageCache
+import logging
+import os
 # 필요한 경우 다른 라우터도 임포트
 
 # 환경 변수 로드
 load_dotenv()
 
+# 앱 모듈의 logger 출력 (uvicorn은 자기 logger만 설정하므로 root를 따로 설정해야 INFO 로그가 보임)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+
 # 경로 설정 (pathlib 사용 권장)
 APP_DIR = Path(__file__).resolve().parent
 STATIC_DIR = APP_DIR / "static"
@@ -25,7 +54,44 @@ UPLOAD_DIR = APP_DIR / "routers" / "uploads"
 STATIC_DIR.mkdir(parents=True, exist_ok=True)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-app = FastAPI()
+# 로그인 후 보여 주는 페이지. 메모리에 올려 압축본과 함께 제공
+pages = StaticPageCache(STATIC_DIR, ["select.html", "process.html", "result.html"])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 도메인 용어집은 요청마다 읽지 않고 시작 시 한 번 색인 (이후 백그라운드에서 파일 변경을 확인해 재색인)
+    await run_blocking(knowledge_index.reload, True)
+    knowledge_index.start()
+    # HTML 페이지를 읽어 gzip/brotli 압축본을 미리 만듦 (이후 백그라운드에서 파일 변경을 확인해 다시 만듦)
+    await run_blocking(pages.reload, True)
+    pages.start()
+    # tiktoken 인코더는 첫 로딩 시 BPE 파일을 읽으므로(최초 1회 다운로드) 요청 전에 준비
+    await run_blocking(get_encoding)
+    # 디스크에 남아 있는 TTS 캐시 색인
+    await run_blocking(audio_cache.load)
+    # 사용자별 Voice ID를 메모리에 올림 (user_voice_map.json이 있으면 가져옴)
+    await run_blocking(voice_registry.load)
+    # OpenAI/ElevenLabs 연결 풀 (요청마다 새로 연결하지 않도록 앱 수명 동안 재사용)
+    upstreams.open()
+    # 로컬 STT를 쓰는 경우 모델을 요청마다가 아니라 시작 시 한 번만 올림
+    if STT_BACKEND == "local":
+        await run_blocking(whisper_engine.load)
+    # generate-content job 모드의 작업 대기열 워커
+    job_queue.start()
+    # uploads 디렉터리의 오래된 파일 정리 (보관 시간, 전체 용량 한도)
+    upload_sweeper.start()
+    yield
+    await upload_sweeper.stop()
+    await knowledge_index.stop()
+    await pages.stop()
+    await job_queue.stop()
+    await upstreams.aclose()
+
+app = FastAPI(lifespan=lifespan)
+
+# 업스트림을 쓰는 요청(generate-content, batch, voice-sample, STT, TTS)의 전체/사용자별 동시 처리 수 제한. 넘치면 429/503 + Retry-After
+# (CORS 안쪽에 두어 거절 응답에도 CORS 헤더가 붙도록 먼저 등록)
+app.add_middleware(AdmissionMiddleware)
 
 # CORS 설정 (프론트엔드와 포트가 다를 경우 필요)
 app.add_middleware(
@@ -36,41 +102,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청별 단계 시간 측정 (Server-Timing 헤더, /metrics 히스토그램)
+app.add_middleware(TimingMiddleware)
+
+# 업스트림(OpenAI/ElevenLabs) 장애는 어느 라우터에서 나든 같은 형식으로 응답
+@app.exception_handler(UpstreamError)
+async def upstream_error_handler(request: Request, exc: UpstreamError):
+    headers = {"Retry-After": str(max(1, round(exc.retry_after)))} if exc.retry_after is not None else None
+    return JSONResponse(
+        status_code=exc.http_status,
+        content={"detail": exc.detail, "upstream": exc.upstream, "upstream_status": exc.status_code},
+        headers=headers,
+    )
+
 # 1. 정적 파일 마운트 (Uploads 폴더 접근 허용)
 # 결과 오디오 파일에 접근하기 위해 필요합니다.
 app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
 # 2. 라우터 등록
 app.include_router(generator_router, prefix="/api")
+app.include_router(stt_router, prefix="/stt")
+app.include_router(batch_router, prefix="/api")
+app.include_router(tts_router, prefix="/tts")
+app.include_router(stt_tts_router, prefix="/stt-tts")
 
-# 3. HTML 페이지 라우팅 (보안 적용)
-def _must_exist(p: Path):
-    if not p.exists():
-        return False
-    return True
+# 설정하면 /metrics 조회 시 Authorization: Bearer <METRICS_TOKEN> 이 필요
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+def _cache_metrics():
+    tts = audio_cache.stats()
+    auth = token_cache.stats()
+    translation = translation_cache.stats()
+    uploads = upload_sweeper.stats()
+    return [
+        ("voice_app_tts_cache_requests_total", "counter", "TTS 오디오 캐시 조회 수",
+         [({"result": "hit"}, tts["hits"]), ({"result": "miss"}, tts["misses"])]),
+        ("voice_app_tts_cache_hit_ratio", "gauge", "TTS 오디오 캐시 적중률", [({}, tts["hit_ratio"])]),
+        ("voice_app_tts_cache_bytes", "gauge", "TTS 오디오 캐시 디스크 사용량", [({}, tts["bytes"])]),
+        ("voice_app_translation_cache_requests_total", "counter", "번역 캐시 조회 수",
+         [({"result": "memory_hit"}, translation["memory_hits"]), ({"result": "db_hit"}, translation["db_hits"]),
+          ({"result": "miss"}, translation["misses"])]),
+        ("voice_app_translation_cache_hit_ratio", "gauge", "번역 캐시 적중률", [({}, translation["hit_ratio"])]),
+        ("voice_app_stt_uploads_total", "counter", "STT 전처리한 업로드 수", [({}, upload_stats["requests"])]),
+        ("voice_app_stt_silent_skipped_total", "counter", "음성이 없어 STT를 건너뛴 업로드 수", [({}, upload_stats["silent_skipped"])]),
+        ("voice_app_stt_upload_bytes_total", "counter", "STT 업로드 바이트 (original: 받은 크기, uploaded: API로 보낸 크기)",
+         [({"kind": "original"}, upload_stats["bytes_original"]), ({"kind": "uploaded"}, upload_stats["bytes_uploaded"])]),
+        ("voice_app_stt_trimmed_seconds_total", "counter", "잘라 낸 앞뒤 무음 길이", [({}, upload_stats["seconds_trimmed"])]),
+        ("voice_app_voice_registry_users", "gauge", "Voice ID가 등록된 사용자 수", [({}, voice_registry.stats()["users"])]),
+        ("voice_app_job_queue_pending", "gauge", "대기 중인 generate-content 작업 수", [({}, job_queue.pending())]),
+        ("voice_app_uploads_bytes", "gauge", "uploads 디렉터리 사용량 (마지막 정리 시점)", [({}, uploads["bytes"])]),
+        ("voice_app_uploads_files", "gauge", "uploads 디렉터리 파일 수 (마지막 정리 시점)", [({}, uploads["files"])]),
+        ("voice_app_uploads_removed_total", "counter", "정리 작업이 지운 uploads 파일 수",
+         [({"reason": reason}, count) for reason, count in uploads["removed"].items()]),
+        ("voice_app_auth_cache_requests_total", "counter", "검증된 JWT 캐시 조회 수",
+         [({"result": "hit"}, auth["hits"]), ({"result": "miss"}, auth["misses"])]),
+        ("voice_app_auth_cache_entries", "gauge", "캐시에 있는 검증된 JWT 수", [({}, auth["entries"])]),
+    ]
 
+registry.add_collector(_cache_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus 수집용 (단계별 시간 히스토그램, 캐시 적중률, 업스트림 오류율)"""
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        return Response(status_code=401)
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# 3. HTML 페이지 라우팅 (보안 적용)
 @app.get("/select.html", include_in_schema=False)
-async def select_page(current_user: dict = Depends(get_current_user)):
-    if _must_exist(STATIC_DIR / "select.html"):
-        return FileResponse(STATIC_DIR / "select.html")
-    return Response(status_code=404)
+async def select_page(request: Request, current_user: dict = Depends(get_current_user)):
+    return pages.response(request, "select.html")
 
 @app.get("/process.html", include_in_schema=False)
-async def process_page(current_user: dict = Depends(get_current_user)):
-    if _must_exist(STATIC_DIR / "process.html"):
-        return FileResponse(STATIC_DIR / "process.html")
-    return Response(status_code=404)
+async def process_page(request: Request, current_user: dict = Depends(get_current_user)):
+    return pages.response(request, "process.html")
 
 @app.get("/result.html", include_in_schema=False)
-async def result_page(current_user: dict = Depends(get_current_user)):
-    if _must_exist(STATIC_DIR / "result.html"):
-        return FileResponse(STATIC_DIR / "result.html")
-    return Response(status_code=404)
+async def result_page(request: Request, current_user: dict = Depends(get_current_user)):
+    return pages.response(request, "result.html")
 
 # 루트 접속 시 리다이렉트 (선택 사항)
 @app.get("/")
-async def root(current_user: dict = Depends(get_current_user)):
-    return FileResponse(STATIC_DIR / "select.html")
+async def root(request: Request, current_user: dict = Depends(get_current_user)):
+    return pages.response(request, "select.html")
 
 # 실행
 if __name__ == "__main__":
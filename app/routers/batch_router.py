@@ -0,0 +1,101 @@
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.responses import StreamingResponse, FileResponse
+import json
+import os
+import re
+import time
+import uuid
+
+from app.dependencies import get_current_user
+from app.services.batch_service import BATCH_ALLOWED_VOICES, BATCH_DIR, parse_records, run_batch, sweep_expired_batches, zip_audio
+from app.services.voice_registry import voice_registry
+from app.utils.concurrency import run_blocking
+
+router = APIRouter()
+
+_BATCH_ID = re.compile(r"^[0-9a-f]{32}$")
+_AUDIO_NAME = re.compile(r"^[A-Za-z0-9._-]{1,100}\.mp3$")
+
+
+def _batch_dir(user_id: str, batch_id: str) -> str:
+    if not _BATCH_ID.match(batch_id):
+        raise HTTPException(status_code=404, detail="배치를 찾을 수 없습니다.")
+    path = os.path.join(BATCH_DIR, str(user_id), batch_id)
+    if not os.path.isdir(path):
+        raise HTTPException(status_code=404, detail="배치를 찾을 수 없습니다.")
+    return path
+
+
+@router.post("/batch")
+async def create_batch(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    JSONL({"id"?, "text", "target_lang", "domain"?, "voice"?} 줄들)을 받아 일괄 번역 + TTS.
+    결과는 레코드가 끝나는 대로 JSONL로 스트리밍하고, 마지막 줄에 요약과 zip 주소를 보냅니다.
+    voice가 없는 레코드는 요청한 사용자의 등록된 목소리를 사용합니다.
+    voice에는 본인의 등록된 목소리나 BATCH_ALLOWED_VOICES에 있는 목소리만 지정할 수 있습니다 (다른 사용자의 복제 목소리 사용 방지).
+    연결이 끊기면 처리도 중단되므로, 수천 건 단위의 야간 작업은 CLI(python -m app.services.batch_service)를 권장합니다.
+    """
+    user_id = current_user["id"]
+    try:
+        records = parse_records((await file.read()).decode("utf-8-sig").splitlines())
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not records:
+        raise HTTPException(status_code=400, detail="레코드가 없습니다.")
+
+    default_voice = await voice_registry.lookup(str(user_id))
+    forbidden = [
+        record.id for record in records
+        if record.voice is not None and record.voice != default_voice and record.voice not in BATCH_ALLOWED_VOICES
+    ]
+    if forbidden:
+        raise HTTPException(status_code=403, detail=f"사용할 수 없는 voice가 지정된 레코드: {forbidden[:10]}")
+
+    await run_blocking(sweep_expired_batches)
+    batch_id = uuid.uuid4().hex
+    out_dir = os.path.join(BATCH_DIR, str(user_id), batch_id)
+
+    async def lines():
+        started = time.perf_counter()
+        failed = 0
+        async for result in run_batch(records, out_dir, default_voice):
+            if "audio" in result:
+                result["audio_url"] = f"/api/batch/{batch_id}/audio/{result['audio']}"
+            failed += "error" in result
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+        yield json.dumps({
+            "batch_id": batch_id,
+            "records": len(records),
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+            "zip_url": f"/api/batch/{batch_id}/audio.zip",
+        }, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers={"X-Batch-Id": batch_id})
+
+
+@router.get("/batch/{batch_id}/audio.zip")
+async def get_batch_zip(
+    batch_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    out_dir = _batch_dir(current_user["id"], batch_id)
+    zip_path = out_dir + ".zip"
+    await run_blocking(zip_audio, out_dir, zip_path)
+    return FileResponse(zip_path, media_type="application/zip", filename=f"{batch_id}.zip")
+
+
+@router.get("/batch/{batch_id}/audio/{name}")
+async def get_batch_audio(
+    batch_id: str,
+    name: str,
+    current_user: dict = Depends(get_current_user)
+):
+    out_dir = _batch_dir(current_user["id"], batch_id)
+    path = os.path.join(out_dir, name)
+    if not _AUDIO_NAME.match(name) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="오디오를 찾을 수 없습니다.")
+    return FileResponse(path, media_type="audio/mpeg")
@@ -1,122 +1,402 @@
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, FileResponse, JSONResponse
 import urllib.parse  # 한글 헤더 인코딩용
 
 # 서비스 모듈들
-from app.services.clone_service import get_or_create_voice_id, generate_speech_stream
-from app.services.stt_service import transcribe_audio_file_local, convert_webm_to_wav
-from app.services.processor_service import get_gpt_response
+from app.services.clone_service import get_or_create_voice_id, prewarm_voice, release_sample, generate_speech_stream, generate_speech_stream_pipelined
+from app.services.stt_service import transcribe_audio
+from app.services.voice_registry import voice_registry
+from app.services.translation_service import translate, back_translate, stream_translation
+from app.services.result_store import result_store
+from app.services.job_queue import job_queue, PRIORITIES, QueueFull
+from app.services.batch_service import BATCH_DIR, BatchRecord, run_batch, sweep_expired_batches
+from app.services.knowledge_service import find_domain_entries
+from app.services.resilience import UpstreamError
 from app.dependencies import get_current_user 
+from app.utils.concurrency import run_blocking, prefetch
+from app.utils.text_utils import iter_sentences
+from app.utils.audio_decode import save_clone_sample
+from app.utils.metrics import current_request_id, span
+import asyncio
+import json
+import logging
 import os
-import shutil
 import uuid
-import csv
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 UPLOAD_DIR = os.path.join(BASE_DIR, "routers", "uploads")
 STATIC_DIR = os.path.join(BASE_DIR, "static")
-KNOWLEDGE_DIR = os.path.join(BASE_DIR, "assets", "knowledge")
+# target_langs로 한 번에 요청할 수 있는 최대 언어 수
+MAX_TARGET_LANGS = int(os.getenv("MAX_TARGET_LANGS", "10"))
 
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
 
-def load_domain_knowledge(domain_code: str) -> str:
-    if not domain_code or domain_code == "none": return ""
-    # (기존 파일 읽기 로직 유지)
-    return "" 
+async def _collect_sentences(sentences, translated: asyncio.Future):
+    """
+    TTS로 넘기는 문장을 그대로 흘려보내면서 전체 번역문을 모아 translated에 기록
+    """
+    parts = []
+    try:
+        async for sentence in sentences:
+            parts.append(sentence)
+            yield sentence
+        translated.set_result(" ".join(parts))
+    except Exception as e:
+        translated.set_exception(e)
+        raise
+    finally:
+        # 취소되거나(클라이언트 연결 끊김) 중간에 닫히면 역번역 태스크가 영원히 기다리지 않도록 함께 취소
+        if not translated.done():
+            translated.cancel()
+
+async def _back_translate_when_ready(translated: asyncio.Future, target_lang: str) -> str:
+    return await back_translate(await translated, target_lang)
+
+async def _prepare_source(
+    user_id: str, request_id: str, mode: str, text: str | None,
+    audio_bytes: bytes | None, filename: str | None, transcript_id: str | None,
+) -> tuple[str, str]:
+    """
+    1단계(입력 처리 및 STT): (source_text, speaker_ref)를 반환. 입력이 잘못되면 HTTPException
+    """
+    if mode in ['record', 'upload']:
+        if not audio_bytes:
+            raise HTTPException(status_code=400, detail="오디오 파일이 없습니다.")
+
+        # 업로드는 메모리에서 바로 STT로 넘기고, 파일은 목소리 복제 샘플이 필요할 때만 만듦
+        speaker_ref = ""
+        if await voice_registry.lookup(user_id) is None:
+            ext = os.path.splitext(filename)[1]
+            with span("upload_write"):
+                speaker_ref = await run_blocking(
+                    save_clone_sample, audio_bytes, ext, os.path.join(UPLOAD_DIR, f"{user_id}_{request_id}")
+                )
+            # 새 사용자라면 STT/번역과 겹쳐서 목소리 등록을 미리 시작 (3단계에서 같은 작업을 기다림)
+            await prewarm_voice(user_id, speaker_ref)
+
+        try:
+            streamed = await result_store.get(transcript_id, user_id) if transcript_id else None
+            if streamed and streamed.get("source_text"):
+                source_text = streamed["source_text"]
+            else:
+                source_text = await transcribe_audio(audio_bytes, filename)
+            if not source_text:
+                raise HTTPException(status_code=400, detail="음성이 감지되지 않았습니다.")
+        except BaseException:
+            # 호출한 쪽은 speaker_ref를 받지 못하므로 여기서 샘플을 정리
+            _release_upload(user_id, speaker_ref)
+            raise
+        return source_text, speaker_ref
+
+    if not text: raise HTTPException(status_code=400, detail="텍스트 입력 필요")
+    default_voice = os.path.join(STATIC_DIR, "default_sample.wav")
+    if not os.path.exists(default_voice):
+        raise HTTPException(status_code=500, detail="default_sample.wav 없음")
+    return text, default_voice
+
+def _release_upload(user_id: str, speaker_ref: str):
+    """요청이 uploads에 만든 복제 샘플을 지움 (기본 목소리 파일은 그대로 둠)"""
+    if speaker_ref and os.path.dirname(speaker_ref) == UPLOAD_DIR:
+        release_sample(user_id, speaker_ref)
+
+def _write_file(path: str, chunks: list[bytes]):
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+async def _run_generate_job(job, mode, target_lang, domain, text, audio_bytes, filename, transcript_id):
+    """
+    작업 대기열에서 generate-content 단계를 차례로 실행하고, 단계가 끝날 때마다 진행 이벤트를 보냄
+    """
+    user_id = job.user_id
+    source_text, speaker_ref = await _prepare_source(
+        user_id, job.id, mode, text, audio_bytes, filename, transcript_id
+    )
+    job.report("stt_done", source_text=source_text)
+
+    glossary = find_domain_entries(domain, source_text)
+    back_task = None
+    try:
+        translation = await translate(source_text, target_lang, glossary, domain=domain)
+        back_task = asyncio.create_task(back_translate(translation.text, target_lang))
+        job.report("translated", translated_text=translation.text, usage=translation.usage())
+
+        voice_id = await get_or_create_voice_id(user_id, speaker_ref)
+        chunks = [chunk async for chunk in generate_speech_stream(translation.text, voice_id)]
+        path = job_queue.audio_path(job)
+        await run_blocking(_write_file, path, chunks)
+        job.audio_path = path
+        job.report("audio_ready", audio_url=f"/api/jobs/{job.id}/audio", audio_bytes=sum(map(len, chunks)))
+
+        try:
+            job.report("back_translated", back_translated_text=await back_task)
+        except UpstreamError as e:
+            # 역번역은 검증용이므로 실패해도 작업은 완료로 처리
+            job.report("back_translated", back_translated_text=None, back_translated_text_error=str(e))
+    finally:
+        if back_task is not None:
+            back_task.cancel()
+        _release_upload(user_id, speaker_ref)
+
+async def _fan_out(user_id: str, source_text: str, speaker_ref: str, target_langs: list[str], domain: str) -> dict:
+    """
+    인식한 문장 하나를 여러 언어로 번역/합성. Voice ID는 한 번만 확보하고, 언어별 번역과 TTS는 동시에 진행하며
+    오디오는 일괄 처리(/api/batch)와 같은 위치에 저장해 같은 경로로 내려받게 함
+    """
+    voice_id = await get_or_create_voice_id(user_id, speaker_ref)
+    await run_blocking(sweep_expired_batches)
+    batch_id = uuid.uuid4().hex
+    records = [BatchRecord(str(i), source_text, lang, domain, voice_id) for i, lang in enumerate(target_langs)]
+    results = {}
+    async for result in run_batch(records, os.path.join(BATCH_DIR, str(user_id), batch_id)):
+        results[result["id"]] = result
+
+    outputs = []
+    for record in records:
+        result = results[record.id]
+        output = {"target_lang": record.target_lang, "translated_text": result.get("translated_text")}
+        if "audio" in result:
+            output["audio_url"] = f"/api/batch/{batch_id}/audio/{result['audio']}"
+        if "error" in result:
+            output["error"] = result["error"]
+        outputs.append(output)
+    return {
+        "batch_id": batch_id,
+        "source_text": source_text,
+        "outputs": outputs,
+        "zip_url": f"/api/batch/{batch_id}/audio.zip",
+    }
 
 @router.post("/generate-content")
 async def generate_content(
     mode: str = Form(...),
-    target_lang: str = Form(...),
+    target_lang: str = Form(None),
+    # 쉼표로 구분한 여러 대상 언어: 전달하면 한 번 인식한 문장을 모든 언어로 번역/합성하고 JSON 목록으로 응답
+    target_langs: str = Form(None),
     domain: str = Form("none"),
     text: str = Form(None),
     audio: UploadFile = File(None),
+    # /stt/ws 실시간 인식 세션의 ID: 전달하면 녹음 중에 미리 인식한 텍스트를 사용하고 STT를 건너뜀
+    transcript_id: str = Form(None),
+    # eager: 역번역까지 끝난 뒤 헤더에 담아 응답 / lazy: 오디오를 먼저 보내고 역번역은 후속 조회로 전달
+    back_translation: str = Form("lazy"),
+    # full: 번역이 끝난 뒤 TTS 시작 / sentence: 번역 문장이 완성되는 대로 TTS 시작 (번역문은 후속 조회로 전달)
+    stream_mode: str = Form("full"),
+    # stream: 오디오를 바로 스트리밍 / job: 작업 ID만 즉시 반환하고 대기열에서 처리 (/api/jobs/{job_id}로 조회)
+    response_mode: str = Form("stream"),
+    # job 모드의 우선순위: high / normal / low
+    priority: str = Form("normal"),
     current_user: dict = Depends(get_current_user)
 ):
     user_id = current_user["id"]
-    request_id = str(uuid.uuid4())
+    # 단계별 시간(Server-Timing, 로그)과 같은 ID로 묶음
+    request_id = current_request_id() or str(uuid.uuid4())
     speaker_ref = ""
-    source_text = ""
+    # sentence 모드에서 미리 시작한 번역 스트림. 응답으로 넘기기 전에 실패하면 닫아서 토큰 생성을 멈춤
+    sentences = None
 
     try:
+        audio_bytes = await audio.read() if audio else None
+        filename = audio.filename if audio else None
+
+        langs = list(dict.fromkeys(lang.strip() for lang in (target_langs or "").split(",") if lang.strip()))
+        if not langs and not target_lang:
+            raise HTTPException(status_code=400, detail="target_lang 또는 target_langs가 필요합니다.")
+        if len(langs) > MAX_TARGET_LANGS:
+            raise HTTPException(status_code=400, detail=f"대상 언어는 최대 {MAX_TARGET_LANGS}개까지 가능합니다.")
+        if langs:
+            if response_mode == "job":
+                raise HTTPException(status_code=400, detail="target_langs는 job 모드를 지원하지 않습니다.")
+            source_text, speaker_ref = await _prepare_source(
+                user_id, request_id, mode, text, audio_bytes, filename, transcript_id
+            )
+            return await _fan_out(user_id, source_text, speaker_ref, langs, domain)
+
+        if response_mode == "job":
+            if priority not in PRIORITIES:
+                raise HTTPException(status_code=400, detail=f"priority는 {', '.join(PRIORITIES)} 중 하나여야 합니다.")
+            # 입력이 아예 없는 요청은 대기열에 넣기 전에 거절
+            if not (audio_bytes if mode in ['record', 'upload'] else text):
+                raise HTTPException(status_code=400, detail="입력이 없습니다.")
+
+            async def runner(job):
+                await _run_generate_job(job, mode, target_lang, domain, text, audio_bytes, filename, transcript_id)
+
+            try:
+                job = job_queue.submit(user_id, runner, PRIORITIES[priority])
+            except QueueFull:
+                raise HTTPException(status_code=503, detail="대기 중인 작업이 너무 많습니다.", headers={"Retry-After": "30"})
+            return JSONResponse(status_code=202, content={
+                "job_id": job.id,
+                "status_url": f"/api/jobs/{job.id}",
+                "events_url": f"/api/jobs/{job.id}/events",
+                "position": job_queue.position(job),
+            })
+
         # 1. 입력 처리 및 STT
-        if mode in ['record', 'upload']:
-            if not audio:
-                raise HTTPException(status_code=400, detail="오디오 파일이 없습니다.")
-
-            ext = os.path.splitext(audio.filename)[1]
-            temp_filename = f"{user_id}_{request_id}{ext}"
-            temp_path = os.path.join(UPLOAD_DIR, temp_filename)
-            
-            with open(temp_path, "wb") as f:
-                shutil.copyfileobj(audio.file, f)
-            
-            wav_path = os.path.join(UPLOAD_DIR, f"{user_id}_{request_id}.wav")
-            if ext.lower() == ".webm":
-                convert_webm_to_wav(temp_path, wav_path)
-                speaker_ref = wav_path
-            else:
-                speaker_ref = temp_path
-                
-            source_text = transcribe_audio_file_local(speaker_ref if ext.lower() == ".webm" else temp_path)
-        
-        else:
-            if not text: raise HTTPException(status_code=400, detail="텍스트 입력 필요")
-            source_text = text
-            default_voice = os.path.join(STATIC_DIR, "default_sample.wav")
-            if not os.path.exists(default_voice):
-                raise HTTPException(status_code=500, detail="default_sample.wav 없음")
-            speaker_ref = default_voice
-
-        knowledge_context = load_domain_knowledge(domain)
-        system_instruction = ""
-        if knowledge_context:
-            system_instruction = f"[전문 용어 사전]\n{knowledge_context}\n\n[지시사항]\n전문 용어를 참고하여 번역하세요."
-        
-        prompt = f"""
-{system_instruction}
-다음 문장을 {target_lang} 언어로 원어민처럼 자연스럽게 번역해줘. 
-오직 번역된 문장만 출력해: 
-{source_text}
-"""
-        translated_text = get_gpt_response(prompt)
-        
-        # 역번역
-        back_translated_text = ""
-        if target_lang not in ["Korean", "한국어"]:
-            # 검증을 위해 다시 한국어로 직역 요청
-            back_prompt = f"다음 문장을 한국어로 번역해줘. 원래 의미가 잘 전달되었는지 확인하기 위해 의역보다는 직역에 가깝게 번역해줘. 오직 번역된 문장만 출력해: {translated_text}"
-            back_translated_text = get_gpt_response(back_prompt)
+        source_text, speaker_ref = await _prepare_source(
+            user_id, request_id, mode, text, audio_bytes, filename, transcript_id
+        )
+
+        # 2. 번역
+        glossary = find_domain_entries(domain, source_text)
+        result_store.create(request_id, user_id, source_text=source_text)
+
+        if stream_mode == "sentence":
+            # LLM 스트리밍을 곧바로 시작하고(Voice ID 확보와 병렬), 완성된 문장부터 TTS로 넘김
+            translated_text = None
+            translated = asyncio.get_running_loop().create_future()
+            result_store.attach(request_id, "translated_text", translated)
+            # usage 딕셔너리는 스트림이 끝날 때 채워지므로, 같은 객체를 결과 저장소에 넣어 둠
+            usage = {}
+            result_store.set(request_id, "usage", usage)
+            sentences = prefetch(_collect_sentences(
+                iter_sentences(stream_translation(source_text, target_lang, glossary, usage=usage, domain=domain)), translated
+            ))
+            back_task = asyncio.create_task(_back_translate_when_ready(translated, target_lang))
         else:
-            back_translated_text = "(대상 언어가 한국어입니다)"
+            translation = await translate(source_text, target_lang, glossary, domain=domain)
+            translated_text = translation.text
+            result_store.set(request_id, "translated_text", translated_text)
+            result_store.set(request_id, "usage", translation.usage())
+            # 역번역은 검증용이므로 오디오 생성과 병렬로 진행
+            back_task = asyncio.create_task(back_translate(translated_text, target_lang))
+        result_store.attach(request_id, "back_translated_text", back_task)
 
         # 3. Voice ID 확보
-        voice_ref_path = wav_path if mode in ['record', 'upload'] and ext.lower() == ".webm" else speaker_ref
-        voice_id = get_or_create_voice_id(user_id, voice_ref_path)
+        voice_id = await get_or_create_voice_id(user_id, speaker_ref)
 
         # 4. 스트리밍 응답 반환
-        audio_stream = generate_speech_stream(translated_text, voice_id)
+        if translated_text is None:
+            audio_stream = generate_speech_stream_pipelined(sentences, voice_id)
+        else:
+            audio_stream = generate_speech_stream(translated_text, voice_id)
 
         # 헤더에 데이터 담기 (한글 인코딩 필수)
-        safe_source_text = urllib.parse.quote(source_text)
-        safe_translated_text = urllib.parse.quote(translated_text)
-        # 역번역 텍스트 헤더 추가
-        safe_back_text = urllib.parse.quote(back_translated_text)
+        headers = {
+            "X-Request-Id": request_id,
+            "X-Source-Text": urllib.parse.quote(source_text),
+            "X-Status": "success"
+        }
+        if translated_text is not None:
+            headers["X-Translated-Text"] = urllib.parse.quote(translated_text)
+            headers["X-Prompt-Tokens"] = str(translation.prompt_tokens)
+            headers["X-Completion-Tokens"] = str(translation.completion_tokens)
+            if translation.source_truncated:
+                headers["X-Source-Truncated"] = "true"
+            if translation.cached:
+                headers["X-Translation-Cache"] = "hit"
+        if back_translation == "eager" and translated_text is not None:
+            # 기존 방식: 역번역 텍스트를 헤더에 포함 (Voice ID 확보와는 겹쳐서 진행됨)
+            try:
+                headers["X-Back-Translated-Text"] = urllib.parse.quote(await back_task)
+            except UpstreamError as e:
+                headers["X-Back-Translation-Error"] = urllib.parse.quote(str(e))
+        else:
+            # 역번역(sentence 모드에서는 번역문도)은 GET /api/generate-content/{request_id} 로 조회
+            headers["X-Result-Url"] = f"/api/generate-content/{request_id}"
 
-        return StreamingResponse(
+        response = StreamingResponse(
             audio_stream, 
             media_type="audio/mpeg",
-            headers={
-                "X-Source-Text": safe_source_text,
-                "X-Translated-Text": safe_translated_text,
-                "X-Back-Translated-Text": safe_back_text,  # 헤더 추가
-                "X-Status": "success"
-            }
+            headers=headers
         )
+        sentences = None  # 이제 스트림은 응답이 끝까지 소비하거나 닫음
+        return response
 
+    except (HTTPException, UpstreamError):
+        # 업스트림 장애는 main.py의 처리기가 502/503(Retry-After)으로 응답
+        raise
     except Exception as e:
-        print(f"Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        logger.exception(f"generate-content 처리 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if sentences is not None:
+            await sentences.aclose()
+        # 복제 샘플은 Voice ID를 확보하면 더 필요 없음 (스트리밍 응답은 voice_id만 사용)
+        _release_upload(user_id, speaker_ref)
+
+@router.post("/voice-sample", status_code=202)
+async def upload_voice_sample(
+    audio: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    목소리 샘플만 먼저 올려 두면 백그라운드에서 복제를 시작하여, 이후 generate-content 요청은 등록 단계를 건너뜁니다.
+    """
+    user_id = current_user["id"]
+    ext = os.path.splitext(audio.filename)[1]
+    sample_path = await run_blocking(
+        save_clone_sample, await audio.read(), ext, os.path.join(UPLOAD_DIR, f"{user_id}_sample_{uuid.uuid4().hex}")
+    )
+
+    voice_id = await prewarm_voice(user_id, sample_path)
+    release_sample(user_id, sample_path)
+    if voice_id is not None:
+        return {"status": "ready", "voice_id": voice_id}
+    return {"status": "cloning"}
+
+@router.get("/generate-content/{request_id}")
+async def get_generate_content_result(
+    request_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    오디오 응답 이후에 완료되는 결과(역번역)를 조회합니다. 계산 중이면 완료될 때까지 기다립니다.
+    """
+    result = await result_store.get(request_id, current_user["id"])
+    if result is None:
+        raise HTTPException(status_code=404, detail="요청 결과를 찾을 수 없습니다.")
+    return result
+
+def _get_job(job_id: str, user_id: str):
+    job = job_queue.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    job 모드로 접수한 작업의 상태와 지금까지의 결과(폴링용)
+    """
+    job = _get_job(job_id, current_user["id"])
+    return job.snapshot(job_queue.position(job))
+
+@router.get("/jobs/{job_id}/events")
+async def get_job_events(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    작업 진행 이벤트를 Server-Sent Events로 전달 (queued, started, stt_done, translated, audio_ready, back_translated, done/failed)
+    """
+    job = _get_job(job_id, current_user["id"])
+
+    async def events():
+        async for event in job_queue.follow(job):
+            if event is None:
+                yield ": keep-alive\n\n"  # 프록시가 유휴 연결을 끊지 않도록
+                continue
+            data = json.dumps(event, ensure_ascii=False)
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.get("/jobs/{job_id}/audio")
+async def get_job_audio(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    job = _get_job(job_id, current_user["id"])
+    if job.audio_path is None:
+        raise HTTPException(status_code=409, detail="오디오가 아직 준비되지 않았습니다.")
+    return FileResponse(job.audio_path, media_type="audio/mpeg")
@@ -1,81 +1,107 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Cookie
-from jose import jwt, JWTError
-import shutil
-import os
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+import asyncio
+import json
+import logging
+import uuid
 
-# ✅ 로컬 Whisper용 STT 함수로 교체 (transcribe_audio_file_local)
-from app.services.stt_service import transcribe_audio_file_local, convert_webm_to_wav
+# ✅ 업로드를 파일로 저장하지 않고 메모리에서 바로 STT
+from app.services.stt_service import transcribe_audio
+from app.services.stream_stt import StreamingTranscriber
+from app.services.result_store import result_store
+from app.dependencies import authenticate, get_current_user
+from app.services.resilience import UpstreamError
 
-router = APIRouter()
-
-# Java 서버와 반드시 맞춰야 하는 설정
-SECRET_KEY = "RANDOM_SECRET_KEY"   # Java JwtUtil.SECRET 과 동일
-ALGORITHM = "HS256"
-ISSUER = "simple-auth-server"         # Java JwtUtil.ISSUER 와 동일
+logger = logging.getLogger(__name__)
 
-def get_current_user(
-    access_token: str | None = Cookie(default=None, alias="ACCESS_TOKEN")
-):
-    """
-    8080 Java 서버에서 발급한 ACCESS_TOKEN(JWT) 쿠키를 읽어
-    현재 로그인 유저 정보를 반환하는 의존성.
-    """
-    if access_token is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated (no ACCESS_TOKEN cookie)",
-        )
-
-    try:
-        payload = jwt.decode(
-            access_token,
-            SECRET_KEY,
-            algorithms=[ALGORITHM],
-            issuer=ISSUER,
-        )
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-        )
-
-    user_id = payload.get("sub")
-    username = payload.get("username")
-
-    if user_id is None or username is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
-
-    # 필요하면 여기서 DB 조회 후 실제 User 객체를 리턴해도 됨
-    return {"id": user_id, "username": username}
-
-UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+router = APIRouter()
 
 @router.post("/")
 async def stt(
     current_user: dict = Depends(get_current_user),
     audio: UploadFile = File(...)):
-    webm_path = os.path.join(UPLOAD_DIR, audio.filename)
-
-    with open(webm_path, "wb") as buffer:
-        shutil.copyfileobj(audio.file, buffer)
-
     try:
-        # webm → wav 변환
-        wav_path = webm_path.replace(".webm", ".wav")
-        convert_webm_to_wav(webm_path, wav_path)
+        # Whisper STT (webm 등 업로드 형식 그대로 처리)
+        text = await transcribe_audio(await audio.read(), audio.filename)
 
-        # Whisper STT (로컬 버전 사용)
-        text = transcribe_audio_file_local(wav_path)
-
-        os.remove(webm_path)
-        os.remove(wav_path)
         return {
             "text": text,
             "user": current_user  # 디버깅용으로 유저 정보 확인
         }
+    except UpstreamError:
+        raise
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _is_stop(text: str) -> bool:
+    # 제어 메시지는 {"type": "stop"} 하나뿐. JSON이 아니거나 객체가 아닌 텍스트 프레임은 무시
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(message, dict) and message.get("type") == "stop"
+
+
+@router.websocket("/ws")
+async def stt_stream(websocket: WebSocket, format: str = "webm"):
+    """
+    녹음하는 동안 오디오 조각을 받아 실시간으로 인식합니다.
+    - 클라이언트 → 서버: 오디오 조각(binary, MediaRecorder의 webm 또는 format=pcm16), 녹음 종료 시 {"type": "stop"}
+    - 서버 → 클라이언트: ready(transcript_id), partial, final(발화 단위 확정), done(전체 텍스트)
+    transcript_id를 generate-content에 넘기면 STT를 다시 하지 않고 이 결과를 사용합니다.
+    """
+    try:
+        current_user = authenticate(websocket.cookies.get("ACCESS_TOKEN"))
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    if not StreamingTranscriber.has_capacity():
+        await websocket.send_json({"type": "error", "detail": "실시간 인식 세션이 모두 사용 중입니다."})
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    send_lock = asyncio.Lock()
+
+    async def emit(event: dict):
+        async with send_lock:
+            await websocket.send_json(event)
+
+    transcriber = StreamingTranscriber(emit, audio_format=format)
+    transcriber.start()
+
+    # 녹음이 끝나기 전에 ID를 알려 주고, 전체 텍스트는 완성되면 결과 저장소에 기록
+    transcript_id = str(uuid.uuid4())
+    transcript = asyncio.get_running_loop().create_future()
+    result_store.create(transcript_id, current_user["id"])
+    result_store.attach(transcript_id, "source_text", transcript)
+    await emit({"type": "ready", "transcript_id": transcript_id})
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                transcriber.feed(message["bytes"])
+            elif message.get("text") and _is_stop(message["text"]):
+                break
+
+        text = await transcriber.finish()
+        transcript.set_result(text)
+        await emit({"type": "done", "transcript_id": transcript_id, "text": text})
+        await websocket.close()
+    except WebSocketDisconnect:
+        await transcriber.abort()
+        transcript.cancel()
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        # 디코딩 스레드가 파이프를 기다리며 세션 자리를 계속 차지하지 않도록 정리하고,
+        # transcript_id로 결과를 기다리는 generate-content도 바로 끝나게 함
+        logger.warning(f"실시간 인식 세션 오류: {e}")
+        await transcriber.abort()
+        transcript.cancel()
+        try:
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        except RuntimeError:
+            pass  # 이미 닫힌 소켓
@@ -14,7 +14,7 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 async def tts_endpoint(text: str = Form(...)):
     try:
         output_path = os.path.join(UPLOAD_DIR, "openai_tts_output.mp3")
-        file_path = text_to_speech(text, output_path)
+        file_path = await text_to_speech(text, output_path)
         return {
             "message": "TTS 처리 완료 (OpenAI TTS)",
             "file_path": file_path
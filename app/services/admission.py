@@ -0,0 +1,220 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+
+from fastapi import HTTPException
+from starlette.requests import cookie_parser
+from starlette.responses import JSONResponse
+
+from app.dependencies import authenticate
+from app.utils.metrics import record_stage, registry
+
+# 업스트림(LLM/STT/TTS/목소리 복제)을 쓰는 요청을 동시에 처리하는 최대 수 (모든 사용자 합계)
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "16"))
+# 자리가 날 때까지 기다릴 수 있는 요청 수. 가득 차면 기다리지 않고 바로 503
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+# 대기열에서 기다리는 최대 시간 (초). 지나면 503
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+# 사용자(JWT sub) 한 명이 동시에 보낼 수 있는 요청 수 (대기 중인 것 포함). 넘으면 바로 429, 0이면 제한 없음
+ADMISSION_PER_USER = int(os.getenv("ADMISSION_PER_USER", "4"))
+# 입장 제어를 적용할 POST 경로와 메트릭 레이블
+# 배치는 응답 스트림이 끝날 때까지 자리 하나를 차지하고, 그 안의 동시 호출 수는 BATCH_LLM/TTS_CONCURRENCY로 제한됨
+ADMISSION_PATHS = {
+    "/api/generate-content": "generate",
+    "/api/batch": "batch",
+    "/api/voice-sample": "voice_sample",
+    "/stt/": "stt",
+    "/tts/": "tts",
+    "/stt-tts/": "stt_tts",
+}
+# 처리 시간을 아직 모를 때 Retry-After 계산에 쓰는 값 (초)
+_INITIAL_SERVICE_SECONDS = 2.0
+
+admission_requests = registry.counter(
+    "voice_app_admission_requests_total", "입장 제어 결과 (outcome: admitted/user_limit/queue_full/timeout)", ("route", "outcome")
+)
+admission_wait_seconds = registry.histogram(
+    "voice_app_admission_wait_seconds", "입장 제어 대기열에서 기다린 시간", ("route",)
+)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, reason: str, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.reason = reason
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    전체 동시 처리 수와 사용자별 동시 요청 수를 제한합니다.
+    자리가 없으면 queue_size까지 FIFO로 기다리게 하고, 그 이상이거나 queue_timeout이 지나면 503,
+    한 사용자가 per_user를 넘기면 다른 사용자를 기다리게 하지 않도록 바로 429로 거절합니다.
+    이벤트 루프 안에서만 쓰므로 잠금 없이 카운터를 다룹니다.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = ADMISSION_MAX_CONCURRENT,
+        queue_size: int = ADMISSION_QUEUE_SIZE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        per_user: int = ADMISSION_PER_USER,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self.per_user = per_user
+        self.running = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._users: dict[str, int] = {}
+        # 요청 하나가 자리를 차지하는 시간의 이동 평균 (Retry-After 추정용)
+        self._service_seconds = _INITIAL_SERVICE_SECONDS
+
+    def retry_after(self, ahead: int) -> int:
+        """앞에 ahead개가 기다리고 있을 때 자리가 날 때까지의 대략적인 시간 (초)"""
+        return max(1, math.ceil(self._service_seconds * (ahead + 1) / self.max_concurrent))
+
+    async def acquire(self, user_id: str):
+        if self.per_user > 0 and self._users.get(user_id, 0) >= self.per_user:
+            raise AdmissionRejected(
+                429, "user_limit", "동시에 처리 중인 요청이 너무 많습니다.", max(1, math.ceil(self._service_seconds))
+            )
+        if self.running < self.max_concurrent and not self._waiters:
+            self.running += 1
+            self._enter(user_id)
+            return
+        if len(self._waiters) >= self.queue_size:
+            raise AdmissionRejected(
+                503, "queue_full", "요청이 많아 잠시 후 다시 시도해 주세요.", self.retry_after(len(self._waiters))
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._enter(user_id)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # 자리를 넘겨받은 직후에 취소되었으면 다음 대기자에게 넘김
+                self._hand_over()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            self._leave(user_id)
+            if isinstance(e, TimeoutError):
+                raise AdmissionRejected(
+                    503, "timeout", "요청이 많아 잠시 후 다시 시도해 주세요.", self.retry_after(len(self._waiters))
+                ) from None
+            raise
+
+    def release(self, user_id: str, held_seconds: float):
+        self._service_seconds = 0.8 * self._service_seconds + 0.2 * held_seconds
+        self._leave(user_id)
+        self._hand_over()
+
+    def _hand_over(self):
+        # running은 줄이지 않고 자리를 그대로 다음 대기자에게 넘김
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    def _enter(self, user_id: str):
+        self._users[user_id] = self._users.get(user_id, 0) + 1
+
+    def _leave(self, user_id: str):
+        count = self._users.get(user_id, 0) - 1
+        if count > 0:
+            self._users[user_id] = count
+        else:
+            self._users.pop(user_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": self.running,
+            "waiting": len(self._waiters),
+            "users": len(self._users),
+            "service_seconds": self._service_seconds,
+        }
+
+
+admission = AdmissionController()
+
+
+def _user_id(scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            token = cookie_parser(value.decode("latin-1")).get("ACCESS_TOKEN")
+            if token is None:
+                return None
+            try:
+                return str(authenticate(token)["id"])
+            except HTTPException:
+                return None
+    return None
+
+
+class AdmissionMiddleware:
+    """
+    ADMISSION_PATHS로 오는 요청을 AdmissionController에 통과시킨 뒤 처리합니다.
+    자리는 스트리밍 응답의 본문 전송이 끝날 때까지 유지됩니다. 거절은 본문을 읽기 전에 Retry-After와 함께 바로 응답하고,
+    인증되지 않은 요청은 그대로 넘겨 라우터의 의존성이 401로 응답하게 합니다.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission, paths: dict[str, str] = ADMISSION_PATHS):
+        self.app = app
+        self.controller = controller
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        route = self.paths.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+        user_id = _user_id(scope) if route is not None else None
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        queued = time.perf_counter()
+        try:
+            await self.controller.acquire(user_id)
+        except AdmissionRejected as e:
+            admission_requests.inc(route=route, outcome=e.reason)
+            response = JSONResponse(
+                {"detail": e.detail, "reason": e.reason}, status_code=e.status_code,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        waited = started - queued
+        admission_requests.inc(route=route, outcome="admitted")
+        admission_wait_seconds.observe(waited, route=route)
+        if waited >= 0.001:
+            record_stage("admission_wait", waited)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(user_id, time.perf_counter() - started)
+
+
+def _admission_metrics():
+    stats = admission.stats()
+    return [
+        ("voice_app_admission_limit", "gauge", "오디오 요청 동시 처리 한도", [({}, stats["max_concurrent"])]),
+        ("voice_app_admission_running", "gauge", "처리 중인 오디오 요청 수", [({}, stats["running"])]),
+        ("voice_app_admission_queue_depth", "gauge", "자리를 기다리는 오디오 요청 수", [({}, stats["waiting"])]),
+        ("voice_app_admission_active_users", "gauge", "처리 중이거나 기다리는 요청이 있는 사용자 수", [({}, stats["users"])]),
+    ]
+
+
+registry.add_collector(_admission_metrics)
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from app.utils.concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(BASE_DIR, "cache", "tts"))
+TTS_CACHE_MAX_MB = float(os.getenv("TTS_CACHE_MAX_MB", "512"))
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def make_cache_key(**parts) -> str:
+    """
+    합성 결과를 결정하는 값(text, voice_id, model_id, voice_settings 등)으로 만든 콘텐츠 주소
+    """
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    합성된 MP3를 디스크에 보관하는 LRU 캐시.
+    - 적중: 디스크에서 바로 읽어 스트리밍
+    - 미스: 업스트림 청크를 클라이언트로 보내면서 임시 파일에도 기록하고, 끝까지 받은 경우에만 캐시에 등록
+    여러 워커가 같은 디렉터리를 공유할 수 있으며, 다른 워커가 지운 파일은 미스로 처리됩니다.
+    """
+
+    def __init__(self, cache_dir: str = TTS_CACHE_DIR, max_bytes: int = int(TTS_CACHE_MAX_MB * 1024 * 1024)):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._index: OrderedDict[str, int] = OrderedDict()  # key -> 파일 크기 (오래전에 쓴 것이 앞쪽)
+        self._total = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.mp3")
+
+    def load(self):
+        """디스크에 남아 있는 캐시 파일을 마지막 사용 시각 순으로 색인"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".tmp"):
+                    os.remove(path)  # 이전 실행에서 중단된 기록
+                    continue
+                if name.endswith(".mp3"):
+                    st = os.stat(path)
+                    found.append((st.st_mtime, name[:-4], st.st_size))
+        with self._lock:
+            self._index.clear()
+            self._total = 0
+            for _, key, size in sorted(found):
+                self._index[key] = size
+                self._total += size
+            self._loaded = True
+        self._evict()
+        logger.info(f"TTS 캐시 로드: {len(self._index)}개, {self._total / 1024 / 1024:.1f}MB")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "entries": len(self._index),
+            "bytes": self._total,
+        }
+
+    def _touch(self, key: str):
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            os.utime(self._path(key))  # 재시작 후에도 LRU 순서가 유지되도록 mtime 갱신
+        except OSError:
+            pass
+
+    def _forget(self, key: str):
+        with self._lock:
+            size = self._index.pop(key, None)
+            if size is not None:
+                self._total -= size
+
+    def _register(self, key: str, size: int):
+        with self._lock:
+            if key in self._index:
+                self._total -= self._index[key]
+            self._index[key] = size
+            self._total += size
+        self._evict()
+
+    def _evict(self):
+        victims = []
+        with self._lock:
+            while self._total > self.max_bytes and len(self._index) > 1:
+                key, size = self._index.popitem(last=False)
+                self._total -= size
+                victims.append(key)
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _open_hit(self, key: str):
+        if key not in self._index:
+            return None
+        try:
+            f = open(self._path(key), "rb")
+        except OSError:
+            self._forget(key)
+            return None
+        self._touch(key)
+        return f
+
+    def _open_tmp(self, key: str):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        return tmp_path, open(tmp_path, "wb")
+
+    def _commit(self, key: str, tmp_path: str, f) -> int:
+        f.close()
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, self._path(key))
+        return size
+
+    @staticmethod
+    def _discard(tmp_path: str, f):
+        f.close()
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    async def stream(self, key: str, fetch):
+        """
+        key에 해당하는 오디오를 청크 단위로 반환(yield)
+        fetch: 미스일 때 호출할, 업스트림 청크를 내보내는 비동기 이터레이터 팩토리
+        """
+        if not self._loaded:
+            await run_blocking(self.load)
+
+        f = await run_blocking(self._open_hit, key)
+        if f is not None:
+            self.hits += 1
+            try:
+                while True:
+                    chunk = await run_blocking(f.read, READ_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+            finally:
+                f.close()
+
+        self.misses += 1
+        tmp_path, f = await run_blocking(self._open_tmp, key)
+        completed = False
+        try:
+            async for chunk in fetch():
+                f.write(chunk)  # 페이지 캐시에 쓰는 작은 버퍼 기록이므로 스레드 전환 없이 처리
+                yield chunk
+            completed = True
+        finally:
+            if completed:
+                size = await run_blocking(self._commit, key, tmp_path, f)
+                self._register(key, size)
+            else:
+                # 업스트림 오류나 클라이언트 연결 끊김: 일부만 받은 오디오는 캐시하지 않음
+                self._discard(tmp_path, f)
+
+    async def get_bytes(self, key: str, fetch) -> bytes:
+        """스트리밍이 필요 없는 호출용: 전체 오디오를 한 번에 반환"""
+        parts = [chunk async for chunk in self.stream(key, fetch)]
+        return b"".join(parts)
+
+
+audio_cache = AudioCache()
@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import shutil
+import time
+import zipfile
+from dataclasses import dataclass
+
+from app.services.clone_service import generate_speech_stream
+from app.services.translation_service import translate_batch, TRANSLATION_BATCH_SIZE
+from app.utils.concurrency import run_blocking
+
+# 동시에 보낼 일괄 번역(LLM) 호출 수와 TTS 합성 수
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+BATCH_TTS_CONCURRENCY = int(os.getenv("BATCH_TTS_CONCURRENCY", "8"))
+# 한 번에 받을 수 있는 최대 레코드 수
+BATCH_MAX_RECORDS = int(os.getenv("BATCH_MAX_RECORDS", "10000"))
+# API 배치에서 사용자 본인의 목소리 외에 레코드의 voice로 지정할 수 있는 Voice ID (쉼표로 구분, 예: ElevenLabs 기본 목소리)
+# CLI는 운영자가 직접 실행하므로 제한하지 않음
+BATCH_ALLOWED_VOICES = frozenset(voice for voice in os.getenv("BATCH_ALLOWED_VOICES", "").split(",") if voice)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# API로 처리한 배치의 오디오를 사용자별로 보관하는 디렉터리 ({BATCH_DIR}/{user_id}/{batch_id}/{id}.mp3)
+BATCH_DIR = os.getenv("BATCH_DIR", os.path.join(BASE_DIR, "cache", "batches"))
+# 결과 오디오를 보관하는 시간 (새 배치를 받을 때 지난 것을 정리)
+BATCH_TTL_SECONDS = float(os.getenv("BATCH_TTL_SECONDS", "86400"))
+
+# 레코드 id는 오디오 파일 이름으로 쓰므로 안전한 문자만 허용
+_SAFE_ID = re.compile(r"^[A-Za-z0-9._-]{1,100}$")
+
+
+@dataclass
+class BatchRecord:
+    id: str
+    text: str
+    target_lang: str
+    domain: str = "none"
+    voice: str | None = None  # ElevenLabs Voice ID (없으면 기본 목소리)
+
+
+def parse_records(lines) -> list[BatchRecord]:
+    """
+    JSONL 줄들을 레코드로 변환. {"id"?, "text", "target_lang", "domain"?, "voice"?}
+    잘못된 줄이 있으면 줄 번호와 함께 ValueError
+    """
+    records, seen = [], set()
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{number}번째 줄: JSON 형식 오류 ({e})")
+        if not isinstance(data, dict) or not data.get("text") or not data.get("target_lang"):
+            raise ValueError(f"{number}번째 줄: text와 target_lang이 필요합니다.")
+        record_id = str(data.get("id", number))
+        if not _SAFE_ID.match(record_id) or record_id in seen:
+            raise ValueError(f"{number}번째 줄: id는 영문/숫자/._-로 된 중복 없는 값이어야 합니다.")
+        seen.add(record_id)
+        records.append(BatchRecord(
+            record_id, str(data["text"]), str(data["target_lang"]), str(data.get("domain") or "none"), data.get("voice")
+        ))
+        if len(records) > BATCH_MAX_RECORDS:
+            raise ValueError(f"레코드는 최대 {BATCH_MAX_RECORDS}개까지 처리할 수 있습니다.")
+    return records
+
+
+def _write_audio(path: str, chunks: list[bytes]):
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def sweep_expired_batches(root: str = BATCH_DIR, ttl: float = BATCH_TTL_SECONDS):
+    if not os.path.isdir(root):
+        return
+    now = time.time()
+    for user_dir in os.scandir(root):
+        for batch in os.scandir(user_dir.path):
+            if now - batch.stat().st_mtime <= ttl:
+                continue
+            if batch.is_dir():
+                shutil.rmtree(batch.path, ignore_errors=True)
+            else:
+                os.remove(batch.path)  # 내려받기용으로 만든 zip
+
+
+def zip_audio(out_dir: str, zip_path: str) -> str:
+    """out_dir의 MP3를 하나의 zip으로 묶음 (MP3는 이미 압축되어 있으므로 저장만 함)"""
+    tmp_path = zip_path + ".tmp"
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name in sorted(os.listdir(out_dir)):
+            if name.endswith(".mp3"):
+                archive.write(os.path.join(out_dir, name), name)
+    os.replace(tmp_path, zip_path)
+    return zip_path
+
+
+async def run_batch(
+    records: list[BatchRecord],
+    out_dir: str,
+    default_voice: str | None = None,
+    llm_concurrency: int = BATCH_LLM_CONCURRENCY,
+    tts_concurrency: int = BATCH_TTS_CONCURRENCY,
+):
+    """
+    언어/도메인이 같은 레코드끼리 묶어 LLM 호출 한 번에 여러 문장을 번역하고, 번역이 끝난 묶음부터
+    TTS를 최대 tts_concurrency개씩 동시에 합성합니다. 오디오는 out_dir/{id}.mp3에 저장하고,
+    레코드가 끝나는 대로 결과 dict를 반환(yield)합니다 (입력 순서가 아니라 완료 순서).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    groups: dict[tuple[str, str], list[BatchRecord]] = {}
+    for record in records:
+        groups.setdefault((record.target_lang, record.domain), []).append(record)
+
+    results: asyncio.Queue = asyncio.Queue()
+    llm_slots = asyncio.Semaphore(llm_concurrency)
+    tts_slots = asyncio.Semaphore(tts_concurrency)
+
+    async def synthesize(record: BatchRecord, translation):
+        result = {
+            "id": record.id,
+            "target_lang": record.target_lang,
+            "domain": record.domain,
+            "source_text": record.text,
+            "translated_text": translation.text,
+            "translation_cached": translation.cached,
+        }
+        voice_id = record.voice or default_voice
+        if not voice_id:
+            result["error"] = "voice가 지정되지 않았고 기본 목소리도 없습니다."
+        else:
+            try:
+                async with tts_slots:
+                    chunks = [chunk async for chunk in generate_speech_stream(translation.text, voice_id)]
+                await run_blocking(_write_audio, os.path.join(out_dir, f"{record.id}.mp3"), chunks)
+                result["audio"] = f"{record.id}.mp3"
+                result["audio_bytes"] = sum(map(len, chunks))
+            except Exception as e:
+                result["error"] = f"TTS 실패: {e}"
+        await results.put(result)
+
+    async def translate_part(key: tuple[str, str], part: list[BatchRecord]):
+        try:
+            async with llm_slots:
+                translations = await translate_batch([record.text for record in part], *key)
+        except Exception as e:
+            for record in part:
+                await results.put({"id": record.id, "target_lang": key[0], "domain": key[1], "error": f"번역 실패: {e}"})
+            return
+        await asyncio.gather(*(synthesize(record, translation) for record, translation in zip(part, translations)))
+
+    async def run_all():
+        try:
+            # 큰 묶음은 LLM 호출 단위로 나눠, 먼저 번역된 부분부터 TTS를 시작
+            await asyncio.gather(*(
+                translate_part(key, group[start:start + TRANSLATION_BATCH_SIZE])
+                for key, group in groups.items()
+                for start in range(0, len(group), TRANSLATION_BATCH_SIZE)
+            ))
+        finally:
+            await results.put(None)
+
+    runner = asyncio.create_task(run_all())
+    try:
+        while True:
+            result = await results.get()
+            if result is None:
+                break
+            yield result
+        await runner
+    finally:
+        runner.cancel()
+
+
+async def _main(args):
+    from app.services.http_clients import upstreams
+
+    with open(args.input, encoding="utf-8-sig") as f:
+        records = parse_records(f)
+    if args.clean:
+        shutil.rmtree(args.out, ignore_errors=True)
+    os.makedirs(args.out, exist_ok=True)
+
+    upstreams.open()
+    started = time.perf_counter()
+    done = failed = 0
+    try:
+        with open(os.path.join(args.out, "results.jsonl"), "w", encoding="utf-8") as out:
+            async for result in run_batch(records, args.out, args.voice, args.llm_concurrency, args.tts_concurrency):
+                done += 1
+                failed += "error" in result
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                print(f"[{done}/{len(records)}] {result['id']} {result.get('error', 'ok')}")
+    finally:
+        await upstreams.aclose()
+    if args.zip:
+        await run_blocking(zip_audio, args.out, args.zip)
+    print(f"완료: {len(records)}건 (실패 {failed}건), {time.perf_counter() - started:.1f}s → {args.out}")
+
+
+if __name__ == "__main__":
+    # 야간 일괄 생성용: python -m app.services.batch_service phrases.jsonl --out out/ --voice <voice_id> --zip out.zip
+    parser = argparse.ArgumentParser(description="JSONL 문장들을 일괄 번역하고 TTS 오디오를 생성")
+    parser.add_argument("input", help="레코드 JSONL 파일 (줄마다 text, target_lang, domain, voice, id)")
+    parser.add_argument("--out", required=True, help="results.jsonl과 {id}.mp3를 저장할 디렉터리")
+    parser.add_argument("--voice", default=os.getenv("BATCH_DEFAULT_VOICE_ID"), help="voice가 없는 레코드에 쓸 Voice ID")
+    parser.add_argument("--zip", help="지정하면 오디오를 이 zip 파일로도 묶음")
+    parser.add_argument("--clean", action="store_true", help="출력 디렉터리를 비우고 시작")
+    parser.add_argument("--llm-concurrency", type=int, default=BATCH_LLM_CONCURRENCY)
+    parser.add_argument("--tts-concurrency", type=int, default=BATCH_TTS_CONCURRENCY)
+    asyncio.run(_main(parser.parse_args()))
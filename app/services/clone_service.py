@@ -1,70 +1,127 @@
 import os
-import json
-import requests
+import asyncio
+import httpx
+import logging
+import time
 import uuid
 from dotenv import load_dotenv
+from app.utils.concurrency import run_blocking
+from app.services.audio_cache import audio_cache, make_cache_key
+from app.services.voice_registry import voice_registry
+from app.services.http_clients import upstreams
+from app.services.upload_sweeper import remove_file
+from app.services.resilience import error_from_response
+from app.utils.metrics import record_stage, span
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
-VOICE_DB_FILE = "user_voice_map.json"
 
-def _load_voice_db():
-    if os.path.exists(VOICE_DB_FILE):
-        with open(VOICE_DB_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+# 목소리 업로드는 느리므로 넉넉하게, 연결은 빠르게 실패하도록 설정 (합성 요청은 연결 풀의 기본값 사용)
+CLONE_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# 문장 단위 파이프라인에서 동시에 미리 합성해 둘 문장 수 (앞 문장이 재생되는 동안 뒤 문장을 준비)
+TTS_PIPELINE_LOOKAHEAD = int(os.getenv("TTS_PIPELINE_LOOKAHEAD", "2"))
+
+# 사용자별로 진행 중인 목소리 등록 작업 (같은 사용자의 동시 요청은 이 작업 하나를 함께 기다림)
+_inflight_clones: dict[str, asyncio.Task] = {}
+
+def _read_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+async def _delete_voice(voice_id: str):
+    try:
+        await upstreams.elevenlabs.delete(f"/v1/voices/{voice_id}", timeout=CLONE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"중복 목소리 삭제 실패 ({voice_id}): {e}")
+
+async def _clone_voice(user_id: str, speaker_wav: str) -> str:
+    logger.info(f"새 목소리 등록 요청: user={user_id} ({os.path.basename(speaker_wav)})")
+    voice_name = f"User_{user_id}_{uuid.uuid4().hex[:4]}"
+
+    sample = await run_blocking(_read_file, speaker_wav)
+    files = {'files': (os.path.basename(speaker_wav), sample, 'audio/wav')}
+    data = {'name': voice_name, 'description': 'FastAPI Auto Clone'}
+    response = await upstreams.elevenlabs.post("/v1/voices/add", data=data, files=files, timeout=CLONE_TIMEOUT)
 
-def _save_voice_db(data):
-    with open(VOICE_DB_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if response.status_code != 200:
+        raise error_from_response("elevenlabs", response, "목소리 등록")
+
+    voice_id = response.json().get("voice_id")
+    logger.info(f"목소리 등록 완료: user={user_id} voice_id={voice_id}")
+
+    # 다른 워커가 먼저 등록했다면 그 값을 사용하고, 방금 만든 목소리는 쿼터를 차지하지 않도록 삭제
+    saved = await voice_registry.set_if_absent(user_id, voice_id)
+    if saved != voice_id:
+        await _delete_voice(voice_id)
+    return saved
 
-def get_or_create_voice_id(user_id: str, speaker_wav: str) -> str:
+def _start_clone(user_id: str, speaker_wav: str) -> asyncio.Task:
+    task = _inflight_clones.get(user_id)
+    if task is None:
+        task = asyncio.create_task(_clone_voice(user_id, speaker_wav))
+        _inflight_clones[user_id] = task
+        # 실패한 경우에도 항목을 지워 다음 요청에서 다시 시도하도록 함
+        task.add_done_callback(lambda _: _inflight_clones.pop(user_id, None))
+    return task
+
+async def get_or_create_voice_id(user_id: str, speaker_wav: str) -> str:
     """
-    [기존과 동일] Voice ID 조회 또는 생성
+    Voice ID 조회 또는 생성. 같은 사용자의 등록이 이미 진행 중이면 그 결과를 기다림
     """
     if not ELEVENLABS_API_KEY:
         raise ValueError("ELEVENLABS_API_KEY가 설정되지 않았습니다.")
 
-    headers = {"xi-api-key": ELEVENLABS_API_KEY}
-    
-    db = _load_voice_db()
-    if user_id in db:
-        voice_id = db[user_id]
-        print(f"♻️ 기존 Voice ID 재사용: {voice_id}")
+    user_id = str(user_id)
+    with span("voice_lookup"):
+        voice_id = await voice_registry.lookup(user_id)
+    if voice_id is not None:
+        logger.debug(f"기존 Voice ID 재사용: user={user_id} voice_id={voice_id}")
         return voice_id
 
-    print(f"🆕 새 목소리 등록 요청 중... ({os.path.basename(speaker_wav)})")
-    add_url = "https://api.elevenlabs.io/v1/voices/add"
-    voice_name = f"User_{user_id}_{uuid.uuid4().hex[:4]}"
+    # shield: 한 요청이 취소(연결 끊김)되어도 같은 작업을 기다리는 다른 요청은 계속 진행
+    with span("voice_clone"):
+        return await asyncio.shield(_start_clone(user_id, speaker_wav))
 
-    with open(speaker_wav, "rb") as f:
-        files = {'files': (os.path.basename(speaker_wav), f, 'audio/wav')}
-        data = {'name': voice_name, 'description': 'FastAPI Auto Clone'}
-        response = requests.post(add_url, headers=headers, data=data, files=files)
-    
-    if response.status_code != 200:
-        raise Exception(f"목소리 등록 실패: {response.text}")
-    
-    voice_id = response.json().get("voice_id")
-    print(f"목소리 등록 완료! ID: {voice_id}")
+def release_sample(user_id: str, speaker_wav: str):
+    """
+    요청이 만든 복제용 샘플 파일을 지움. 이 사용자의 목소리 등록이 진행 중이면 그 작업이 샘플을 읽고 있을 수 있으므로
+    작업이 끝난 뒤에 지움
+    """
+    task = _inflight_clones.get(str(user_id))
+    if task is not None and not task.done():
+        task.add_done_callback(lambda _: asyncio.get_running_loop().create_task(run_blocking(remove_file, speaker_wav)))
+    else:
+        asyncio.get_running_loop().create_task(run_blocking(remove_file, speaker_wav))
 
-    db[user_id] = voice_id
-    _save_voice_db(db)
-    
-    return voice_id
+def _log_prewarm_result(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"목소리 미리 등록 실패: {task.exception()}")
 
-def generate_speech_stream(text: str, voice_id: str):
+async def prewarm_voice(user_id: str, speaker_wav: str) -> str | None:
     """
-    [핵심 수정] 파일 저장이 아닌, 오디오 데이터 조각(chunk)을 실시간으로 반환(yield)
+    샘플이 올라오자마자 백그라운드에서 목소리 등록을 시작 (기다리지 않음)
+    이미 등록된 사용자면 Voice ID를, 등록을 시작했으면 None을 반환
     """
-    headers = {
-        "xi-api-key": ELEVENLABS_API_KEY,
-        "Content-Type": "application/json"
-    }
+    if not ELEVENLABS_API_KEY:
+        return None
+    user_id = str(user_id)
+    voice_id = await voice_registry.lookup(user_id)
+    if voice_id is not None:
+        return voice_id
+    _start_clone(user_id, speaker_wav).add_done_callback(_log_prewarm_result)
+    return None
 
+async def generate_speech_stream(text: str, voice_id: str, previous_text: str | None = None):
+    """
+    [핵심 수정] 파일 저장이 아닌, 오디오 데이터 조각(chunk)을 실시간으로 반환(yield)
+    previous_text: 문장 단위로 나눠 합성할 때 앞 문장을 넘겨 억양이 자연스럽게 이어지도록 함
+    """
     # optimize_streaming_latency=3 : 지연 시간 최소화 옵션
-    generate_url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream?optimize_streaming_latency=3"
+    generate_url = f"/v1/text-to-speech/{voice_id}/stream?optimize_streaming_latency=3"
 
     payload = {
         "text": text,
@@ -74,14 +131,82 @@ def generate_speech_stream(text: str, voice_id: str):
             "similarity_boost": 0.75
         }
     }
+    if previous_text:
+        payload["previous_text"] = previous_text
 
-    # stream=True 필수
-    response = requests.post(generate_url, headers=headers, json=payload, stream=True)
+    async def fetch():
+        # 스트리밍 요청: 응답 본문을 도착하는 대로 읽음 (연결은 풀에서 재사용)
+        async with upstreams.elevenlabs.stream("POST", generate_url, json=payload) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise error_from_response("elevenlabs", response, "음성 합성")
 
-    if response.status_code != 200:
-        raise Exception(f"ElevenLabs API Error: {response.text}")
+            # 청크 단위로 데이터를 즉시 반환
+            async for chunk in response.aiter_bytes(chunk_size=1024):
+                if chunk:
+                    yield chunk
+
+    # 같은 문장/목소리/설정이면 이전에 합성한 오디오를 디스크 캐시에서 바로 재생
+    cache_key = make_cache_key(provider="elevenlabs", voice_id=voice_id, **payload)
+    started = time.perf_counter()
+    first = True
+    async for chunk in audio_cache.stream(cache_key, fetch):
+        if first:
+            record_stage("tts_ttfb", time.perf_counter() - started)
+            first = False
+        yield chunk
+    record_stage("tts_total", time.perf_counter() - started)
+
+async def generate_speech_stream_pipelined(sentences, voice_id: str, lookahead: int = TTS_PIPELINE_LOOKAHEAD):
+    """
+    문장이 도착하는 대로 TTS 합성을 시작하고, 오디오 청크는 문장 순서대로 이어 붙여 반환(yield)
+    sentences: 문장 단위 비동기 이터레이터 (LLM 스트리밍 결과)
+    lookahead: 아직 클라이언트로 다 보내지 못한 문장 중 동시에 합성할 최대 개수
+    """
+    order = asyncio.Queue()  # 문장별 청크 큐를 입력 순서대로 보관
+    slots = asyncio.Semaphore(lookahead)
+    tasks = []
+
+    async def synthesize(text, previous_text, chunks):
+        try:
+            async for chunk in generate_speech_stream(text, voice_id, previous_text=previous_text):
+                await chunks.put(chunk)
+            await chunks.put(None)
+        except Exception as e:
+            await chunks.put(e)
+
+    async def schedule():
+        previous = None
+        try:
+            async for sentence in sentences:
+                await slots.acquire()
+                chunks = asyncio.Queue()
+                tasks.append(asyncio.create_task(synthesize(sentence, previous, chunks)))
+                await order.put(chunks)
+                previous = sentence
+        except Exception as e:
+            await order.put(e)
+            return
+        await order.put(None)
 
-    # 청크 단위로 데이터를 즉시 반환
-    for chunk in response.iter_content(chunk_size=1024):
-        if chunk:
-            yield chunk
\ No newline at end of file
+    scheduler = asyncio.create_task(schedule())
+    try:
+        while True:
+            chunks = await order.get()
+            if chunks is None:
+                break
+            if isinstance(chunks, Exception):
+                raise chunks
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+            # 이 문장을 다 보냈으므로 다음 문장 합성을 허용
+            slots.release()
+    finally:
+        scheduler.cancel()
+        for task in tasks:
+            task.cancel()
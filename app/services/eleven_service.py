@@ -1,22 +1,26 @@
-import requests
 import os
 from dotenv import load_dotenv
+from app.utils.concurrency import run_blocking
+from app.services.audio_cache import audio_cache, make_cache_key
+from app.services.http_clients import upstreams
+from app.services.resilience import error_from_response
 
 load_dotenv()
 
-ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 # 일레븐랩스 사이트에서 목소리 등록 후 받은 ID
-VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID") 
+VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID")
+
+def _write_file(output_path: str, content: bytes):
+    with open(output_path, "wb") as f:
+        f.write(content)
+
+async def generate_clone_voice(text: str, output_path: str):
+    url = f"/v1/text-to-speech/{VOICE_ID}"
 
-def generate_clone_voice(text: str, output_path: str):
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}"
-    
     headers = {
         "Accept": "audio/mpeg",
-        "Content-Type": "application/json",
-        "xi-api-key": ELEVENLABS_API_KEY
     }
-    
+
     data = {
         "text": text,
         "model_id": "eleven_turbo_v2_5",
@@ -26,11 +30,13 @@ def generate_clone_voice(text: str, output_path: str):
         }
     }
 
-    response = requests.post(url, json=data)
-    
-    if response.status_code == 200:
-        with open(output_path, "wb") as f:
-            f.write(response.content)
-        return output_path
-    else:
-        raise Exception(f"ElevenLabs API Error: {response.text}")
\ No newline at end of file
+    async def fetch():
+        response = await upstreams.elevenlabs.post(url, headers=headers, json=data, timeout=60.0)
+        if response.status_code != 200:
+            raise error_from_response("elevenlabs", response, "음성 합성")
+        yield response.content
+
+    cache_key = make_cache_key(provider="elevenlabs", voice_id=VOICE_ID, **data)
+    content = await audio_cache.get_bytes(cache_key, fetch)
+    await run_blocking(_write_file, output_path, content)
+    return output_path
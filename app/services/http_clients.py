@@ -0,0 +1,156 @@
+import logging
+import os
+import time
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from app.services.resilience import ResilientTransport, RetryPolicy
+from app.utils.metrics import upstream_requests, upstream_seconds
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
+ELEVENLABS_BASE_URL = os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io")
+
+# 업스트림별 연결 풀 크기 (keepalive: 요청이 끝난 뒤에도 열어 두는 연결 수)
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "60"))
+
+# 업스트림별 기본 타임아웃 (연결은 빠르게 실패, 읽기는 생성 시간을 감안)
+OPENAI_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+ELEVENLABS_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# 0보다 크면 응답 헤더가 이 시간(ms) 안에 오지 않을 때 같은 요청을 하나 더 보냄 (꼬리 지연 완화, 비용은 늘어남)
+OPENAI_HEDGE_AFTER_MS = float(os.getenv("OPENAI_HEDGE_AFTER_MS", "0"))
+ELEVENLABS_HEDGE_AFTER_MS = float(os.getenv("ELEVENLABS_HEDGE_AFTER_MS", "0"))
+
+# 업스트림별 재시도/hedge 정책. 목소리 등록처럼 부작용이 있는 요청은 목록에 없으므로 보내지 못한 경우와 429만 재시도
+OPENAI_POLICY = RetryPolicy(
+    hedge_after=OPENAI_HEDGE_AFTER_MS / 1000 or None,
+    idempotent_paths=("/chat/completions", "/audio/transcriptions", "/audio/speech"),
+)
+ELEVENLABS_POLICY = RetryPolicy(
+    hedge_after=ELEVENLABS_HEDGE_AFTER_MS / 1000 or None,
+    idempotent_paths=("/v1/text-to-speech/",),
+)
+
+
+def _http2_available() -> bool:
+    # HTTP/2는 h2 패키지가 있을 때만 사용 (pip install httpx[http2])
+    if os.getenv("UPSTREAM_HTTP2", "1") == "0":
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+HTTP2_ENABLED = _http2_available()
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """업스트림별 호출 수, 결과(상태 코드 계열/연결 오류), 응답 헤더까지의 시간을 메트릭으로 기록"""
+
+    def __init__(self, upstream: str, inner: httpx.AsyncBaseTransport):
+        self.upstream = upstream
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except Exception:
+            upstream_requests.inc(upstream=self.upstream, outcome="error")
+            raise
+        upstream_seconds.observe(time.perf_counter() - started, upstream=self.upstream)
+        upstream_requests.inc(upstream=self.upstream, outcome=f"{response.status_code // 100}xx")
+        return response
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+def _new_client(
+    base_url: str, headers: dict, timeout: httpx.Timeout, upstream: str = "upstream", verify=True,
+    policy: RetryPolicy | None = None, **options
+) -> httpx.AsyncClient:
+    transport = httpx.AsyncHTTPTransport(
+        verify=verify,
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE,
+            keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+        ),
+    )
+    return httpx.AsyncClient(
+        **options,
+        base_url=base_url,
+        headers=headers,
+        timeout=timeout,
+        # 시도마다 메트릭을 남기도록 재시도 계층이 계측 계층을 감쌈
+        transport=ResilientTransport(upstream, _InstrumentedTransport(upstream, transport), policy or RetryPolicy()),
+    )
+
+
+class UpstreamClients:
+    """
+    OpenAI / ElevenLabs 호출이 함께 쓰는 연결 풀.
+    요청마다 클라이언트를 만들면 매번 TCP/TLS 핸드셰이크를 하므로, 프로세스당 하나씩 만들어 재사용합니다.
+    앱 시작 시 open(), 종료 시 aclose()를 호출하며, 그 밖의 곳(스크립트 등)에서는 처음 사용할 때 만들어집니다.
+    """
+
+    def __init__(self):
+        self._openai_http: httpx.AsyncClient | None = None
+        self._openai: AsyncOpenAI | None = None
+        self._elevenlabs: httpx.AsyncClient | None = None
+
+    def open(self):
+        _ = self.openai, self.elevenlabs
+        logger.info(f"업스트림 연결 풀 준비 (HTTP/2: {HTTP2_ENABLED})")
+
+    @property
+    def openai_http(self) -> httpx.AsyncClient:
+        """OpenAI SDK가 지원하지 않는 엔드포인트를 직접 호출할 때 사용 (base_url: .../v1)"""
+        if self._openai_http is None:
+            self._openai_http = _new_client(
+                OPENAI_BASE_URL, {"Authorization": f"Bearer {OPENAI_API_KEY}"}, OPENAI_TIMEOUT, upstream="openai",
+                policy=OPENAI_POLICY,
+            )
+        return self._openai_http
+
+    @property
+    def openai(self) -> AsyncOpenAI:
+        if self._openai is None:
+            # SDK 클라이언트도 같은 연결 풀을 사용. 재시도는 전송 계층(ResilientTransport)에서 하므로 SDK 재시도는 끔
+            self._openai = AsyncOpenAI(
+                api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, timeout=OPENAI_TIMEOUT, http_client=self.openai_http,
+                max_retries=0,
+            )
+        return self._openai
+
+    @property
+    def elevenlabs(self) -> httpx.AsyncClient:
+        if self._elevenlabs is None:
+            self._elevenlabs = _new_client(
+                ELEVENLABS_BASE_URL, {"xi-api-key": ELEVENLABS_API_KEY or ""}, ELEVENLABS_TIMEOUT, upstream="elevenlabs",
+                policy=ELEVENLABS_POLICY,
+            )
+        return self._elevenlabs
+
+    async def aclose(self):
+        for client in (self._openai_http, self._elevenlabs):
+            if client is not None:
+                await client.aclose()
+        self._openai_http = self._openai = self._elevenlabs = None
+
+
+upstreams = UpstreamClients()
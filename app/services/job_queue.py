@@ -0,0 +1,241 @@
+import asyncio
+import itertools
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+
+from app.utils.concurrency import run_blocking
+from app.utils.metrics import log_timing, start_request
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 완성된 오디오를 보관할 디렉터리. 워커 프로세스마다 <pid> 하위 디렉터리를 따로 씀
+# (작업 목록이 메모리에만 있으므로 자기 디렉터리는 시작할 때 비우고, 종료된 워커의 디렉터리도 함께 지움)
+JOB_AUDIO_DIR = os.getenv("JOB_AUDIO_DIR", os.path.join(BASE_DIR, "cache", "jobs"))
+# 동시에 처리할 작업 수
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# 대기열 최대 길이. 가득 차면 새 작업을 받지 않음 (503)
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "500"))
+# 끝난 작업(결과와 오디오)을 보관하는 시간
+JOB_TTL_SECONDS = float(os.getenv("JOB_TTL_SECONDS", "3600"))
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+FINISHED = ("done", "failed")
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """
+    대기열에 들어간 작업 하나. 진행 상황은 events에 순서대로 쌓이고, emit할 때마다 기다리는 구독자를 깨웁니다.
+    """
+
+    def __init__(self, user_id: str, priority: int, runner):
+        self.id = str(uuid.uuid4())
+        self.user_id = user_id
+        self.priority = priority
+        self.seq = 0
+        self.status = "queued"
+        self.created = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.result: dict = {}
+        self.error: str | None = None
+        self.audio_path: str | None = None
+        self.events: list[dict] = []
+        self._runner = runner
+        self._updated = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    def emit(self, event: str, **data):
+        """진행 이벤트를 기록하고 구독자를 깨움"""
+        self.events.append({"event": event, "elapsed_ms": round((time.time() - self.created) * 1000), **data})
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def report(self, event: str, **data):
+        """단계 결과 이벤트. data를 result에도 합쳐 두어 폴링으로도 조회할 수 있게 함"""
+        self.result.update(data)
+        self.emit(event, **data)
+
+    async def wait_update(self, timeout: float):
+        """다음 이벤트가 올 때까지 기다림. timeout이 지나면 그냥 반환"""
+        try:
+            await asyncio.wait_for(self._updated.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def snapshot(self, position: int | None = None) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "position": position,
+            "result": self.result,
+            "error": self.error,
+            "events": self.events,
+        }
+
+
+class JobQueue:
+    """
+    generate-content 같은 긴 작업을 요청과 분리해 처리하는 프로세스 내 작업 대기열.
+    우선순위(숫자가 작을수록 먼저)와 접수 순서대로 workers개씩 동시에 실행하며, 끝난 작업은 ttl 동안 보관합니다.
+    작업은 접수한 프로세스의 메모리에만 있으므로, uvicorn 워커를 여러 개 띄우면 /api/jobs/{job_id} 조회가
+    같은 워커로 가도록 고정 라우팅(sticky session)을 쓰거나 워커를 하나만 띄워야 합니다.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_pending: int = JOB_QUEUE_MAX,
+        ttl: float = JOB_TTL_SECONDS,
+        audio_dir: str = JOB_AUDIO_DIR,
+    ):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.base_dir = audio_dir
+        self.audio_dir = os.path.join(audio_dir, str(os.getpid()))
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._queue: asyncio.PriorityQueue | None = None
+        self._seq = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        # 다른 워커가 아직 쓰고 있는 오디오는 건드리지 않도록 자기 디렉터리와 종료된 워커의 디렉터리만 지움
+        # (fork 이후 pid가 정해지므로 시작 시점에 다시 계산)
+        self.audio_dir = os.path.join(self.base_dir, str(os.getpid()))
+        _remove_stale_dirs(self.base_dir)
+        shutil.rmtree(self.audio_dir, ignore_errors=True)
+        os.makedirs(self.audio_dir, exist_ok=True)
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def audio_path(self, job: Job) -> str:
+        return os.path.join(self.audio_dir, f"{job.id}.mp3")
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, user_id: str, runner, priority: int = PRIORITIES["normal"]) -> Job:
+        """
+        runner(job)을 대기열에 넣고 바로 반환. runner는 job.report/emit으로 진행 상황을 알림
+        """
+        if self._queue is None:
+            raise RuntimeError("작업 대기열이 시작되지 않았습니다.")
+        self._evict()
+        if self.pending() >= self.max_pending:
+            raise QueueFull()
+        job = Job(user_id, priority, runner)
+        job.seq = next(self._seq)
+        self._jobs[job.id] = job
+        self._queue.put_nowait((priority, job.seq, job))
+        job.emit("queued", position=self.position(job))
+        return job
+
+    def get(self, job_id: str, user_id: str) -> Job | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def position(self, job: Job) -> int | None:
+        """대기 중인 작업 앞에 남은 작업 수"""
+        if job.status != "queued":
+            return None
+        key = (job.priority, job.seq)
+        return sum(1 for other in self._jobs.values() if other.status == "queued" and (other.priority, other.seq) < key)
+
+    async def follow(self, job: Job, heartbeat: float = 15.0):
+        """지난 이벤트부터 작업이 끝날 때까지 이벤트를 차례로 반환. heartbeat초 동안 소식이 없으면 None"""
+        index = 0
+        while True:
+            while index < len(job.events):
+                yield job.events[index]
+                index += 1
+            if job.done:
+                return
+            before = len(job.events)
+            await job.wait_update(heartbeat)
+            if len(job.events) == before and not job.done:
+                yield None
+
+    async def _worker(self):
+        while True:
+            _, _, job = await self._queue.get()
+            job.status = "running"
+            job.started = time.time()
+            # 작업 안에서 기록되는 단계별 시간은 job ID로 묶음
+            timing = start_request(job.id)
+            job.emit("started", queued_ms=round((job.started - job.created) * 1000))
+            try:
+                await job._runner(job)
+                job.status = "done"
+                job.emit("done")
+            except asyncio.CancelledError:
+                job.status, job.error = "failed", "서버가 종료되어 작업이 중단되었습니다."
+                job.emit("failed", error=job.error)
+                raise
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                logger.warning(f"작업 {job.id} 실패: {detail}")
+                job.status, job.error = "failed", detail
+                job.emit("failed", error=detail)
+            finally:
+                job.finished = time.time()
+                job.result["timings"] = timing.as_dict()["spans"]
+                log_timing(timing, job=True, status=job.status)
+
+    def _evict(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.done and now - job.finished >= self.ttl:
+                self._jobs.pop(job_id)
+                if job.audio_path:
+                    asyncio.get_running_loop().create_task(run_blocking(_remove, job.audio_path))
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # 다른 사용자의 프로세스
+    return True
+
+
+def _remove_stale_dirs(base_dir: str):
+    """이미 종료된 워커 프로세스가 남긴 <pid> 디렉터리를 지움"""
+    if not os.path.isdir(base_dir):
+        return
+    for name in os.listdir(base_dir):
+        path = os.path.join(base_dir, name)
+        if name.isdigit() and os.path.isdir(path) and not _process_alive(int(name)):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+job_queue = JobQueue()
@@ -0,0 +1,202 @@
+import asyncio
+import csv
+import io
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from app.utils.aho_corasick import AhoCorasick
+from app.utils.concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KNOWLEDGE_DIR = os.path.join(BASE_DIR, "assets", "knowledge")
+
+# 파일 변경 여부(mtime)를 백그라운드에서 확인하는 간격 (초)
+RELOAD_CHECK_INTERVAL = float(os.getenv("KNOWLEDGE_RELOAD_INTERVAL", "2.0"))
+
+# "RAG (Retrieval-Augmented Generation)", "커밋(COMMIT)" 처럼 괄호 안에 별칭이 붙은 용어
+_TERM_WITH_ALIAS = re.compile(r"^(?P<main>[^()]+?)\s*\((?P<alias>[^()]+)\)\s*$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class GlossaryEntry:
+    term: str
+    definition: str
+    aliases: list[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        return f"- {self.term}: {self.definition}"
+
+
+@dataclass
+class DomainIndex:
+    entries: list[GlossaryEntry]
+    matcher: AhoCorasick
+    mtime: float
+
+
+def normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).casefold()
+
+
+def _term_variants(term: str) -> list[str]:
+    variants = [term]
+    match = _TERM_WITH_ALIAS.match(term)
+    if match:
+        variants += [match.group("main"), match.group("alias")]
+    # "더티 리드" ↔ "더티리드" 처럼 띄어쓰기만 다른 한국어 표기도 매칭
+    for v in list(variants):
+        if " " in v and not v.isascii():
+            variants.append(v.replace(" ", ""))
+    return list(dict.fromkeys(normalize(v).strip() for v in variants if v.strip()))
+
+
+def parse_csv(content: str) -> list[GlossaryEntry]:
+    entries = []
+    for row in csv.reader(io.StringIO(content)):
+        if len(row) < 2 or not row[0].strip() or row[0].strip() == "용어":
+            continue
+        term = row[0].strip()
+        entries.append(GlossaryEntry(term, ",".join(row[1:]).strip(), _term_variants(term)))
+    return entries
+
+
+def parse_txt(content: str) -> list[GlossaryEntry]:
+    """
+    "용어:" 한 줄 뒤에 정의가 이어지고, 빈 줄로 항목을 구분하는 형식
+    """
+    entries = []
+    for block in re.split(r"\n\s*\n", content.replace("\r\n", "\n")):
+        lines = [line.strip() for line in block.strip().split("\n") if line.strip()]
+        if not lines or not lines[0].endswith(":"):
+            continue
+        term = lines[0][:-1].strip()
+        entries.append(GlossaryEntry(term, " ".join(lines[1:]), _term_variants(term)))
+    return entries
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+class KnowledgeIndex:
+    """
+    assets/knowledge 의 도메인별 용어집을 한 번만 파싱해 메모리에 색인하고,
+    입력 문장에 실제로 등장한 용어의 항목만 골라 반환합니다.
+    앱에서는 start()로 띄운 백그라운드 작업이 check_interval마다 스레드 풀에서 파일 변경을 확인해
+    바뀐 도메인만 다시 색인하고, 색인 전체를 한 번에 바꿔 끼웁니다 (조회는 이벤트 루프에서 stat/파싱을 하지 않음).
+    """
+
+    def __init__(self, knowledge_dir: str = KNOWLEDGE_DIR, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.knowledge_dir = knowledge_dir
+        self.check_interval = check_interval
+        self._domains: dict[str, DomainIndex] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def _scan(self) -> dict[str, tuple[str, float]]:
+        files = {}
+        if not os.path.isdir(self.knowledge_dir):
+            return files
+        for entry in os.scandir(self.knowledge_dir):
+            domain, ext = os.path.splitext(entry.name)
+            if entry.is_file() and ext.lower() in (".txt", ".csv"):
+                files[domain] = (entry.path, entry.stat().st_mtime)
+        return files
+
+    @staticmethod
+    def build_domain(entries: list[GlossaryEntry], mtime: float = 0.0) -> DomainIndex:
+        matcher = AhoCorasick()
+        for idx, entry in enumerate(entries):
+            for variant in entry.aliases:
+                matcher.add(variant, idx)
+        matcher.build()
+        return DomainIndex(entries, matcher, mtime)
+
+    def _load_file(self, path: str, mtime: float) -> DomainIndex:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            content = f.read()
+        entries = parse_csv(content) if path.lower().endswith(".csv") else parse_txt(content)
+        return self.build_domain(entries, mtime)
+
+    def reload(self, force: bool = False):
+        """변경된 용어집 파일만 다시 색인 (force=True 이면 전체)"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            files = self._scan()
+            domains = {k: v for k, v in self._domains.items() if k in files}
+            for domain, (path, mtime) in files.items():
+                current = domains.get(domain)
+                if force or current is None or current.mtime != mtime:
+                    domains[domain] = self._load_file(path, mtime)
+                    logger.info(f"용어집 색인 완료: {domain} ({len(domains[domain].entries)}개)")
+            self._domains = domains
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await run_blocking(self.reload)
+            except Exception as e:
+                logger.warning(f"용어집 재색인 실패: {e}")
+
+    @property
+    def domains(self) -> list[str]:
+        return sorted(self._domains)
+
+    def lookup(self, domain: str, text: str) -> list[GlossaryEntry]:
+        """
+        text 에 등장한 용어의 항목을 처음 등장한 순서대로 반환
+        """
+        if not self._last_check:
+            # 앱 밖(CLI 등)에서 start() 없이 쓰는 경우에만 첫 조회 때 한 번 색인
+            self.reload()
+        index = self._domains.get(domain)
+        if index is None or not text:
+            return []
+
+        normalized = normalize(text)
+        found: dict[int, int] = {}
+        for start, end, idx in index.matcher.iter_matches(normalized):
+            # 영문 용어는 단어 경계에서만 인정 ("ACID"가 "placid"에 걸리지 않도록)
+            if _is_word_char(normalized[start]) and start > 0 and _is_word_char(normalized[start - 1]):
+                continue
+            if _is_word_char(normalized[end - 1]) and end < len(normalized) and _is_word_char(normalized[end]):
+                continue
+            found.setdefault(idx, start)
+        return [index.entries[idx] for idx in sorted(found, key=found.get)]
+
+
+knowledge_index = KnowledgeIndex()
+
+
+def find_domain_entries(domain_code: str, source_text: str) -> list[GlossaryEntry]:
+    """
+    도메인 용어집 중 source_text 에 실제로 등장한 용어의 항목만 반환
+    """
+    if not domain_code or domain_code == "none":
+        return []
+    return knowledge_index.lookup(domain_code, source_text)
+
+
+def load_domain_knowledge(domain_code: str, source_text: str = "") -> str:
+    """
+    find_domain_entries 결과를 프롬프트용 문자열로 반환
+    """
+    return "\n".join(entry.format() for entry in find_domain_entries(domain_code, source_text))
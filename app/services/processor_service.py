@@ -1,32 +1,75 @@
-import openai
-from openai import OpenAI
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
+from app.services.http_clients import upstreams
+from app.services.resilience import upstream_errors
 
 load_dotenv()
 
-# ✅ 최신 버전(1.0.0+) 방식의 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-def get_gpt_response(prompt):
-    try:
-        # ✅ 최신 방식의 API 호출
-        response = client.chat.completions.create(
-            model="gpt-4o-mini", # gpt-4o-mini 또는 "gpt-3.5-turbo"
-            messages=[
-                {"role": "system", "content": "너는 전문 번역가야. 입력된 문장을 지정된 언어로 자연스럽게 번역해줘."},
-                {"role": "user", "content": prompt}
-            ]
+# ✅ 최신 버전(1.0.0+) 방식의 비동기 클라이언트 사용 (앱 전체가 공유하는 연결 풀)
+# (응답을 기다리는 동안 이벤트 루프가 다른 요청을 처리할 수 있음)
+
+GPT_MODEL = os.getenv("GPT_MODEL", "gpt-4o-mini") # gpt-4o-mini 또는 "gpt-3.5-turbo"
+SYSTEM_PROMPT = "너는 전문 번역가야. 입력된 문장을 지정된 언어로 자연스럽게 번역해줘."
+
+def _build_messages(prompt):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+@dataclass
+class ChatResult:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+async def chat_completion(messages, max_tokens=None) -> ChatResult:
+    """
+    완성된 messages로 호출하고 응답 텍스트와 토큰 사용량을 함께 반환
+    """
+    with upstream_errors("openai"):
+        response = await upstreams.openai.chat.completions.create(
+            model=GPT_MODEL,
+            messages=messages,
+            max_tokens=max_tokens
+        )
+    usage = response.usage
+    return ChatResult(
+        text=response.choices[0].message.content.strip(),
+        prompt_tokens=usage.prompt_tokens if usage else 0,
+        completion_tokens=usage.completion_tokens if usage else 0,
+    )
+
+async def get_gpt_response(prompt):
+    # 실패하면 원문을 돌려주지 않고 UpstreamError를 올려 보냄 (응답 형식은 main.py의 예외 처리기가 통일)
+    result = await chat_completion(_build_messages(prompt))
+    return result.text
+
+async def stream_chat_completion(messages, max_tokens=None, usage: dict | None = None):
+    """
+    응답 전체를 기다리지 않고, 생성되는 텍스트 조각(delta)을 도착하는 대로 반환(yield)
+    usage: 전달하면 스트림 마지막에 받은 토큰 사용량을 기록
+    """
+    with upstream_errors("openai"):
+        stream = await upstreams.openai.chat.completions.create(
+            model=GPT_MODEL,
+            messages=messages,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
         )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        print(f"GPT API 에러 발생: {e}")
-        return prompt  # 에러 발생 시 원문 반환
+        async for chunk in stream:
+            if chunk.usage is not None and usage is not None:
+                usage["prompt_tokens"] = chunk.usage.prompt_tokens
+                usage["completion_tokens"] = chunk.usage.completion_tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
 # #기본 테스트
 # if __name__ == "__main__":
 #     stt_output = "졸업할 수 있겠지?"
-#     answer = get_gpt_response(stt_output)
+#     answer = asyncio.run(get_gpt_response(stt_output))
 #     print("🙋 나:" , stt_output)
 #     print("🤖 GPT 응답:", answer)
 #     print("-" * 40)
@@ -41,5 +84,5 @@ def get_gpt_response(prompt):
 
 # for q in questions:
 #     print(f"🙋 사용자: {q}")
-#     print(f"🤖 나만의 음성 비서: {get_gpt_response(q)}")
+#     print(f"🤖 나만의 음성 비서: {asyncio.run(get_gpt_response(q))}")
 #     print("-" * 40)
\ No newline at end of file
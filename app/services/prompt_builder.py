@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from app.services.knowledge_service import GlossaryEntry
+from app.services.processor_service import GPT_MODEL
+
+logger = logging.getLogger(__name__)
+
+# 요청 하나가 LLM에 보낼 수 있는 입력 토큰 상한 (시스템 지시 + 용어집 + 원문)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "4000"))
+# 용어집이 차지할 수 있는 최대 토큰 (원문이 짧으면 남는 예산만큼만 사용)
+GLOSSARY_TOKEN_BUDGET = int(os.getenv("GLOSSARY_TOKEN_BUDGET", "800"))
+# 번역 결과 토큰 상한. 원문 길이에 비례하게 잡되 이 값을 넘지 않음
+MAX_COMPLETION_TOKENS = int(os.getenv("MAX_COMPLETION_TOKENS", "2000"))
+# 일괄 번역 호출 하나에 넣을 원문 토큰 합계 (번역문이 MAX_COMPLETION_TOKENS 안에 들어오도록 절반 이하로)
+BATCH_TOKEN_BUDGET = int(os.getenv("BATCH_TOKEN_BUDGET", str(MAX_COMPLETION_TOKENS // 3)))
+
+# 요청마다 바뀌지 않는 시스템 지시. 매번 같은 접두부를 보내야 OpenAI 프롬프트 캐시가 적용됨
+SYSTEM_PROMPT = (
+    "너는 전문 번역가야. 입력된 문장을 지정된 언어로 원어민처럼 자연스럽게 번역해줘. "
+    "[전문 용어 사전]이 주어지면 해당 용어의 의미를 참고해서 번역해. "
+    "설명이나 따옴표 없이 오직 번역된 문장만 출력해."
+)
+BACK_TRANSLATION_SYSTEM_PROMPT = (
+    "너는 번역 검증 담당자야. 입력된 문장을 한국어로 번역해줘. "
+    "원래 의미가 잘 전달되었는지 확인하기 위해 의역보다는 직역에 가깝게 번역하고, 오직 번역된 문장만 출력해."
+)
+
+# 메시지 하나당 role/구분자 등으로 추가되는 토큰 (OpenAI 권장 근사치)
+_TOKENS_PER_MESSAGE = 4
+_GLOSSARY_HEADER = "[전문 용어 사전]\n"
+
+
+@lru_cache(maxsize=1)
+def get_encoding():
+    """
+    tiktoken 인코더를 한 번만 만들어 재사용. BPE 파일을 받을 수 없는 환경이면 None
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(GPT_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken 인코더를 불러오지 못해 근사치로 토큰을 계산합니다: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = get_encoding()
+    if encoding is None:
+        # 한글 1글자(3바이트) ≈ 1토큰, 영문 3~4글자 ≈ 1토큰 → 넉넉하게 잡는 근사치
+        return max(1, len(text.encode("utf-8")) // 3) if text else 0
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    encoding = get_encoding()
+    if encoding is None:
+        return text.encode("utf-8")[: max_tokens * 3].decode("utf-8", errors="ignore")
+    tokens = encoding.encode(text, disallowed_special=())
+    # 한글 한 글자가 여러 토큰으로 나뉘는 경우 경계에서 깨진 글자(U+FFFD)가 남지 않도록 버림
+    return encoding.decode(tokens[:max_tokens], errors="ignore")
+
+
+@lru_cache(maxsize=8)
+def _static_tokens(system_prompt: str) -> int:
+    return count_tokens(system_prompt) + _TOKENS_PER_MESSAGE * 2
+
+
+@dataclass
+class BuiltPrompt:
+    messages: list[dict]
+    prompt_tokens: int
+    max_completion_tokens: int
+    source_truncated: bool = False
+    glossary_used: list[str] = field(default_factory=list)
+    glossary_dropped: list[str] = field(default_factory=list)
+
+
+def _fit_glossary(glossary: list[GlossaryEntry] | None, glossary_budget: int) -> tuple[list[str], list[str], list[str], int]:
+    """
+    용어집을 앞에서부터 예산 안에 들어가는 만큼만 고름. (줄, 포함한 용어, 제외한 용어, 사용한 토큰)
+    사용한 토큰에는 첫 항목을 넣을 때 붙는 머리말과 원문 앞 빈 줄도 포함
+    """
+    used, dropped, lines = [], [], []
+    glossary_tokens = 0
+    header_cost = count_tokens(_GLOSSARY_HEADER) + 1
+    for entry in glossary or []:
+        line = entry.format()
+        cost = count_tokens(line) + 1 + (0 if lines else header_cost)
+        if glossary_tokens + cost > glossary_budget:
+            dropped.append(entry.term)
+            continue
+        lines.append(line)
+        used.append(entry.term)
+        glossary_tokens += cost
+    if dropped:
+        logger.info(f"토큰 예산 부족으로 용어 {len(dropped)}개 제외: {dropped[:5]}")
+    return lines, used, dropped, glossary_tokens
+
+
+def _completion_budget(source_tokens: int) -> int:
+    # 번역문은 보통 원문 토큰의 2배 이내. 짧은 입력도 여유를 두도록 기본값을 더함
+    return min(MAX_COMPLETION_TOKENS, source_tokens * 2 + 64)
+
+
+def build_translation_prompt(
+    source_text: str,
+    target_lang: str,
+    glossary: list[GlossaryEntry] | None = None,
+    budget: int = PROMPT_TOKEN_BUDGET,
+) -> BuiltPrompt:
+    """
+    토큰 예산 안에서 번역 프롬프트를 조립합니다.
+    - 원문이 예산을 넘으면 뒤쪽을 잘라내고 경고를 남김
+    - 용어집은 원문에 먼저 등장한 용어부터 남은 예산만큼만 포함
+    """
+    header = f"다음 문장을 {target_lang} 언어로 번역해줘.\n"
+    fixed = _static_tokens(SYSTEM_PROMPT) + count_tokens(header)
+
+    source_budget = max(1, budget - fixed)
+    source_tokens = count_tokens(source_text)
+    truncated = False
+    if source_tokens > source_budget:
+        logger.warning(f"원문이 토큰 예산을 초과하여 잘라냅니다: {source_tokens} > {source_budget} tokens")
+        source_text = truncate_to_tokens(source_text, source_budget)
+        source_tokens = source_budget
+        truncated = True
+
+    glossary_budget = min(GLOSSARY_TOKEN_BUDGET, budget - fixed - source_tokens)
+    lines, used, dropped, glossary_tokens = _fit_glossary(glossary, glossary_budget)
+
+    user_content = header
+    if lines:
+        user_content = _GLOSSARY_HEADER + "\n".join(lines) + "\n\n" + header
+    user_content += source_text
+
+    return BuiltPrompt(
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_content},
+        ],
+        prompt_tokens=fixed + glossary_tokens + source_tokens,
+        max_completion_tokens=_completion_budget(source_tokens),
+        source_truncated=truncated,
+        glossary_used=used,
+        glossary_dropped=dropped,
+    )
+
+
+def build_back_translation_prompt(translated_text: str, budget: int = PROMPT_TOKEN_BUDGET) -> BuiltPrompt:
+    fixed = _static_tokens(BACK_TRANSLATION_SYSTEM_PROMPT)
+    source_tokens = count_tokens(translated_text)
+    truncated = False
+    if source_tokens > budget - fixed:
+        translated_text = truncate_to_tokens(translated_text, budget - fixed)
+        source_tokens = budget - fixed
+        truncated = True
+    return BuiltPrompt(
+        messages=[
+            {"role": "system", "content": BACK_TRANSLATION_SYSTEM_PROMPT},
+            {"role": "user", "content": translated_text},
+        ],
+        prompt_tokens=fixed + source_tokens,
+        max_completion_tokens=_completion_budget(source_tokens),
+        source_truncated=truncated,
+    )
+
+
+def build_batch_translation_prompt(
+    source_texts: list[str],
+    target_lang: str,
+    glossary: list[GlossaryEntry] | None = None,
+    budget: int = PROMPT_TOKEN_BUDGET,
+) -> BuiltPrompt:
+    """
+    여러 원문을 LLM 호출 한 번으로 번역하는 프롬프트. 원문은 JSON 배열로 넣고 같은 순서의 JSON 배열로 받습니다.
+    원문 길이는 호출하는 쪽에서 BATCH_TOKEN_BUDGET 안으로 나눠 보낸다고 가정하고 자르지 않음.
+    (묶음 전체의) 용어집은 단일 번역과 같이 GLOSSARY_TOKEN_BUDGET과 남은 예산 안에서만 포함
+    """
+    header = (
+        f"다음 JSON 배열의 각 문장을 {target_lang} 언어로 따로 번역해서, "
+        f"같은 순서와 같은 개수의 JSON 문자열 배열로만 출력해.\n"
+    )
+    payload = json.dumps(source_texts, ensure_ascii=False)
+    source_tokens = count_tokens(payload)
+    fixed = _static_tokens(SYSTEM_PROMPT) + count_tokens(header)
+
+    glossary_budget = min(GLOSSARY_TOKEN_BUDGET, budget - fixed - source_tokens)
+    lines, used, dropped, _ = _fit_glossary(glossary, glossary_budget)
+    user_content = header + payload
+    if lines:
+        user_content = _GLOSSARY_HEADER + "\n".join(lines) + "\n\n" + user_content
+
+    return BuiltPrompt(
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_content},
+        ],
+        prompt_tokens=_static_tokens(SYSTEM_PROMPT) + count_tokens(user_content),
+        max_completion_tokens=min(MAX_COMPLETION_TOKENS, source_tokens * 2 + 16 * len(source_texts) + 64),
+        glossary_used=used,
+        glossary_dropped=dropped,
+    )
@@ -0,0 +1,363 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 업스트림 호출(재시도 포함)에 쓰는 기본 시간 한도. deadline()으로 더 짧게 줄일 수 있음
+UPSTREAM_DEADLINE_SECONDS = float(os.getenv("UPSTREAM_DEADLINE_SECONDS", "60"))
+# 첫 시도를 포함한 최대 시도 횟수와 재시도 간격 (지수 백오프 + full jitter)
+UPSTREAM_MAX_ATTEMPTS = int(os.getenv("UPSTREAM_MAX_ATTEMPTS", "3"))
+UPSTREAM_BACKOFF_BASE = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.25"))
+UPSTREAM_BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", "4.0"))
+# 연속 실패가 이만큼 쌓이면 회로를 열어 reset 시간 동안 호출 없이 바로 실패
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# 다시 보내도 되는 응답 상태 (요청 제한, 일시적인 서버 오류)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# 요청이 업스트림에 닿지 않은 것이 확실한 오류. 부작용이 있는 요청(목소리 등록 등)도 다시 보낼 수 있음
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+upstream_retries = registry.counter(
+    "voice_app_upstream_retries_total", "업스트림 재시도 수 (reason: 상태 코드 또는 오류 종류)", ("upstream", "reason")
+)
+upstream_hedges = registry.counter(
+    "voice_app_upstream_hedges_total", "응답이 늦어 같은 요청을 하나 더 보낸 수 (outcome: 나중 요청이 이겼는지)",
+    ("upstream", "outcome")
+)
+upstream_rejected = registry.counter(
+    "voice_app_upstream_rejected_total", "회로가 열려 있거나 시간 한도가 지나 보내지 않은 호출 수", ("upstream", "reason")
+)
+
+
+class UpstreamError(Exception):
+    """
+    업스트림(OpenAI/ElevenLabs) 호출 실패. 라우터는 이 예외를 그대로 올려 보내고,
+    main.py의 예외 처리기가 일관된 502/503 응답(필요하면 Retry-After)으로 바꿉니다.
+    """
+
+    def __init__(self, upstream: str, message: str, status_code: int | None = None, retry_after: float | None = None):
+        super().__init__(message)
+        self.upstream = upstream
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def http_status(self) -> int:
+        # 잠시 뒤 다시 시도하면 될 수 있는 경우는 503, 그 밖의 업스트림 오류는 502
+        if self.retry_after is not None or self.status_code in (None, 429, 503, 504):
+            return 503
+        return 502
+
+    @property
+    def detail(self) -> str:
+        return f"{self.upstream}: {self}"
+
+
+class UpstreamUnavailable(UpstreamError):
+    """회로가 열려 있거나, 시간 한도 안에 응답을 받지 못한 경우"""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_from_response(upstream: str, response: httpx.Response, action: str) -> UpstreamError:
+    """상태 코드가 실패인 응답을 UpstreamError로 변환 (본문을 이미 읽었다면 앞부분을 메시지에 포함)"""
+    try:
+        body = response.text[:300]
+    except httpx.ResponseNotRead:
+        body = ""
+    return UpstreamError(
+        upstream,
+        f"{action} 실패 ({response.status_code}) {body}".strip(),
+        status_code=response.status_code,
+        retry_after=parse_retry_after(response.headers.get("retry-after")),
+    )
+
+
+def as_upstream_error(exc: BaseException, upstream: str) -> UpstreamError | None:
+    """
+    OpenAI SDK/httpx 예외를 UpstreamError로 변환. 업스트림과 무관한 예외면 None.
+    SDK는 전송 계층에서 난 예외를 APIConnectionError로 감싸므로 원인(__cause__)까지 확인합니다.
+    """
+    seen = exc
+    while seen is not None:
+        if isinstance(seen, UpstreamError):
+            return seen
+        seen = seen.__cause__
+
+    import openai
+
+    if isinstance(exc, openai.APIStatusError):
+        return UpstreamError(
+            upstream, f"{exc.status_code} {exc.message}", status_code=exc.status_code,
+            retry_after=parse_retry_after(exc.response.headers.get("retry-after")),
+        )
+    if isinstance(exc, openai.APITimeoutError) or isinstance(exc, httpx.TimeoutException):
+        return UpstreamUnavailable(upstream, "응답 시간 초과")
+    if isinstance(exc, (openai.APIConnectionError, httpx.TransportError)):
+        return UpstreamUnavailable(upstream, f"연결 실패: {exc}")
+    return None
+
+
+@contextmanager
+def upstream_errors(upstream: str):
+    """with upstream_errors("openai"): ... 블록에서 난 SDK/httpx 예외를 UpstreamError로 바꿔 올림"""
+    try:
+        yield
+    except UpstreamError:
+        raise
+    except Exception as e:
+        error = as_upstream_error(e, upstream)
+        if error is None:
+            raise
+        raise error from e
+
+
+_deadline: ContextVar[float | None] = ContextVar("upstream_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float):
+    """
+    with deadline(30): ... 블록 안의 업스트림 호출(재시도, 백오프 대기 포함)이 모두 이 시간 안에 끝나도록 제한.
+    바깥에 더 짧은 한도가 있으면 그것을 따름
+    """
+    until = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(until if outer is None else min(outer, until))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class CircuitBreaker:
+    """
+    업스트림별 회로 차단기. closed → (연속 실패 threshold번) open → reset_timeout 뒤 half_open(시험 호출 1개) →
+    성공하면 closed, 실패하면 다시 open. open 동안에는 업스트림을 부르지 않고 바로 실패합니다.
+    """
+
+    def __init__(self, name: str, threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_SECONDS):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probe_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def acquire(self):
+        """호출해도 되는지 확인. 안 되면 UpstreamUnavailable"""
+        state = self.state
+        if state == "closed":
+            return
+        now = time.monotonic()
+        # 시험 호출이 결과 없이 끝났을 때(취소 등) 막히지 않도록, 오래된 시험 호출은 다시 허용
+        if state == "half_open" and (self._probe_started is None or now - self._probe_started >= self.reset_timeout):
+            self._probe_started = now
+            return
+        upstream_rejected.inc(upstream=self.name, reason="circuit_open")
+        raise UpstreamUnavailable(self.name, "일시적으로 사용할 수 없습니다 (회로 차단)", retry_after=max(1.0, self.retry_after()))
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        probing = self._probe_started is not None
+        if probing or self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning(f"{self.name} 회로 열림 (연속 실패 {self.failures}회)")
+            self.opened_at = time.monotonic()
+            self._probe_started = None
+
+
+breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    if upstream not in breakers:
+        breakers[upstream] = CircuitBreaker(upstream)
+    return breakers[upstream]
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = UPSTREAM_MAX_ATTEMPTS
+    backoff_base: float = UPSTREAM_BACKOFF_BASE
+    backoff_max: float = UPSTREAM_BACKOFF_MAX
+    deadline: float = UPSTREAM_DEADLINE_SECONDS
+    # 이 시간(초) 안에 응답 헤더가 오지 않으면 같은 요청을 하나 더 보내 먼저 온 쪽을 사용 (None이면 사용 안 함)
+    hedge_after: float | None = None
+    # 다시 보내도 결과가 같은(부작용 없는) POST 경로. 재시도와 hedge는 이 경로와 GET/DELETE에만 적용
+    idempotent_paths: tuple[str, ...] = ()
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    업스트림 호출마다 회로 차단기 확인 → (필요하면 hedge) 전송 → 실패 시 시간 한도 안에서 재시도.
+    재시도 대기는 Retry-After가 있으면 그 값을, 없으면 지터를 준 지수 백오프를 씁니다.
+    재시도 후에도 실패 상태 코드면 응답을 그대로 돌려주어 호출한 쪽이 본문을 보고 처리하게 합니다.
+    """
+
+    def __init__(self, upstream: str, inner: httpx.AsyncBaseTransport, policy: RetryPolicy):
+        self.upstream = upstream
+        self.policy = policy
+        self.breaker = get_breaker(upstream)
+        self._inner = inner
+
+    def _idempotent(self, request: httpx.Request) -> bool:
+        if request.method in ("GET", "HEAD", "DELETE"):
+            return True
+        return any(part in request.url.path for part in self.policy.idempotent_paths)
+
+    def _apply_timeout(self, request: httpx.Request, remaining: float):
+        timeout = dict(request.extensions.get("timeout") or {})
+        for key in ("connect", "read", "write", "pool"):
+            current = timeout.get(key)
+            timeout[key] = remaining if current is None else min(current, remaining)
+        request.extensions["timeout"] = timeout
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        until = started + self.policy.deadline
+        outer = _deadline.get()
+        if outer is not None:
+            until = min(until, outer)
+        idempotent = self._idempotent(request)
+
+        attempt = 0
+        while True:
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                upstream_rejected.inc(upstream=self.upstream, reason="deadline")
+                raise UpstreamUnavailable(self.upstream, "시간 한도 안에 응답을 받지 못했습니다.")
+            self.breaker.acquire()
+            self._apply_timeout(request, remaining)
+            attempt += 1
+            last = attempt >= self.policy.max_attempts
+
+            try:
+                if idempotent and self.policy.hedge_after is not None and self.policy.hedge_after < remaining:
+                    response = await self._hedged(request)
+                else:
+                    response = await self._inner.handle_async_request(request)
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                wait = self.policy.backoff(attempt)
+                if last or not (idempotent or isinstance(e, _NOT_SENT_ERRORS)) or wait >= until - time.monotonic():
+                    raise UpstreamUnavailable(self.upstream, f"연결 실패: {type(e).__name__} {e}") from e
+                upstream_retries.inc(upstream=self.upstream, reason=type(e).__name__)
+                await asyncio.sleep(wait)
+                continue
+
+            status = response.status_code
+            if status not in RETRY_STATUSES:
+                self.breaker.record_success()
+                return response
+            if status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()  # 429는 업스트림이 정상적으로 거절한 것
+
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            wait = retry_after if retry_after is not None else self.policy.backoff(attempt)
+            # 429는 처리하지 않고 거절한 것이므로 부작용이 있는 요청도 다시 보낼 수 있음
+            retryable = idempotent or status == 429
+            if last or not retryable or wait >= until - time.monotonic():
+                return response
+            upstream_retries.inc(upstream=self.upstream, reason=str(status))
+            await response.aclose()
+            await asyncio.sleep(wait)
+
+    async def _hedged(self, request: httpx.Request) -> httpx.Response:
+        """
+        첫 요청이 hedge_after 안에 응답 헤더를 받지 못하면 같은 요청을 하나 더 보내고, 먼저 성공한 응답을 사용.
+        진 쪽은 취소하거나 받은 응답을 닫음
+        """
+        first = asyncio.create_task(self._inner.handle_async_request(request))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.policy.hedge_after)
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if done:
+            return first.result()
+
+        second = asyncio.create_task(self._inner.handle_async_request(request))
+        pending = {first, second}
+        winner = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and task.result().status_code < 500 and winner is None:
+                        winner = task
+            if winner is None:
+                # 둘 다 실패: 먼저 시작한 쪽의 결과(응답 또는 예외)를 그대로 넘겨 재시도 판단에 맡김
+                if second.exception() is None:
+                    await second.result().aclose()
+                return first.result()
+            upstream_hedges.inc(upstream=self.upstream, outcome="hedge_won" if winner is second else "first_won")
+            return winner.result()
+        finally:
+            for task in (first, second):
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None and winner is not None:
+                    await task.result().aclose()
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+def _circuit_metrics():
+    states = {"closed": 0, "half_open": 1, "open": 2}
+    return [(
+        "voice_app_upstream_circuit_state", "gauge", "업스트림 회로 상태 (0: closed, 1: half_open, 2: open)",
+        [({"upstream": name}, states[breaker.state]) for name, breaker in breakers.items()],
+    )]
+
+
+registry.add_collector(_circuit_metrics)
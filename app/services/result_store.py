@@ -0,0 +1,81 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+# 응답 이후에 계산되는 결과(역번역 등)를 request_id 기준으로 잠시 보관
+RESULT_TTL_SECONDS = 600
+MAX_RESULTS = 1000
+
+
+class RequestResultStore:
+    """
+    generate-content 응답과 별도로 전달할 결과를 보관하는 메모리 저장소.
+    아직 계산 중인 값은 asyncio.Task로 보관하고, 조회 시 완료될 때까지 기다립니다.
+    프로세스 메모리에 있으므로 워커를 여러 개 띄우면 조회 요청이 같은 워커로 가야 합니다 (sticky session 또는 단일 워커).
+    """
+
+    def __init__(self, ttl: float = RESULT_TTL_SECONDS, max_entries: int = MAX_RESULTS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._entries:
+            request_id, entry = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_entries and now - entry["created"] < self.ttl:
+                break
+            self._entries.pop(request_id)
+            for task in entry["tasks"].values():
+                task.cancel()
+
+    def create(self, request_id: str, user_id: str, **fields):
+        self._entries[request_id] = {
+            "user_id": user_id,
+            "created": time.monotonic(),
+            "fields": dict(fields),
+            "tasks": {},
+        }
+        self._evict()
+
+    def set(self, request_id: str, field: str, value):
+        entry = self._entries.get(request_id)
+        if entry is not None:
+            entry["fields"][field] = value
+
+    def attach(self, request_id: str, field: str, task: asyncio.Task):
+        """값을 계산 중인 태스크를 등록. 완료되면 결과가 field에 기록됨"""
+        entry = self._entries.get(request_id)
+        if entry is None:
+            return
+        entry["tasks"][field] = task
+
+        def _done(t: asyncio.Task):
+            entry["tasks"].pop(field, None)
+            if t.cancelled():
+                return
+            if t.exception() is not None:
+                entry["fields"][field + "_error"] = str(t.exception())
+            else:
+                entry["fields"][field] = t.result()
+
+        task.add_done_callback(_done)
+
+    async def get(self, request_id: str, user_id: str, timeout: float = 30.0) -> dict | None:
+        """요청 결과를 반환. 계산 중인 항목은 timeout 동안 완료를 기다림"""
+        entry = self._entries.get(request_id)
+        if entry is None or entry["user_id"] != user_id:
+            return None
+
+        pending = list(entry["tasks"].values())
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+            # done 콜백이 결과를 기록할 수 있도록 한 번 양보
+            await asyncio.sleep(0)
+
+        result = dict(entry["fields"])
+        result["pending"] = sorted(entry["tasks"].keys())
+        return result
+
+
+result_store = RequestResultStore()
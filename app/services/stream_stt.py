@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import os
+import threading
+
+import av
+import numpy as np
+
+from app.services.stt_service import transcribe_pcm
+from app.utils.audio_decode import SAMPLE_RATE
+from app.utils.concurrency import BoundedPool
+from app.utils.vad import SpeechSegmenter
+
+logger = logging.getLogger(__name__)
+
+# 동시에 열 수 있는 실시간 인식 세션 수 (세션마다 디코딩 스레드 하나를 계속 점유)
+STT_STREAM_SESSIONS = int(os.getenv("STT_STREAM_SESSIONS", "16"))
+# 발화가 이어지는 동안 이 간격(초)마다 지금까지의 구간을 인식해 부분 결과로 보냄 (0이면 끔)
+STT_STREAM_PARTIAL_INTERVAL = float(os.getenv("STT_STREAM_PARTIAL_INTERVAL", "1.5"))
+
+_decode_pool = BoundedPool(STT_STREAM_SESSIONS, "stt_stream")
+
+
+class _ChunkPipe:
+    """
+    WebSocket으로 받은 조각을 PyAV가 파일처럼 읽도록 이어 주는 버퍼.
+    데이터가 없으면 read()가 다음 조각이 올 때까지 기다립니다 (seek를 제공하지 않으므로 스트림으로 취급됨).
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def write(self, data: bytes):
+        with self._cond:
+            self._buffer += data
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def read(self, size: int = -1) -> bytes:
+        with self._cond:
+            while not self._buffer and not self._closed:
+                self._cond.wait()
+            if size < 0 or size >= len(self._buffer):
+                size = len(self._buffer)
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            return data
+
+
+def _decode_stream(pipe: _ChunkPipe, container_format: str | None, emit):
+    """조각 단위로 도착하는 컨테이너(webm/ogg 등)를 디코딩하면서 PCM을 emit으로 넘김"""
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+    with av.open(pipe, format=container_format, mode="r") as container:
+        stream = container.streams.audio[0]
+        try:
+            for frame in container.decode(stream):
+                for out in resampler.resample(frame):
+                    emit(out.to_ndarray().reshape(-1))
+        except av.error.EOFError:
+            pass  # 녹음이 중간에 끊긴 경우 마지막 클러스터가 불완전할 수 있음
+    for out in resampler.resample(None):
+        emit(out.to_ndarray().reshape(-1))
+
+
+class StreamingTranscriber:
+    """
+    녹음 중에 들어오는 오디오 조각을 바로 디코딩하고, VAD로 발화가 끝날 때마다 인식해 결과를 보냅니다.
+    on_event: {"type": "partial" | "final", ...} 이벤트를 받는 비동기 함수
+    audio_format: webm(브라우저 MediaRecorder 기본), ogg 등 컨테이너 형식 또는 pcm16(16kHz mono little-endian)
+    """
+
+    def __init__(self, on_event, audio_format: str = "webm", partial_interval: float = STT_STREAM_PARTIAL_INTERVAL):
+        self.on_event = on_event
+        self.audio_format = audio_format
+        self.partial_interval = partial_interval
+        self.segmenter = SpeechSegmenter()
+        self.texts: list[str] = []
+
+        self._pcm: asyncio.Queue = asyncio.Queue()
+        self._segments: asyncio.Queue = asyncio.Queue()
+        self._pipe = _ChunkPipe()
+        self._odd_byte = b""
+        self._tasks: list[asyncio.Task] = []
+        self._partial_task: asyncio.Task | None = None
+        self._partial_mark = 0
+
+    @staticmethod
+    def has_capacity() -> bool:
+        limiter = _decode_pool.limiter
+        return limiter.borrowed_tokens < limiter.total_tokens
+
+    def start(self):
+        if self.audio_format != "pcm16":
+            loop = asyncio.get_running_loop()
+
+            def emit(pcm):
+                loop.call_soon_threadsafe(self._pcm.put_nowait, pcm)
+
+            self._tasks.append(asyncio.create_task(self._run_decoder(emit)))
+        self._tasks.append(asyncio.create_task(self._segment_loop()))
+        self._tasks.append(asyncio.create_task(self._final_loop()))
+
+    async def _run_decoder(self, emit):
+        try:
+            await _decode_pool.run(_decode_stream, self._pipe, self.audio_format, emit)
+        except Exception as e:
+            logger.warning(f"실시간 디코딩 실패: {e}")
+            await self.on_event({"type": "error", "detail": "오디오를 디코딩하지 못했습니다."})
+        finally:
+            self._pcm.put_nowait(None)
+
+    def feed(self, chunk: bytes):
+        if self.audio_format != "pcm16":
+            self._pipe.write(chunk)
+            return
+        data = self._odd_byte + chunk
+        even = len(data) - len(data) % 2
+        self._odd_byte = data[even:]
+        if even:
+            self._pcm.put_nowait(np.frombuffer(data[:even], dtype="<i2").astype(np.int16))
+
+    async def _segment_loop(self):
+        while True:
+            pcm = await self._pcm.get()
+            if pcm is None:
+                break
+            for segment in self.segmenter.push(pcm):
+                self._partial_mark = 0
+                self._segments.put_nowait(segment)
+            self._maybe_partial()
+        last = self.segmenter.flush()
+        if last is not None:
+            self._segments.put_nowait(last)
+        self._segments.put_nowait(None)
+
+    def _maybe_partial(self):
+        if self.partial_interval <= 0 or not self.segmenter.in_speech:
+            return
+        if self._partial_task is not None and not self._partial_task.done():
+            return  # 이전 부분 인식이 아직 진행 중이면 건너뜀
+        current = self.segmenter.current()
+        if len(current) - self._partial_mark < self.partial_interval * SAMPLE_RATE:
+            return
+        self._partial_mark = len(current)
+        index = len(self.texts) + self._segments.qsize()
+        self._partial_task = asyncio.create_task(self._send_partial(index, current))
+
+    async def _send_partial(self, index: int, pcm: np.ndarray):
+        try:
+            text = await transcribe_pcm(pcm)
+        except Exception as e:
+            logger.info(f"부분 인식 실패 (무시): {e}")
+            return
+        if text and len(self.texts) <= index:  # 그사이 구간이 확정되었으면 보내지 않음
+            await self.on_event({"type": "partial", "index": index, "text": text})
+
+    async def _final_loop(self):
+        # 확정 구간은 순서대로 하나씩 인식
+        while True:
+            segment = await self._segments.get()
+            if segment is None:
+                return
+            try:
+                text = (await transcribe_pcm(segment)).strip()
+            except Exception as e:
+                logger.warning(f"구간 인식 실패: {e}")
+                text = ""
+            index = len(self.texts)
+            self.texts.append(text)
+            await self.on_event({
+                "type": "final",
+                "index": index,
+                "text": text,
+                "duration": round(len(segment) / SAMPLE_RATE, 2),
+            })
+
+    async def finish(self) -> str:
+        """입력을 마치고 남은 구간까지 인식한 뒤 전체 텍스트를 반환"""
+        self._pipe.close()
+        if self.audio_format == "pcm16":
+            self._pcm.put_nowait(None)
+        await asyncio.gather(*self._tasks)
+        if self._partial_task is not None:
+            self._partial_task.cancel()
+        return " ".join(text for text in self.texts if text)
+
+    async def abort(self):
+        self._pipe.close()
+        for task in self._tasks + ([self._partial_task] if self._partial_task else []):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
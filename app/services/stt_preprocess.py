@@ -0,0 +1,103 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.utils.audio_decode import SAMPLE_RATE, decode_pcm, encode_opus, pcm_to_wav_bytes
+from app.utils.vad import speech_bounds
+
+logger = logging.getLogger(__name__)
+
+# 앞뒤 무음 제거 (0이면 끔)
+STT_TRIM_SILENCE = os.getenv("STT_TRIM_SILENCE", "1") != "0"
+# API로 올릴 형식: opus(Ogg/Opus로 압축) / wav(16kHz mono PCM) / original(잘라 낸 부분이 없으면 받은 그대로)
+STT_UPLOAD_FORMAT = os.getenv("STT_UPLOAD_FORMAT", "opus")
+STT_OPUS_BITRATE = int(os.getenv("STT_OPUS_BITRATE", "24000"))
+
+# 요청 누적 통계 (bytes_saved = 원본 - 실제 업로드)
+upload_stats = {
+    "requests": 0,
+    "silent_skipped": 0,
+    "bytes_original": 0,
+    "bytes_uploaded": 0,
+    "seconds_trimmed": 0.0,
+}
+# 전처리는 CPU 스레드 풀에서도 돌기 때문에 누적은 잠금 안에서
+_stats_lock = threading.Lock()
+
+
+def count_upload(**deltas):
+    """upload_stats에 값을 더함 (예: count_upload(requests=1, bytes_original=n))"""
+    with _stats_lock:
+        for key, value in deltas.items():
+            upload_stats[key] += value
+
+
+def encode_for_upload(pcm: np.ndarray) -> tuple[bytes, str]:
+    if STT_UPLOAD_FORMAT == "opus":
+        return encode_opus(pcm, STT_OPUS_BITRATE), "audio.ogg"
+    return pcm_to_wav_bytes(pcm), "audio.wav"
+
+
+@dataclass
+class PreparedAudio:
+    original: bytes
+    filename: str
+    pcm: np.ndarray | None = None  # 디코딩에 실패하면 None (원본을 그대로 업로드)
+    silent: bool = False
+    seconds_trimmed: float = 0.0
+    prepare_ms: float = 0.0
+    _upload: tuple[bytes, str] | None = field(default=None, repr=False)
+
+    def upload(self) -> tuple[bytes, str]:
+        """API에 보낼 (바이트, 파일명). 처음 호출할 때 인코딩"""
+        if self._upload is None:
+            started = time.perf_counter()
+            if self.pcm is None or (STT_UPLOAD_FORMAT == "original" and not self.seconds_trimmed):
+                self._upload = (self.original, self.filename)
+            else:
+                self._upload = encode_for_upload(self.pcm)
+            self.prepare_ms += (time.perf_counter() - started) * 1000
+            count_upload(bytes_uploaded=len(self._upload[0]))
+            self._report()
+        return self._upload
+
+    def _report(self):
+        sent = len(self._upload[0])
+        logger.info(
+            f"STT 업로드 {len(self.original)} → {sent} bytes ({len(self.original) - sent:+d} 절약), "
+            f"무음 {self.seconds_trimmed:.1f}s 제거, 전처리 {self.prepare_ms:.0f}ms"
+        )
+
+
+def prepare_audio(audio_bytes: bytes, filename: str) -> PreparedAudio:
+    """
+    업로드된 음성을 디코딩해 앞뒤 무음을 잘라 냄. 전부 무음이면 silent=True (STT 호출 생략)
+    """
+    started = time.perf_counter()
+    count_upload(requests=1, bytes_original=len(audio_bytes))
+    prepared = PreparedAudio(audio_bytes, filename)
+    try:
+        pcm = decode_pcm(audio_bytes)
+    except Exception as e:
+        logger.warning(f"STT 전처리용 디코딩 실패, 원본을 그대로 사용: {e}")
+        return prepared
+
+    if STT_TRIM_SILENCE:
+        bounds = speech_bounds(pcm)
+        if bounds is None:
+            prepared.silent = True
+            count_upload(silent_skipped=1)
+            logger.info(f"음성이 없는 입력 ({len(pcm) / SAMPLE_RATE:.1f}s): STT 호출 생략")
+            return prepared
+        start, end = bounds
+        prepared.seconds_trimmed = (len(pcm) - (end - start)) / SAMPLE_RATE
+        count_upload(seconds_trimmed=prepared.seconds_trimmed)
+        pcm = pcm[start:end]
+
+    prepared.pcm = pcm
+    prepared.prepare_ms = (time.perf_counter() - started) * 1000
+    return prepared
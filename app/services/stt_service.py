@@ -1,47 +1,159 @@
+import asyncio
+import logging
 import os
-from pydub import AudioSegment
-from openai import OpenAI
 from dotenv import load_dotenv
-from faster_whisper import WhisperModel
+from app.utils.concurrency import run_blocking, run_cpu
+from app.utils.audio_decode import decode_pcm, to_float32, write_wav
+from app.services.http_clients import upstreams
+from app.services.resilience import upstream_errors
+from app.services.stt_preprocess import prepare_audio, encode_for_upload, count_upload
+from app.services.whisper_engine import whisper_engine, STT_LANGUAGE
+from app.utils.text_utils import join_overlapping
+from app.utils.vad import chunk_bounds
+from app.utils.metrics import span
+logger = logging.getLogger(__name__)
+
 load_dotenv()
 
-# OpenAI 클라이언트 초기화
-api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=api_key)
+# api: OpenAI whisper-1 / local: 서버 안의 faster-whisper (모델을 못 불러오거나 실패하면 API로 대체)
+STT_BACKEND = os.getenv("STT_BACKEND", "api")
+# 긴 음성은 이 길이(초) 안팎으로 무음 지점에서 나눠 동시에 인식 (0이면 한 번에 보냄)
+STT_CHUNK_SECONDS = float(os.getenv("STT_CHUNK_SECONDS", "30"))
+# 무음을 찾지 못해 말하는 도중에 자를 때 앞뒤 구간을 겹치는 길이(초)
+STT_CHUNK_OVERLAP = float(os.getenv("STT_CHUNK_OVERLAP", "1.0"))
+# 한 요청에서 동시에 인식할 구간 수 (로컬 모델은 WHISPER_WORKERS로 한 번 더 제한됨)
+STT_CHUNK_CONCURRENCY = int(os.getenv("STT_CHUNK_CONCURRENCY", "4"))
 
 def convert_webm_to_wav(webm_path: str, wav_path: str) -> None:
     """
-    webm 파일을 wav 파일로 변환 (pydub 사용)
+    webm 파일을 wav 파일로 변환 (PyAV로 디코딩하므로 ffmpeg 실행 파일이 필요 없음)
     """
     try:
-        audio = AudioSegment.from_file(webm_path) # 확장자 자동 인식
         # OpenAI Whisper API는 파일 용량 제한이 있으므로 모노/16kHz로 줄이면 좋음
-        audio = audio.set_channels(1).set_frame_rate(16000)
-        audio.export(wav_path, format="wav")
-        print(f"🎵 변환 완료: {wav_path}")
+        write_wav(wav_path, decode_pcm(webm_path))
+        logger.debug(f"변환 완료: {wav_path}")
     except Exception as e:
-        print(f"❌ 오디오 변환 실패: {e}")
-        # ffmpeg가 없으면 여기서 에러가 납니다.
+        logger.warning(f"오디오 변환 실패: {e}")
         raise e
 
-def transcribe_audio_file_local(file_path: str) -> str:
+async def convert_webm_to_wav_async(webm_path: str, wav_path: str) -> None:
+    """
+    디코딩은 CPU를 점유하므로 CPU 작업용 스레드 풀에서 실행
+    """
+    await run_cpu(convert_webm_to_wav, webm_path, wav_path)
+
+def _read_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+async def transcribe_with_api(audio_bytes: bytes, filename: str) -> str:
+    with upstream_errors("openai"):
+        transcript = await upstreams.openai.audio.transcriptions.create(
+            model="whisper-1",
+            file=(filename, audio_bytes),
+            language=STT_LANGUAGE # 한국어 우선 인식 (필요 시 제거 가능)
+        )
+    return transcript.text
+
+async def transcribe_with_local(audio_bytes: bytes) -> str:
+    # 메모리에서 16kHz mono PCM으로 디코딩해 바로 모델에 전달 (중간 파일 없음)
+    pcm = await run_cpu(decode_pcm, audio_bytes)
+    return await whisper_engine.transcribe_async(to_float32(pcm))
+
+async def transcribe_pcm(pcm, track_upload: bool = False) -> str:
+    """
+    이미 디코딩된 16kHz mono PCM 구간을 텍스트로 변환 (실시간 스트리밍/구간 인식용, 실패 시 예외 발생)
+    """
+    if STT_BACKEND == "local" and whisper_engine.available:
+        try:
+            return await whisper_engine.transcribe_async(to_float32(pcm))
+        except Exception as e:
+            logger.warning(f"로컬 STT 실패, API로 재시도: {e}")
+    data, filename = await run_cpu(encode_for_upload, pcm)
+    if track_upload:
+        count_upload(bytes_uploaded=len(data))
+    return await transcribe_with_api(data, filename)
+
+def plan_chunks(pcm) -> list[tuple[int, int, bool]]:
+    if STT_CHUNK_SECONDS <= 0:
+        return [(0, len(pcm), False)]
+    return chunk_bounds(pcm, STT_CHUNK_SECONDS, STT_CHUNK_OVERLAP)
+
+async def transcribe_chunks(pcm, chunks: list[tuple[int, int, bool]]) -> str:
+    """
+    나눈 구간들을 최대 STT_CHUNK_CONCURRENCY개씩 동시에 인식하고 순서대로 이어 붙임.
+    겹쳐 자른 경계는 중복된 단어를 한 번만 남김. 한 구간이라도 실패하면 나머지를 취소하고 예외 발생
+    """
+    semaphore = asyncio.Semaphore(STT_CHUNK_CONCURRENCY)
+
+    async def run(start: int, end: int) -> str:
+        async with semaphore:
+            return (await transcribe_pcm(pcm[start:end], track_upload=True)).strip()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(run(start, end)) for start, end, _ in chunks]
+    except* Exception as e:
+        # 호출부가 UpstreamError 등을 그대로 처리할 수 있도록 ExceptionGroup을 풀어 첫 예외를 올림
+        raise e.exceptions[0] from None
+
+    text = ""
+    for (_, _, overlapped), task in zip(chunks, tasks):
+        part = task.result()
+        text = join_overlapping(text, part) if overlapped else f"{text} {part}".strip()
+    return text
+
+async def transcribe_audio(audio_bytes: bytes, filename: str) -> str:
     """
-    OpenAI API (Whisper)를 사용하여 음성을 텍스트로 변환
+    음성을 텍스트로 변환 (STT_BACKEND=local이면 서버 안의 Whisper 모델, 아니면 OpenAI API)
+    앞뒤 무음을 잘라 낸 뒤 인식하며, 음성이 전혀 없으면 빈 문자열을 반환
     """
+    with span("decode"):
+        prepared = await run_cpu(prepare_audio, audio_bytes, filename)
+    if prepared.silent:
+        logger.info("음성이 감지되지 않아 STT를 건너뜁니다.")
+        return ""
+
+    chunks = plan_chunks(prepared.pcm) if prepared.pcm is not None else []
+    if len(chunks) > 1:
+        try:
+            logger.debug(f"STT 처리 중 ({len(chunks)}개 구간 병렬)")
+            with span("stt"):
+                result_text = await transcribe_chunks(prepared.pcm, chunks)
+            logger.debug(f"STT 결과: {result_text}")
+            return result_text
+        except Exception as e:
+            # 실패 문구를 인식 결과처럼 돌려주지 않고 예외를 그대로 올림
+            logger.warning(f"STT 변환 실패: {e}")
+            raise
+
+    if STT_BACKEND == "local" and whisper_engine.available and prepared.pcm is not None:
+        try:
+            logger.debug("STT 처리 중 (로컬 Whisper)")
+            with span("stt"):
+                result_text = await whisper_engine.transcribe_async(to_float32(prepared.pcm))
+            logger.debug(f"STT 결과: {result_text}")
+            return result_text
+        except Exception as e:
+            logger.warning(f"로컬 STT 실패, API로 재시도: {e}")
+
     try:
-        print(f"📝 STT 요청 중 (OpenAI Whisper)...")
-        
-        with open(file_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1", 
-                file=audio_file,
-                language="ko" # 한국어 우선 인식 (필요 시 제거 가능)
-            )
-            
-        result_text = transcript.text
-        print(f"STT 결과: {result_text}")
+        logger.debug("STT 요청 중 (OpenAI Whisper)")
+        # 잘라 내고 압축한 음성만 업로드
+        with span("stt_encode"):
+            data, upload_name = await run_cpu(prepared.upload)
+        with span("stt"):
+            result_text = await transcribe_with_api(data, upload_name)
+        logger.debug(f"STT 결과: {result_text}")
         return result_text
 
     except Exception as e:
-        print(f"STT 변환 실패: {e}")
-        return "음성 인식에 실패했습니다."
\ No newline at end of file
+        logger.warning(f"STT 변환 실패: {e}")
+        raise
+
+async def transcribe_audio_file_local(file_path: str) -> str:
+    """
+    파일로 저장된 음성을 텍스트로 변환
+    """
+    audio_bytes = await run_blocking(_read_file, file_path)
+    return await transcribe_audio(audio_bytes, os.path.basename(file_path))
\ No newline at end of file
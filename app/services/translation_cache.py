@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+from app.utils.concurrency import run_blocking
+from app.utils.sqlite_utils import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 1차: 프로세스 내부 LRU
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "2048"))
+TRANSLATION_CACHE_TTL = float(os.getenv("TRANSLATION_CACHE_TTL", str(7 * 24 * 3600)))
+# 2차: 여러 워커가 공유하는 SQLite(WAL). 빈 문자열이면 사용하지 않음
+TRANSLATION_CACHE_DB = os.getenv("TRANSLATION_CACHE_DB", os.path.join(BASE_DIR, "cache", "translations.db"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS translations_expires_at ON translations (expires_at);
+"""
+
+# 만료 항목 정리 주기 (set 호출 횟수 기준)
+_PURGE_EVERY = 500
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_translation_key(kind: str, text: str, target_lang: str, domain: str, model: str, glossary_digest: str = "") -> str:
+    """
+    kind: translate / back_translate
+    glossary_digest: 프롬프트에 들어간 용어집 항목의 해시 (용어집이 바뀌면 다른 키가 됨)
+    """
+    raw = "\x1f".join([kind, normalize_text(text), target_lang, domain or "none", model, glossary_digest])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    번역 결과 2단 캐시: 프로세스 내 LRU → 공유 SQLite.
+    SQLite 적중 시 메모리 LRU로 승격합니다.
+    """
+
+    def __init__(self, db_path: str = TRANSLATION_CACHE_DB, max_entries: int = TRANSLATION_CACHE_SIZE, ttl: float = TRANSLATION_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._db = SQLiteStore(db_path, _SCHEMA) if db_path else None
+        self._sets = 0
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.memory_hits + self.db_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.memory_hits + self.db_hits) / total if total else 0.0,
+            "entries": len(self._memory),
+        }
+
+    def _remember(self, key: str, expires_at: float, value: dict):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _db_get(self, key: str):
+        rows = self._db.execute("SELECT value, expires_at FROM translations WHERE key = ? AND expires_at > ?", (key, time.time()))
+        return (json.loads(rows[0][0]), rows[0][1]) if rows else None
+
+    def _db_set(self, key: str, value: dict, expires_at: float, purge: bool):
+        conn = self._db.connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO translations (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), expires_at),
+        )
+        if purge:
+            conn.execute("DELETE FROM translations WHERE expires_at <= ?", (time.time(),))
+
+    async def get(self, key: str) -> dict | None:
+        cached = self._memory.get(key)
+        if cached is not None:
+            expires_at, value = cached
+            if expires_at > time.time():
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            self._memory.pop(key, None)
+
+        if self._db is not None:
+            try:
+                found = await run_blocking(self._db_get, key)
+            except Exception as e:
+                logger.warning(f"번역 캐시(SQLite) 조회 실패: {e}")
+                found = None
+            if found is not None:
+                value, expires_at = found
+                self._remember(key, expires_at, value)
+                self.db_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict, ttl: float | None = None):
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl)
+        self._remember(key, expires_at, value)
+        if self._db is not None:
+            self._sets += 1
+            try:
+                await run_blocking(self._db_set, key, value, expires_at, self._sets % _PURGE_EVERY == 0)
+            except Exception as e:
+                logger.warning(f"번역 캐시(SQLite) 저장 실패: {e}")
+
+
+translation_cache = TranslationCache()
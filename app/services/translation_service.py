@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from app.services.knowledge_service import GlossaryEntry, find_domain_entries
+from app.services.processor_service import GPT_MODEL, chat_completion, stream_chat_completion
+from app.services.resilience import UpstreamError
+from app.services.prompt_builder import (
+    BATCH_TOKEN_BUDGET,
+    build_back_translation_prompt,
+    build_batch_translation_prompt,
+    build_translation_prompt,
+    count_tokens,
+)
+from app.services.translation_cache import translation_cache, make_translation_key
+from app.utils.metrics import record_stage, timed
+
+logger = logging.getLogger(__name__)
+
+# 이 언어로 번역할 때는 역번역(검증)이 의미가 없음
+KOREAN_TARGETS = ["Korean", "한국어"]
+BACK_TRANSLATION_SKIPPED = "(대상 언어가 한국어입니다)"
+# 일괄 번역에서 LLM 호출 하나에 묶을 최대 문장 수
+TRANSLATION_BATCH_SIZE = int(os.getenv("TRANSLATION_BATCH_SIZE", "20"))
+
+
+@dataclass
+class TranslationResult:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    source_truncated: bool = False
+    cached: bool = False
+
+    def usage(self) -> dict:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "source_truncated": self.source_truncated,
+            "cached": self.cached,
+        }
+
+
+def _glossary_digest(glossary: list[GlossaryEntry] | None) -> str:
+    if not glossary:
+        return ""
+    return hashlib.sha256("\n".join(entry.format() for entry in glossary).encode("utf-8")).hexdigest()[:16]
+
+
+def _translation_key(source_text: str, target_lang: str, glossary, domain: str) -> str:
+    return make_translation_key("translate", source_text, target_lang, domain, GPT_MODEL, _glossary_digest(glossary))
+
+
+@timed("translate")
+async def translate(
+    source_text: str,
+    target_lang: str,
+    glossary: list[GlossaryEntry] | None = None,
+    domain: str = "none",
+) -> TranslationResult:
+    cache_key = _translation_key(source_text, target_lang, glossary, domain)
+    cached = await translation_cache.get(cache_key)
+    if cached is not None:
+        return TranslationResult(cached["text"], source_truncated=cached.get("source_truncated", False), cached=True)
+
+    prompt = build_translation_prompt(source_text, target_lang, glossary)
+    # 실패하면 원문을 번역문처럼 돌려주지 않고 UpstreamError를 올림
+    result = await chat_completion(prompt.messages, max_tokens=prompt.max_completion_tokens)
+
+    logger.info(
+        f"번역 토큰 사용량: prompt={result.prompt_tokens} (예상 {prompt.prompt_tokens}), "
+        f"completion={result.completion_tokens}, 용어 {len(prompt.glossary_used)}개"
+    )
+    await translation_cache.set(cache_key, {"text": result.text, "source_truncated": prompt.source_truncated})
+    return TranslationResult(
+        result.text,
+        result.prompt_tokens or prompt.prompt_tokens,
+        result.completion_tokens,
+        prompt.source_truncated,
+    )
+
+
+def _split_batches(texts: list[str]) -> list[list[int]]:
+    """문장 수(TRANSLATION_BATCH_SIZE)와 원문 토큰 합계(BATCH_TOKEN_BUDGET) 안에서 인덱스를 묶음"""
+    batches, current, tokens = [], [], 0
+    for i, text in enumerate(texts):
+        cost = count_tokens(text)
+        if current and (len(current) >= TRANSLATION_BATCH_SIZE or tokens + cost > BATCH_TOKEN_BUDGET):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append(i)
+        tokens += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_response(text: str, expected: int) -> list[str] | None:
+    text = text.strip()
+    if text.startswith("```"):  # 코드 블록으로 감싸서 답하는 경우
+        text = text.strip("`").removeprefix("json").strip()
+    try:
+        items = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(items, list) or len(items) != expected or not all(isinstance(item, str) for item in items):
+        return None
+    return [item.strip() for item in items]
+
+
+async def _translate_group(texts: list[str], glossaries: list, target_lang: str, domain: str) -> list[TranslationResult]:
+    if len(texts) == 1:
+        return [await translate(texts[0], target_lang, glossaries[0], domain=domain)]
+
+    # 묶음 전체의 용어집은 각 문장에 등장한 용어의 합집합
+    merged = list({entry.term: entry for glossary in glossaries for entry in glossary}.values())
+    prompt = build_batch_translation_prompt(texts, target_lang, merged)
+    try:
+        result = await chat_completion(prompt.messages, max_tokens=prompt.max_completion_tokens)
+        translated = _parse_batch_response(result.text, len(texts))
+    except UpstreamError:
+        # 업스트림 장애는 문장별로 다시 보내도 같으므로 바로 실패
+        raise
+    except Exception as e:
+        logger.warning(f"일괄 번역 실패: {e}")
+        translated = None
+    if translated is None:
+        # 형식이 맞지 않으면 문장별 번역으로 대체
+        logger.warning(f"일괄 번역 응답을 해석하지 못해 {len(texts)}개 문장을 하나씩 번역합니다.")
+        return list(await asyncio.gather(*(
+            translate(text, target_lang, glossary, domain=domain) for text, glossary in zip(texts, glossaries)
+        )))
+
+    logger.info(
+        f"일괄 번역 {len(texts)}문장 토큰 사용량: prompt={result.prompt_tokens} (예상 {prompt.prompt_tokens}), "
+        f"completion={result.completion_tokens}"
+    )
+    # 토큰 사용량은 문장 수로 나눠 기록
+    prompt_share = (result.prompt_tokens or prompt.prompt_tokens) // len(texts)
+    completion_share = result.completion_tokens // len(texts)
+    results = []
+    for text, glossary, translated_text in zip(texts, glossaries, translated):
+        await translation_cache.set(_translation_key(text, target_lang, glossary, domain), {"text": translated_text})
+        results.append(TranslationResult(translated_text, prompt_share, completion_share))
+    return results
+
+
+@timed("translate_batch")
+async def translate_batch(source_texts: list[str], target_lang: str, domain: str = "none") -> list[TranslationResult]:
+    """
+    같은 언어/도메인의 여러 문장을 번역. 캐시에 없는 문장만 TRANSLATION_BATCH_SIZE개씩 묶어 LLM 호출 한 번으로 번역하며,
+    결과는 문장별로 캐시하므로 이후 단건 translate()에서도 그대로 적중합니다.
+    """
+    glossaries = [find_domain_entries(domain, text) for text in source_texts]
+    results: list[TranslationResult | None] = [None] * len(source_texts)
+    missing: dict[str, list[int]] = {}  # 같은 원문은 한 번만 번역
+    for i, (text, glossary) in enumerate(zip(source_texts, glossaries)):
+        cached = await translation_cache.get(_translation_key(text, target_lang, glossary, domain))
+        if cached is not None:
+            results[i] = TranslationResult(cached["text"], source_truncated=cached.get("source_truncated", False), cached=True)
+        else:
+            missing.setdefault(text, []).append(i)
+
+    texts = list(missing)
+    firsts = [missing[text][0] for text in texts]
+    groups = _split_batches(texts)
+    translated = await asyncio.gather(*(
+        _translate_group([texts[i] for i in group], [glossaries[firsts[i]] for i in group], target_lang, domain)
+        for group in groups
+    ))
+    for group, group_results in zip(groups, translated):
+        for i, result in zip(group, group_results):
+            for index in missing[texts[i]]:
+                results[index] = result
+    return results
+
+
+async def stream_translation(
+    source_text: str,
+    target_lang: str,
+    glossary: list[GlossaryEntry] | None = None,
+    usage: dict | None = None,
+    domain: str = "none",
+):
+    """
+    번역 결과를 생성되는 대로 조각 단위로 반환(yield)
+    usage: 전달하면 스트림이 끝날 때 토큰 사용량이 기록됨
+    """
+    cache_key = _translation_key(source_text, target_lang, glossary, domain)
+    cached = await translation_cache.get(cache_key)
+    if cached is not None:
+        if usage is not None:
+            usage.update(prompt_tokens=0, completion_tokens=0, source_truncated=cached.get("source_truncated", False), cached=True)
+        yield cached["text"]
+        return
+
+    prompt = build_translation_prompt(source_text, target_lang, glossary)
+    if usage is not None:
+        usage.update(prompt_tokens=prompt.prompt_tokens, completion_tokens=0, source_truncated=prompt.source_truncated, cached=False)
+    parts = []
+    started = time.perf_counter()
+    async for delta in stream_chat_completion(prompt.messages, max_tokens=prompt.max_completion_tokens, usage=usage):
+        if not parts:
+            record_stage("translate_first_token", time.perf_counter() - started)
+        parts.append(delta)
+        yield delta
+    record_stage("translate", time.perf_counter() - started)
+    # 끝까지 받은 경우에만 캐시에 저장
+    await translation_cache.set(cache_key, {"text": "".join(parts).strip(), "source_truncated": prompt.source_truncated})
+
+
+@timed("back_translate")
+async def back_translate(translated_text: str, target_lang: str) -> str:
+    if target_lang in KOREAN_TARGETS:
+        return BACK_TRANSLATION_SKIPPED
+
+    cache_key = make_translation_key("back_translate", translated_text, "Korean", "none", GPT_MODEL)
+    cached = await translation_cache.get(cache_key)
+    if cached is not None:
+        return cached["text"]
+
+    # 실패하면 번역문을 역번역인 것처럼 돌려주지 않고 UpstreamError를 올려 보냄
+    # (결과 저장소는 back_translated_text_error로 기록)
+    prompt = build_back_translation_prompt(translated_text)
+    result = await chat_completion(prompt.messages, max_tokens=prompt.max_completion_tokens)
+    logger.info(f"역번역 토큰 사용량: prompt={result.prompt_tokens}, completion={result.completion_tokens}")
+    await translation_cache.set(cache_key, {"text": result.text})
+    return result.text
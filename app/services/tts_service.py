@@ -1,36 +1,59 @@
+import logging
 import os
-import requests
+import uuid
 from dotenv import load_dotenv
+from app.utils.concurrency import run_blocking
+from app.services.audio_cache import audio_cache, make_cache_key
+from app.services.http_clients import upstreams
+from app.services.resilience import error_from_response
+
+logger = logging.getLogger(__name__)
 
 # .env 로드 (이미 main.py에서 했더라도, 중복 호출은 무해)
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise RuntimeError("OPENAI_API_KEY가 설정되어 있지 않습니다. .env 또는 환경변수를 확인하세요.")
 
 
-def text_to_speech(text: str, output_path: str = "output.mp3"):
-    url = "https://api.openai.com/v1/audio/speech"
-    
-    headers = {
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-        "Content-Type": "application/json"
-    }
+def _write_file(output_path: str, content: bytes):
+    # 같은 이름을 동시에 쓰는 요청이 있어도 반쯤 쓴 파일이 보이지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{output_path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, output_path)
 
-    data = {
+
+def _speech_request(text: str) -> dict:
+    return {
         "model": "tts-1",
         "input": text,
         "voice": "nova"
     }
 
-    response = requests.post(url, headers=headers, json=data)
-    print(f"TTS 응답 상태 코드: {response.status_code}")
 
-    if response.status_code != 200:
-        raise Exception(f"TTS 요청 실패: {response.status_code} - {response.text}")
+def speech_file_name(text: str) -> str:
+    """합성 결과를 결정하는 값으로 만든 파일 이름 (같은 문장이면 같은 이름, 다른 요청끼리 덮어쓰지 않음)"""
+    return f"{make_cache_key(provider='openai', **_speech_request(text))}.mp3"
+
+
+async def text_to_speech(text: str, output_path: str = "output.mp3"):
+    # 키가 없어도 앱은 뜨도록, 검사는 모듈을 불러올 때가 아니라 호출할 때 함
+    if not OPENAI_API_KEY:
+        raise RuntimeError("OPENAI_API_KEY가 설정되어 있지 않습니다. .env 또는 환경변수를 확인하세요.")
+    url = "/audio/speech"
+
+    data = _speech_request(text)
+
+    async def fetch():
+        response = await upstreams.openai_http.post(url, json=data)
+        logger.debug(f"TTS 응답 상태 코드: {response.status_code}")
+
+        if response.status_code != 200:
+            raise error_from_response("openai", response, "TTS 요청")
+        yield response.content
 
-    with open(output_path, "wb") as f:
-        f.write(response.content)
+    # 같은 문장은 다시 합성하지 않고 디스크 캐시에서 가져옴
+    content = await audio_cache.get_bytes(make_cache_key(provider="openai", **data), fetch)
+    await run_blocking(_write_file, output_path, content)
 
     return output_path
\ No newline at end of file
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import os
+import time
+
+from app.utils.concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_DIR = os.path.join(BASE_DIR, "routers", "uploads")
+# 업로드/결과 파일을 남겨 두는 최대 시간 (초)
+UPLOAD_TTL_SECONDS = float(os.getenv("UPLOAD_TTL_SECONDS", "3600"))
+# 디렉터리 전체 용량 한도. 넘으면 오래된 파일부터 지움
+UPLOAD_MAX_MB = float(os.getenv("UPLOAD_MAX_MB", "1024"))
+# 정리 주기 (초)
+UPLOAD_SWEEP_INTERVAL = float(os.getenv("UPLOAD_SWEEP_INTERVAL", "300"))
+# 용량 한도로 지울 때도 이보다 최근 파일은 남김 (목소리 등록처럼 아직 읽고 있을 수 있는 파일)
+_MIN_AGE_SECONDS = 60
+
+
+def remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class UploadSweeper:
+    """
+    uploads 디렉터리를 주기적으로 정리: ttl이 지난 파일을 지우고, 전체 크기가 max_bytes를 넘으면 오래된 것부터 지웁니다.
+    요청이 끝나면 바로 지우는 것이 기본이고, 이 정리는 중간에 실패한 요청 등이 남긴 파일을 위한 것입니다.
+    사용량은 정리할 때 센 값을 보관해 메트릭 조회 때 디렉터리를 다시 훑지 않습니다.
+    """
+
+    def __init__(
+        self,
+        directory: str = UPLOAD_DIR,
+        ttl: float = UPLOAD_TTL_SECONDS,
+        max_bytes: int = int(UPLOAD_MAX_MB * 1024 * 1024),
+        interval: float = UPLOAD_SWEEP_INTERVAL,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.files = 0
+        self.bytes = 0
+        self.removed = {"ttl": 0, "quota": 0}
+        self.removed_bytes = 0
+        self._task: asyncio.Task | None = None
+
+    def sweep(self):
+        now = time.time()
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue  # 요청이 끝나면서 방금 지운 파일
+                found.append((st.st_mtime, st.st_size, entry.path))
+
+        kept, total = [], 0
+        for mtime, size, path in found:
+            if now - mtime > self.ttl:
+                self._remove(path, size, "ttl")
+            else:
+                kept.append((mtime, size, path))
+                total += size
+
+        kept.sort()
+        while total > self.max_bytes and kept and now - kept[0][0] >= _MIN_AGE_SECONDS:
+            _, size, path = kept.pop(0)
+            self._remove(path, size, "quota")
+            total -= size
+
+        self.files, self.bytes = len(kept), total
+
+    def _remove(self, path: str, size: int, reason: str):
+        remove_file(path)
+        self.removed[reason] += 1
+        self.removed_bytes += size
+
+    def stats(self) -> dict:
+        return {"files": self.files, "bytes": self.bytes, "removed": dict(self.removed), "removed_bytes": self.removed_bytes}
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await run_blocking(self.sweep)
+            except Exception as e:
+                logger.warning(f"uploads 정리 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+
+upload_sweeper = UploadSweeper()
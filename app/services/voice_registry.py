@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from app.utils.concurrency import run_blocking
+from app.utils.sqlite_utils import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(BASE_DIR)
+# 사용자별 ElevenLabs Voice ID 저장소 (여러 워커가 공유)
+VOICE_REGISTRY_DB = os.getenv("VOICE_REGISTRY_DB", os.path.join(BASE_DIR, "data", "voices.db"))
+# 이전 버전에서 쓰던 JSON 파일: 시작 시 한 번 가져오기만 하고 더 이상 쓰지 않음
+LEGACY_VOICE_MAP = os.getenv("LEGACY_VOICE_MAP", os.path.join(PROJECT_DIR, "user_voice_map.json"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS voices (
+    user_id TEXT PRIMARY KEY,
+    voice_id TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class VoiceRegistry:
+    """
+    user_id -> voice_id 매핑.
+    조회는 메모리 dict에서 처리하고, 저장은 SQLite(WAL)에 한 행씩 기록합니다.
+    한 사용자에 대해 먼저 기록된 값이 이기므로(INSERT OR IGNORE) 여러 워커가 동시에 등록해도 값이 하나로 정해집니다.
+    """
+
+    def __init__(self, db_path: str = VOICE_REGISTRY_DB, legacy_path: str | None = LEGACY_VOICE_MAP):
+        self.legacy_path = legacy_path
+        self._db = SQLiteStore(db_path, _SCHEMA)
+        self._voices: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self):
+        """레거시 JSON을 가져온 뒤 전체 매핑을 메모리에 올림"""
+        migrated = self._migrate_legacy()
+        rows = self._db.execute("SELECT user_id, voice_id FROM voices")
+        with self._lock:
+            self._voices = dict(rows)
+            self._loaded = True
+        logger.info(f"목소리 레지스트리 로드: {len(rows)}명 (JSON에서 가져옴 {migrated}명)")
+
+    def _migrate_legacy(self) -> int:
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return 0
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"{self.legacy_path} 읽기 실패, 가져오기를 건너뜀: {e}")
+            return 0
+        now = time.time()
+        conn = self._db.connect()
+        with conn:
+            # 이미 있는 사용자는 건드리지 않으므로 여러 번 실행해도 안전
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO voices (user_id, voice_id, created_at) VALUES (?, ?, ?)",
+                [(str(user_id), voice_id, now) for user_id, voice_id in data.items() if voice_id],
+            )
+        return cursor.rowcount
+
+    def get(self, user_id: str) -> str | None:
+        """메모리에서만 조회 (디스크 접근 없음)"""
+        return self._voices.get(str(user_id))
+
+    def _fetch(self, user_id: str) -> str | None:
+        rows = self._db.execute("SELECT voice_id FROM voices WHERE user_id = ?", (user_id,))
+        if not rows:
+            return None
+        with self._lock:
+            self._voices[user_id] = rows[0][0]
+        return rows[0][0]
+
+    def _insert(self, user_id: str, voice_id: str) -> str:
+        conn = self._db.connect()
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO voices (user_id, voice_id, created_at) VALUES (?, ?, ?)",
+                (user_id, voice_id, time.time()),
+            )
+        return self._fetch(user_id)
+
+    async def lookup(self, user_id: str) -> str | None:
+        """
+        메모리에 없을 때만 DB 확인 (다른 워커가 방금 등록한 경우)
+        """
+        user_id = str(user_id)
+        if not self._loaded:
+            await run_blocking(self.load)
+        voice_id = self.get(user_id)
+        if voice_id is not None:
+            return voice_id
+        return await run_blocking(self._fetch, user_id)
+
+    async def set_if_absent(self, user_id: str, voice_id: str) -> str:
+        """
+        voice_id를 등록하고 최종적으로 저장된 값을 반환.
+        다른 워커가 먼저 등록했다면 그 값을 반환합니다.
+        """
+        if not self._loaded:
+            await run_blocking(self.load)
+        return await run_blocking(self._insert, str(user_id), voice_id)
+
+    def stats(self) -> dict:
+        return {"users": len(self._voices)}
+
+
+voice_registry = VoiceRegistry()
@@ -0,0 +1,93 @@
+import logging
+import os
+
+from dotenv import load_dotenv
+
+from app.utils.concurrency import BoundedPool
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+try:
+    from faster_whisper import BatchedInferencePipeline, WhisperModel
+except ImportError:  # pragma: no cover - faster-whisper가 없는 환경에서는 API만 사용
+    BatchedInferencePipeline = WhisperModel = None
+
+# 모델 크기 또는 변환된 모델 경로 (tiny / base / small / medium / large-v3 ...)
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "small")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_MODEL_DIR = os.getenv("WHISPER_MODEL_DIR") or None
+# 동시에 음성 인식을 돌릴 수 있는 작업 수 (코어 수 기준, 작업 하나가 코어를 나눠 씀)
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS", str(os.cpu_count() or 1)))
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, WHISPER_WORKERS)))))
+# 1보다 크면 VAD로 나눈 구간들을 묶어 한 번에 디코딩 (긴 음성에서 처리량 향상)
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", "1"))
+WHISPER_VAD = os.getenv("WHISPER_VAD", "1") != "0"
+STT_LANGUAGE = os.getenv("STT_LANGUAGE", "ko")
+
+
+class WhisperEngine:
+    """
+    faster-whisper(CTranslate2) 모델을 프로세스당 한 번만 올려 두고 여러 요청이 함께 사용합니다.
+    CTranslate2 모델은 num_workers만큼 동시 호출을 처리할 수 있으므로, 같은 크기의 전용 스레드 풀로 동시 실행 수를 제한합니다.
+    """
+
+    def __init__(self):
+        self.model = None
+        self.pipeline = None
+        self.load_error: str | None = None
+        self.pool = BoundedPool(WHISPER_WORKERS, "whisper")
+
+    @property
+    def available(self) -> bool:
+        return self.model is not None
+
+    def load(self) -> bool:
+        if self.model is not None:
+            return True
+        if WhisperModel is None:
+            self.load_error = "faster-whisper가 설치되어 있지 않습니다."
+            return False
+        try:
+            self.model = WhisperModel(
+                WHISPER_MODEL,
+                device=WHISPER_DEVICE,
+                compute_type=WHISPER_COMPUTE_TYPE,
+                cpu_threads=WHISPER_CPU_THREADS,
+                num_workers=self.pool.size,
+                download_root=WHISPER_MODEL_DIR,
+            )
+        except Exception as e:
+            # 모델 다운로드 실패 등: API 방식으로 계속 동작
+            self.load_error = str(e)
+            logger.warning(f"로컬 Whisper 모델을 불러오지 못해 API로 음성 인식합니다: {e}")
+            return False
+        if WHISPER_BATCH_SIZE > 1:
+            self.pipeline = BatchedInferencePipeline(model=self.model)
+        logger.info(
+            f"로컬 Whisper 준비: {WHISPER_MODEL} ({WHISPER_DEVICE}/{WHISPER_COMPUTE_TYPE}), "
+            f"작업 {self.pool.size}개 x 스레드 {WHISPER_CPU_THREADS}개, 배치 {WHISPER_BATCH_SIZE}"
+        )
+        return True
+
+    def transcribe(self, audio, language: str | None = STT_LANGUAGE) -> str:
+        """
+        audio: 파일 경로 또는 16kHz mono float32 배열
+        """
+        if self.pipeline is not None:
+            segments, _ = self.pipeline.transcribe(
+                audio, language=language, beam_size=WHISPER_BEAM_SIZE, vad_filter=WHISPER_VAD, batch_size=WHISPER_BATCH_SIZE
+            )
+        else:
+            segments, _ = self.model.transcribe(audio, language=language, beam_size=WHISPER_BEAM_SIZE, vad_filter=WHISPER_VAD)
+        # segments는 지연 평가되는 제너레이터이므로 이 스레드 안에서 끝까지 소비
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+    async def transcribe_async(self, audio, language: str | None = STT_LANGUAGE) -> str:
+        return await self.pool.run(self.transcribe, audio, language)
+
+
+whisper_engine = WhisperEngine()
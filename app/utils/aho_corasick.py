@@ -0,0 +1,68 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    여러 패턴을 텍스트 한 번 순회로 모두 찾는 Aho-Corasick 매처.
+    검색 비용이 패턴 개수와 무관하게 O(텍스트 길이 + 매칭 수)입니다.
+    """
+
+    def __init__(self):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._own: list[list[tuple[int, object]]] = [[]]  # 노드에서 끝나는 패턴 (패턴 길이, 값)
+        self._out: list[list[tuple[int, object]]] = [[]]  # 실패 링크까지 합친 출력 목록
+        self._count = 0
+        self._built = False
+
+    def __len__(self):
+        return self._count
+
+    def add(self, pattern: str, value):
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+            node = nxt
+        self._own[node].append((len(pattern), value))
+        self._count += 1
+        self._built = False
+
+    def build(self):
+        """실패 링크를 계산. add() 이후 검색 전에 한 번 호출"""
+        self._out = [list(own) for own in self._own]
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                # 실패 링크 쪽에서 끝나는 패턴도 여기서 함께 보고되도록 출력 목록을 합침
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+
+    def iter_matches(self, text: str):
+        """(시작 위치, 끝 위치, 값)을 텍스트 순서대로 반환"""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                yield i - length + 1, i + 1, value
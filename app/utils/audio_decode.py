@@ -0,0 +1,96 @@
+import io
+import wave
+
+import av
+import numpy as np
+
+# Whisper(API/로컬)와 목소리 복제에 쓰는 PCM 형식
+SAMPLE_RATE = 16000
+# 길이 정보가 없는 입력(MediaRecorder의 webm 등)에서 처음 잡아 둘 버퍼 크기
+_INITIAL_SECONDS = 30
+
+
+def decode_pcm(source, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    업로드된 오디오(bytes 또는 파일 경로)를 16-bit mono PCM으로 디코딩.
+    디코딩된 프레임을 하나의 버퍼에 바로 채워 넣어, 프레임 목록을 모았다가 이어 붙이는 복사를 피합니다.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    with av.open(source) as container:
+        stream = container.streams.audio[0]
+        if container.duration:
+            capacity = int(container.duration / av.time_base * sample_rate) + sample_rate
+        else:
+            capacity = _INITIAL_SECONDS * sample_rate
+        buffer = np.empty(capacity, dtype=np.int16)
+        size = 0
+
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+
+        def append(frames):
+            nonlocal buffer, size
+            for frame in frames:
+                samples = frame.to_ndarray().reshape(-1)
+                if size + len(samples) > len(buffer):
+                    grown = np.empty(max(len(buffer) * 2, size + len(samples)), dtype=np.int16)
+                    grown[:size] = buffer[:size]
+                    buffer = grown
+                buffer[size:size + len(samples)] = samples
+                size += len(samples)
+
+        for frame in container.decode(stream):
+            append(resampler.resample(frame))
+        append(resampler.resample(None))  # 리샘플러에 남은 샘플
+    return buffer[:size]
+
+
+def to_float32(pcm: np.ndarray) -> np.ndarray:
+    """faster-whisper 입력 형식 (-1.0 ~ 1.0)"""
+    return pcm.astype(np.float32) / 32768.0
+
+
+def write_wav(target, pcm: np.ndarray, sample_rate: int = SAMPLE_RATE):
+    """target: 파일 경로 또는 쓰기 가능한 파일 객체"""
+    with wave.open(target, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.tobytes())
+
+
+def pcm_to_wav_bytes(pcm: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
+    buf = io.BytesIO()
+    write_wav(buf, pcm, sample_rate)
+    return buf.getvalue()
+
+
+def save_clone_sample(data: bytes, ext: str, base_path: str) -> str:
+    """
+    목소리 복제용 샘플 파일을 만들고 경로를 반환.
+    webm은 WAV로 디코딩해 저장하고, 그 밖의 형식은 받은 그대로 저장합니다.
+    """
+    if ext.lower() == ".webm":
+        path = f"{base_path}.wav"
+        write_wav(path, decode_pcm(data))
+    else:
+        path = f"{base_path}{ext}"
+        with open(path, "wb") as f:
+            f.write(data)
+    return path
+
+
+def encode_opus(pcm: np.ndarray, bitrate: int = 24000, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """16kHz mono PCM을 Ogg/Opus로 압축 (음성 인식용 업로드 크기를 WAV의 1/10 수준으로 줄임)"""
+    buf = io.BytesIO()
+    with av.open(buf, "w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=sample_rate)
+        stream.layout = "mono"
+        stream.bit_rate = bitrate
+        frame = av.AudioFrame.from_ndarray(pcm.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = sample_rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buf.getvalue()
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+from functools import partial
+
+import anyio
+from anyio import to_thread
+
+from app.utils.metrics import registry
+
+# 파일 읽기/쓰기, SQLite처럼 이벤트 루프를 막지만 CPU는 거의 쓰지 않는 작업을 돌릴 전용 스레드 풀 크기
+# (FastAPI 기본 스레드 풀(40)과 분리해서, 무거운 작업이 몰려도 가벼운 페이지 요청은 영향을 받지 않도록 함)
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", str(min(32, (os.cpu_count() or 1) * 4))))
+# 오디오 디코딩/인코딩처럼 CPU를 점유하는 작업의 동시 실행 수 (코어 수보다 많이 돌려도 빨라지지 않고 메모리만 늘어남)
+CPU_POOL_SIZE = int(os.getenv("CPU_POOL_SIZE", str(os.cpu_count() or 1)))
+
+pool_wait_seconds = registry.histogram(
+    "voice_app_pool_wait_seconds", "스레드 풀 자리가 날 때까지 기다린 시간", ("pool",)
+)
+_pools: list["BoundedPool"] = []
+
+
+class BoundedPool:
+    """
+    동시에 실행되는 작업 수를 size로 제한하는 스레드 풀.
+    용도별로 따로 만들어, 한 종류의 작업이 몰려도 다른 작업의 자리를 차지하지 않도록 합니다.
+    name을 주면 대기 시간과 실행/대기 중인 작업 수를 /metrics로 내보냅니다.
+    """
+
+    def __init__(self, size: int, name: str | None = None):
+        self.size = max(1, size)
+        self.name = name
+        self._limiter: anyio.CapacityLimiter | None = None
+        if name is not None:
+            _pools.append(self)
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        # CapacityLimiter는 이벤트 루프 안에서 생성해야 하므로 최초 호출 시점에 만든다
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.size)
+        return self._limiter
+
+    async def run(self, func, *args, **kwargs):
+        if self.name is None:
+            return await to_thread.run_sync(partial(func, *args, **kwargs), limiter=self.limiter)
+
+        queued = time.perf_counter()
+
+        def call():
+            # 스레드에서 실행이 시작됐다는 것은 limiter 자리를 얻었다는 뜻
+            pool_wait_seconds.observe(time.perf_counter() - queued, pool=self.name)
+            return func(*args, **kwargs)
+
+        return await to_thread.run_sync(call, limiter=self.limiter)
+
+    def stats(self) -> dict:
+        if self._limiter is None:
+            return {"size": self.size, "running": 0, "waiting": 0}
+        statistics = self._limiter.statistics()
+        return {"size": self.size, "running": statistics.borrowed_tokens, "waiting": statistics.tasks_waiting}
+
+
+blocking_pool = BoundedPool(BLOCKING_POOL_SIZE, "io")
+cpu_pool = BoundedPool(CPU_POOL_SIZE, "cpu")
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    블로킹 함수를 제한된 크기의 스레드 풀(I/O용)에서 실행하고 결과를 기다립니다.
+    """
+    return await blocking_pool.run(func, *args, **kwargs)
+
+
+async def run_cpu(func, *args, **kwargs):
+    """
+    CPU를 점유하는 함수(오디오 디코딩 등)를 코어 수만큼만 동시에 실행합니다.
+    몰리면 여기서 기다리고, 그동안 파일 I/O는 blocking_pool에서 막히지 않고 진행됩니다.
+    """
+    return await cpu_pool.run(func, *args, **kwargs)
+
+
+def _pool_metrics():
+    pools = [(pool.name, pool.stats()) for pool in _pools]
+    return [
+        ("voice_app_pool_size", "gauge", "스레드 풀 크기", [({"pool": name}, stats["size"]) for name, stats in pools]),
+        ("voice_app_pool_running", "gauge", "스레드 풀에서 실행 중인 작업 수", [({"pool": name}, stats["running"]) for name, stats in pools]),
+        ("voice_app_pool_waiting", "gauge", "스레드 풀 자리를 기다리는 작업 수", [({"pool": name}, stats["waiting"]) for name, stats in pools]),
+    ]
+
+
+registry.add_collector(_pool_metrics)
+
+
+_DONE = object()
+
+
+class Prefetched:
+    """
+    prefetch가 반환하는 이터레이터. 한 번도 읽지 않았더라도 aclose()하면 백그라운드 생산 태스크를 멈춥니다.
+    (async 제너레이터는 시작 전에 닫으면 finally가 실행되지 않으므로 태스크를 따로 들고 있음)
+    """
+
+    def __init__(self, drain, task: asyncio.Task):
+        self._drain = drain
+        self._task = task
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._drain.__anext__()
+
+    async def aclose(self):
+        self._task.cancel()
+        await self._drain.aclose()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+def prefetch(source, maxsize: int = 0) -> Prefetched:
+    """
+    비동기 이터레이터를 백그라운드 태스크로 미리 소비하여 큐에 쌓아 둡니다.
+    호출하는 즉시 생산(예: LLM 스트리밍)이 시작되고, 반환된 이터레이터로 결과를 순서대로 읽습니다.
+    끝까지 읽지 않을 때는 aclose()로 생산을 멈춰야 합니다.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def _pump():
+        try:
+            async for item in source:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_DONE)
+
+    async def _drain():
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            task.cancel()
+
+    task = asyncio.create_task(_pump())
+    return Prefetched(_drain(), task)
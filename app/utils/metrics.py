@@ -0,0 +1,287 @@
+import functools
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# 단계별 소요 시간 구간 (초). STT/LLM/TTS처럼 수백 ms~수십 초 걸리는 작업 기준
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블은 {self.labelnames}이어야 합니다 (받은 값: {tuple(labels)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}" for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Prometheus 텍스트 형식(0.0.4)으로 내보내는 메트릭 모음.
+    캐시 통계처럼 이미 다른 곳에서 세고 있는 값은 collector 함수로 등록해 내보낼 때 읽어 옵니다.
+    """
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors = []
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, func):
+        """
+        func() -> [(name, kind, help, [(labels dict, value), ...]), ...]
+        """
+        self._collectors.append(func)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.collect()
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                logger.warning(f"메트릭 수집 실패 ({getattr(collector, '__name__', collector)}): {e}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+stage_seconds = registry.histogram(
+    "voice_app_stage_duration_seconds", "요청 처리 단계별 소요 시간", ("stage",)
+)
+http_request_seconds = registry.histogram(
+    "voice_app_http_request_duration_seconds", "HTTP 요청 전체 처리 시간 (스트리밍 응답은 본문 전송 완료까지)", ("route", "status")
+)
+upstream_requests = registry.counter(
+    "voice_app_upstream_requests_total", "업스트림 API 호출 수 (outcome: 2xx/4xx/5xx/error)", ("upstream", "outcome")
+)
+upstream_seconds = registry.histogram(
+    "voice_app_upstream_response_seconds", "업스트림 API 응답 헤더까지의 시간", ("upstream",)
+)
+
+
+class RequestTiming:
+    """요청 하나에서 측정한 단계별 시간. 요청 처리 중에는 컨텍스트 변수로 어디서든 꺼내 기록"""
+
+    def __init__(self, request_id: str | None = None):
+        self.request_id = request_id or str(uuid.uuid4())
+        self.started = time.perf_counter()
+        self.spans: list[tuple[str, float]] = []
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (같은 단계가 여러 번이면 각각 기록)"""
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.spans)
+
+    def as_dict(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "spans": [{"stage": name, "ms": round(seconds * 1000, 1)} for name, seconds in self.spans],
+        }
+
+
+_current_timing: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+def current_timing() -> RequestTiming | None:
+    return _current_timing.get()
+
+
+def start_request(request_id: str | None = None) -> RequestTiming:
+    timing = RequestTiming(request_id)
+    _current_timing.set(timing)
+    return timing
+
+
+def record_stage(stage: str, seconds: float):
+    """단계 소요 시간을 히스토그램과(요청 안이라면) 현재 요청의 스팬 목록에 기록"""
+    stage_seconds.observe(seconds, stage=stage)
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.spans.append((stage, seconds))
+
+
+@contextmanager
+def span(stage: str):
+    """with span("stt"): ... 블록의 실행 시간을 stage로 기록 (예외가 나도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def log_timing(timing: RequestTiming, **fields):
+    logger.info("request_timing " + json.dumps({**timing.as_dict(), **fields}, ensure_ascii=False))
+
+
+def current_request_id() -> str | None:
+    timing = _current_timing.get()
+    return timing.request_id if timing is not None else None
+
+
+class TimingMiddleware:
+    """
+    요청마다 RequestTiming을 만들어 컨텍스트에 두고, 응답 헤더를 보낼 때까지 끝난 단계를 Server-Timing 헤더로 붙입니다.
+    스트리밍 응답에서 본문 전송 중에 끝나는 단계(TTS 등)는 헤더에 들어가지 못하고, 요청이 끝날 때 로그와 히스토그램에만 남습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = timing.server_timing()
+                total = f"total;dur={(time.perf_counter() - timing.started) * 1000:.1f}"
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", f"{header}, {total}".lstrip(", ").encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timing.reset(token)
+            # 경로 템플릿(/api/jobs/{job_id})으로 묶어 레이블 종류가 늘어나지 않도록 함
+            route = getattr(scope.get("route"), "path", None) or "other"
+            http_request_seconds.observe(time.perf_counter() - timing.started, route=route, status=status)
+            if timing.spans:
+                log_timing(timing, route=route, status=status)
+
+
+def timed(stage: str):
+    """비동기 함수 전체 실행 시간을 stage로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(stage):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _upstream_error_ratio():
+    with upstream_requests._lock:
+        items = list(upstream_requests._values.items())
+    totals: dict[str, list[float]] = {}
+    for (upstream, outcome), value in items:
+        total = totals.setdefault(upstream, [0.0, 0.0])
+        total[0] += value
+        if outcome in ("5xx", "error"):
+            total[1] += value
+    return [(
+        "voice_app_upstream_error_ratio", "gauge", "시작 이후 업스트림 호출 중 5xx/연결 오류 비율",
+        [({"upstream": upstream}, errors / count if count else 0.0) for upstream, (count, errors) in totals.items()],
+    )]
+
+
+registry.add_collector(_upstream_error_ratio)
@@ -0,0 +1,39 @@
+import os
+import sqlite3
+import threading
+
+# 다른 워커가 쓰는 중이면 바로 실패하지 않고 이 시간(ms)만큼 기다림
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+class SQLiteStore:
+    """
+    여러 uvicorn 워커(프로세스)가 공유하는 SQLite 파일에 대한 스레드별 연결 관리.
+    WAL 모드로 열어 읽기와 쓰기가 서로를 막지 않도록 합니다.
+    """
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self.schema = schema
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(self.schema)
+                self._initialized = True
+        self._local.conn = conn
+        return conn
+
+    def execute(self, sql: str, params=()) -> list[tuple]:
+        return self.connect().execute(sql, params).fetchall()
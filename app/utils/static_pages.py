@@ -0,0 +1,176 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from app.utils.concurrency import run_blocking
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli가 없으면 gzip만 제공
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 백그라운드에서 파일 변경 여부(mtime)를 확인하는 간격 (초)
+STATIC_RELOAD_INTERVAL = float(os.getenv("STATIC_RELOAD_INTERVAL", "2.0"))
+
+# 로그인한 사용자에게만 주는 페이지라 공유 캐시에는 두지 않고, 브라우저는 매번 ETag로 확인 (변경 없으면 304)
+CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass
+class StaticPage:
+    path: str
+    mtime: float
+    media_type: str
+    etag: str  # 압축 방식과 무관한 내용 해시. 인코딩별 ETag는 뒤에 -gzip/-br을 붙임
+    last_modified: str
+    variants: dict[str, bytes]  # "identity" / "gzip" / "br" -> 본문
+
+
+def _build(path: str, mtime: float) -> StaticPage:
+    with open(path, "rb") as f:
+        body = f.read()
+    variants = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    # 압축해도 작아지지 않으면 원본만 보냄
+    variants = {name: data for name, data in variants.items() if name == "identity" or len(data) < len(body)}
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if media_type.startswith("text/"):
+        media_type += "; charset=utf-8"
+    return StaticPage(
+        path=path,
+        mtime=mtime,
+        media_type=media_type,
+        etag=hashlib.sha256(body).hexdigest()[:32],
+        last_modified=formatdate(int(mtime), usegmt=True),
+        variants=variants,
+    )
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def _not_modified(request: Request, page: StaticPage) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # 어떤 인코딩으로 받은 ETag든 내용이 같으면 변경 없음
+        tags = {tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")}
+        return any(tag.split("-")[0] == page.etag for tag in tags)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(page.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class StaticPageCache:
+    """
+    HTML 페이지를 메모리에 올려 두고 gzip/brotli 압축본을 미리 만들어 두는 캐시.
+    요청은 Accept-Encoding에 맞는 압축본을 그대로 보내고, ETag/Last-Modified가 같으면 304로 응답합니다.
+    앱에서는 start()로 띄운 백그라운드 작업이 check_interval마다 스레드 풀에서 파일 변경(mtime)을 확인해
+    바뀐 페이지만 다시 압축하므로, 요청 처리 중에는 stat/압축을 하지 않습니다.
+    """
+
+    def __init__(self, static_dir: str, names: list[str], check_interval: float = STATIC_RELOAD_INTERVAL):
+        self.static_dir = str(static_dir)
+        self.names = list(names)
+        self.check_interval = check_interval
+        self._pages: dict[str, StaticPage] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def reload(self, force: bool = False):
+        """변경된 페이지만 다시 읽어 압축 (force=True 이면 전체)"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            pages = {}
+            for name in self.names:
+                path = os.path.join(self.static_dir, name)
+                try:
+                    mtime = os.stat(path).st_mtime
+                except FileNotFoundError:
+                    continue
+                current = self._pages.get(name)
+                if force or current is None or current.mtime != mtime:
+                    pages[name] = _build(path, mtime)
+                else:
+                    pages[name] = current
+            self._pages = pages
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await run_blocking(self.reload)
+            except Exception as e:
+                logger.warning(f"페이지 다시 읽기 실패: {e}")
+
+    def get(self, name: str) -> StaticPage | None:
+        if not self._last_check:
+            # 앱 밖(벤치마크 등)에서 start() 없이 쓰는 경우에만 첫 조회 때 한 번 읽음
+            self.reload()
+        return self._pages.get(name)
+
+    def stats(self) -> dict:
+        pages = list(self._pages.values())
+        return {
+            "pages": len(pages),
+            "bytes": sum(len(data) for page in pages for data in page.variants.values()),
+        }
+
+    def response(self, request: Request, name: str) -> Response:
+        page = self.get(name)
+        if page is None:
+            return Response(status_code=404)
+
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next((e for e in ("br", "gzip") if e in accepted and e in page.variants), "identity")
+        headers = {
+            "ETag": f'"{page.etag}"' if encoding == "identity" else f'"{page.etag}-{encoding}"',
+            "Last-Modified": page.last_modified,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if _not_modified(request, page):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(page.variants[encoding], media_type=page.media_type, headers=headers)
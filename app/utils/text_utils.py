@@ -0,0 +1,63 @@
+import re
+from difflib import SequenceMatcher
+
+# 문장 끝: 마침표/물음표/느낌표(+닫는 따옴표/괄호) 뒤 공백, 또는 전각 문장부호, 또는 줄바꿈
+_SENTENCE_END = re.compile(r'(?:[.!?…]+["\')\]]*\s+|[。！？]+["\')\]」』]*\s*|\n+)')
+
+# 너무 짧은 조각("Hi." 등)은 TTS 호출 비용이 더 크므로 다음 문장과 합쳐서 보냄
+MIN_SENTENCE_CHARS = 20
+
+
+def split_complete_sentences(buffer: str) -> tuple[list[str], str]:
+    """
+    버퍼에서 완성된 문장들을 떼어내고, 아직 끝나지 않은 나머지를 함께 반환
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(buffer):
+        sentence = buffer[start:match.end()].strip()
+        start = match.end()
+        if sentence:
+            sentences.append(sentence)
+    return sentences, buffer[start:]
+
+
+async def iter_sentences(deltas, min_chars: int = MIN_SENTENCE_CHARS):
+    """
+    LLM 스트리밍 조각(delta)을 받아 문장 단위로 묶어서 반환(yield)
+    """
+    buffer = ""
+    pending = ""
+    async for delta in deltas:
+        buffer += delta
+        sentences, buffer = split_complete_sentences(buffer)
+        for sentence in sentences:
+            pending = f"{pending} {sentence}".strip()
+            if len(pending) >= min_chars:
+                yield pending
+                pending = ""
+
+    tail = f"{pending} {buffer.strip()}".strip()
+    if tail:
+        yield tail
+
+
+def _match_key(word: str) -> str:
+    return re.sub(r"[^\w]+", "", word).lower()
+
+
+def join_overlapping(left: str, right: str, window: int = 10) -> str:
+    """
+    겹치게 잘라 인식한 두 구간의 텍스트를 이어 붙임.
+    left 끝과 right 앞에 같은 단어열이 있으면 한 번만 남기고, 경계에서 잘린 단어는 right 쪽 것을 씀
+    """
+    left_words, right_words = left.split(), right.split()
+    tail = [_match_key(w) for w in left_words[-window:]]
+    head = [_match_key(w) for w in right_words[:window]]
+    match = SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(0, len(tail), 0, len(head))
+    # 겹친 부분은 left의 끝, right의 시작에 있어야 함 (경계에서 잘린 단어 하나까지는 허용)
+    if match.size and any(tail[match.a:match.a + match.size]) \
+            and match.a + match.size >= len(tail) - 1 and match.b <= 1:
+        cut = len(left_words) - len(tail) + match.a
+        return " ".join(left_words[:cut] + right_words[match.b:])
+    return " ".join(left_words + right_words)
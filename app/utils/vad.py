@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+
+from app.utils.audio_decode import SAMPLE_RATE
+
+# 음성 구간 판정 기준 (dBFS). 조용한 방의 배경 소음은 보통 -50dB 이하
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "-40"))
+VAD_FRAME_MS = 30
+
+
+def frame_levels(pcm: np.ndarray, frame_size: int) -> np.ndarray:
+    """frame_size 단위 프레임별 음량(dBFS). 끝에 남는 부분 프레임은 제외"""
+    frames = len(pcm) // frame_size
+    if frames == 0:
+        return np.empty(0, dtype=np.float32)
+    x = pcm[:frames * frame_size].reshape(frames, frame_size).astype(np.float32) / 32768.0
+    rms = np.sqrt(np.mean(x * x, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+class SpeechSegmenter:
+    """
+    실시간으로 들어오는 16kHz mono PCM을 발화 단위로 나누는 에너지 기반 VAD.
+    무음이 min_silence_ms 이상 이어지면 구간을 닫고, 너무 긴 발화는 max_segment_s에서 강제로 자릅니다.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        threshold_db: float = VAD_THRESHOLD_DB,
+        min_silence_ms: int = 600,
+        min_speech_ms: int = 250,
+        padding_ms: int = 200,
+        max_segment_s: float = 20.0,
+    ):
+        self.frame = sample_rate * VAD_FRAME_MS // 1000
+        self.threshold_db = threshold_db
+        self.min_silence = max(1, min_silence_ms // VAD_FRAME_MS)
+        self.min_speech = max(1, min_speech_ms // VAD_FRAME_MS)
+        self.padding = padding_ms // VAD_FRAME_MS
+        self.max_frames = int(max_segment_s * 1000 / VAD_FRAME_MS)
+
+        self._pending = np.empty(0, dtype=np.int16)  # 프레임 크기에 못 미치는 나머지 샘플
+        self._preroll: list[np.ndarray] = []  # 발화 시작 직전 프레임 (첫 음절이 잘리지 않도록)
+        self._segment: list[np.ndarray] = []
+        self._speech_frames = 0
+        self._silence_run = 0
+
+    @property
+    def in_speech(self) -> bool:
+        return bool(self._segment)
+
+    def current(self) -> np.ndarray | None:
+        """아직 닫히지 않은 발화 구간 (부분 인식용)"""
+        return np.concatenate(self._segment) if self._segment else None
+
+    def _close(self) -> np.ndarray | None:
+        segment, speech, silence = self._segment, self._speech_frames, self._silence_run
+        self._segment, self._speech_frames, self._silence_run = [], 0, 0
+        if speech < self.min_speech:
+            return None  # 짧은 잡음
+        # 끝의 무음은 padding만큼만 남김
+        trailing = max(0, silence - self.padding)
+        return np.concatenate(segment[:len(segment) - trailing] if trailing else segment)
+
+    def push(self, pcm: np.ndarray) -> list[np.ndarray]:
+        """PCM을 추가하고, 이번에 닫힌 발화 구간들을 반환"""
+        pcm = np.concatenate([self._pending, pcm]) if len(self._pending) else pcm
+        levels = frame_levels(pcm, self.frame)
+        used = len(levels) * self.frame
+        self._pending = pcm[used:].copy()
+
+        closed = []
+        for i, level in enumerate(levels):
+            frame = pcm[i * self.frame:(i + 1) * self.frame]
+            speech = level > self.threshold_db
+            if not self._segment:
+                if speech:
+                    self._segment = self._preroll + [frame]
+                    self._preroll = []
+                    self._speech_frames = 1
+                else:
+                    self._preroll = (self._preroll + [frame])[-self.padding:] if self.padding else []
+                continue
+
+            self._segment.append(frame)
+            if speech:
+                self._speech_frames += 1
+                self._silence_run = 0
+            else:
+                self._silence_run += 1
+            if self._silence_run >= self.min_silence or len(self._segment) >= self.max_frames:
+                segment = self._close()
+                if segment is not None:
+                    closed.append(segment)
+        return closed
+
+    def flush(self) -> np.ndarray | None:
+        """입력이 끝났을 때 열려 있는 구간을 닫아 반환"""
+        if len(self._pending) and self._segment:
+            self._segment.append(self._pending)
+        self._pending = np.empty(0, dtype=np.int16)
+        if not self._segment:
+            return None
+        return self._close()
+
+
+def speech_bounds(
+    pcm: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    threshold_db: float = VAD_THRESHOLD_DB,
+    padding_ms: int = 300,
+    min_speech_ms: int = 150,
+) -> tuple[int, int] | None:
+    """
+    앞뒤 무음을 잘라 낼 샘플 범위 (start, end). 음성으로 볼 구간이 없으면 None
+    """
+    frame = sample_rate * VAD_FRAME_MS // 1000
+    levels = frame_levels(pcm, frame)
+    voiced = np.flatnonzero(levels > threshold_db)
+    if len(voiced) * VAD_FRAME_MS < min_speech_ms:
+        return None
+    padding = sample_rate * padding_ms // 1000
+    start = max(0, int(voiced[0]) * frame - padding)
+    end = min(len(pcm), (int(voiced[-1]) + 1) * frame + padding)
+    return start, end
+
+
+def chunk_bounds(
+    pcm: np.ndarray,
+    chunk_s: float,
+    overlap_s: float = 1.0,
+    search_s: float = 5.0,
+    sample_rate: int = SAMPLE_RATE,
+    threshold_db: float = VAD_THRESHOLD_DB,
+) -> list[tuple[int, int, bool]]:
+    """
+    긴 음성을 chunk_s 안팎 길이로 나눌 (start, end, 앞 구간과 겹침 여부) 목록.
+    경계는 목표 지점 앞 search_s 안에서 가장 조용한 프레임에 두고, 그 프레임도 무음이 아니면
+    (쉬지 않고 말하는 중) 앞뒤 구간을 overlap_s만큼 겹쳐 잘린 단어를 양쪽에서 모두 인식하게 함
+    """
+    frame = sample_rate * VAD_FRAME_MS // 1000
+    levels = frame_levels(pcm, frame)
+    chunk = max(1, int(chunk_s * 1000 / VAD_FRAME_MS))
+    search = min(chunk - 1, int(search_s * 1000 / VAD_FRAME_MS))
+    half_overlap = int(overlap_s * sample_rate / 2)
+
+    bounds = []
+    start, start_frame, overlapped = 0, 0, False
+    # 마지막 구간이 너무 짧아지지 않도록 chunk + search보다 길게 남았을 때만 자름
+    while len(levels) - start_frame > chunk + search:
+        target = start_frame + chunk
+        window = levels[target - search:target + 1]
+        cut_frame = target - search + int(np.argmin(window))
+        cut = cut_frame * frame + frame // 2
+        if levels[cut_frame] <= threshold_db:
+            bounds.append((start, cut, overlapped))
+            start, overlapped = cut, False
+        else:
+            bounds.append((start, min(len(pcm), cut + half_overlap), overlapped))
+            start, overlapped = max(0, cut - half_overlap), True
+        start_frame = cut_frame + 1
+    bounds.append((start, len(pcm), overlapped))
+    return bounds
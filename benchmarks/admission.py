@@ -0,0 +1,101 @@
+"""
+입장 제어(전체/사용자별 동시 처리 수 제한) 효과
+
+한 사용자가 /tts/ 요청을 한꺼번에 쏟아붓는 동안 다른 사용자들이 평소처럼 요청할 때,
+제한이 없는 경우와 있는 경우의 일반 사용자 지연(p50/p95)과 상태 코드 분포를 비교합니다.
+제한을 넘긴 요청이 Retry-After와 함께 바로 거절되는지(거절 응답 시간)와 /metrics의 대기열 지표도 출력합니다.
+  python -m benchmarks.admission --burst 200 --users 4 --requests 20 --max-concurrent 8 --per-user 4
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import time
+
+import httpx
+
+from benchmarks.common import make_auth_cookie, percentile, run_app, run_stub
+
+_counter = itertools.count()
+
+
+async def call(client: httpx.AsyncClient, cookies: dict, result: dict):
+    started = time.perf_counter()
+    # 문장을 매번 바꿔 TTS 캐시가 적중하지 않게 함
+    response = await client.post("/tts/", data={"text": f"입장 제어 테스트 {next(_counter)}"}, cookies=cookies)
+    elapsed = time.perf_counter() - started
+    result["statuses"][response.status_code] += 1
+    if response.status_code == 200:
+        result["ok"].append(elapsed)
+    else:
+        result["rejected"].append(elapsed)
+        if "retry-after" in response.headers:
+            result["retry_after"] += 1
+
+
+def new_result() -> dict:
+    return {"ok": [], "rejected": [], "statuses": collections.Counter(), "retry_after": 0}
+
+
+async def scenario(base_url: str, burst: int, users: int, requests: int) -> tuple[dict, dict, str]:
+    heavy, light = new_result(), new_result()
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=httpx.Limits(max_connections=None)) as client:
+        heavy_cookie = make_auth_cookie("burst-user")
+
+        async def light_user(i: int):
+            cookies = make_auth_cookie(f"user-{i}")
+            for _ in range(requests):
+                await call(client, cookies, light)
+
+        await asyncio.gather(
+            *(call(client, heavy_cookie, heavy) for _ in range(burst)),
+            *(light_user(i) for i in range(users)),
+        )
+        metrics = (await client.get("/metrics")).text
+    return heavy, light, metrics
+
+
+def report(label: str, name: str, result: dict):
+    ok, rejected = result["ok"], result["rejected"]
+    print(
+        f"{label:>10} {name:>6} {percentile(ok, 50):>7.3f} {percentile(ok, 95):>7.3f}"
+        f" {percentile(rejected, 95) * 1000 if rejected else float('nan'):>12.1f}"
+        f"  {dict(sorted(result['statuses'].items()))} (Retry-After {result['retry_after']})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--burst", type=int, default=200, help="한 사용자가 동시에 보내는 요청 수")
+    parser.add_argument("--users", type=int, default=4, help="평소처럼 요청하는 사용자 수")
+    parser.add_argument("--requests", type=int, default=20, help="일반 사용자 한 명이 차례로 보내는 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--per-user", type=int, default=4)
+    args = parser.parse_args()
+
+    configs = [
+        ("no-limit", {"ADMISSION_MAX_CONCURRENT": "100000", "ADMISSION_PER_USER": "0"}),
+        ("limited", {
+            "ADMISSION_MAX_CONCURRENT": str(args.max_concurrent),
+            "ADMISSION_QUEUE_SIZE": str(args.queue_size),
+            "ADMISSION_PER_USER": str(args.per_user),
+        }),
+    ]
+
+    print(f"{'config':>10} {'who':>6} {'p50(s)':>7} {'p95(s)':>7} {'reject p95(ms)':>12}  status")
+    with run_stub(latency_ms=args.latency_ms) as stub_url:
+        for label, env in configs:
+            with run_app(stub_url, extra_env=env) as (base_url, _):
+                heavy, light, metrics = asyncio.run(scenario(base_url, args.burst, args.users, args.requests))
+            report(label, "burst", heavy)
+            report(label, "others", light)
+            for line in metrics.splitlines():
+                if line.startswith(("voice_app_admission_wait_seconds_sum", "voice_app_admission_wait_seconds_count",
+                                    "voice_app_admission_requests_total", "voice_app_pool_wait_seconds_count")):
+                    print(f"{'':>17}{line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+업로드 1MB당 디코딩 지연과 메모리 사용량: 디스크 왕복(기존) vs 메모리 디코딩
+
+disk:   업로드 저장 → WAV로 변환해 저장 → WAV 다시 읽기 (기존 generate-content 경로)
+memory: 업로드 바이트를 바로 16kHz mono PCM으로 디코딩 (파일 없음)
+
+메모리는 tracemalloc 기준 최대 할당량(파이썬/numpy 버퍼)입니다.
+  python -m benchmarks.audio_decode --seconds 10 60 180
+"""
+import argparse
+import io
+import math
+import os
+import tempfile
+import time
+import tracemalloc
+
+import av
+import numpy as np
+
+from app.utils.audio_decode import decode_pcm, write_wav
+
+
+def make_webm_bytes(seconds: float, sample_rate: int = 48000) -> bytes:
+    """브라우저 MediaRecorder와 같은 webm/opus 음성(사인파)을 생성"""
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    return encode_webm((0.3 * np.sin(2 * math.pi * 220 * t)).astype(np.float32), sample_rate)
+
+
+def encode_webm(samples: np.ndarray, sample_rate: int = 48000) -> bytes:
+    """float32 mono 샘플을 webm/opus로 인코딩"""
+    buf = io.BytesIO()
+    with av.open(buf, "w", format="webm") as container:
+        stream = container.add_stream("libopus", rate=sample_rate)
+        stream.layout = "mono"
+        frame_size = 960
+        for start in range(0, len(samples), frame_size):
+            chunk = samples[start:start + frame_size]
+            frame = av.AudioFrame.from_ndarray(chunk.reshape(1, -1), format="flt", layout="mono")
+            frame.sample_rate = sample_rate
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buf.getvalue()
+
+
+def disk_path(data: bytes, workdir: str) -> bytes:
+    upload = os.path.join(workdir, "upload.webm")
+    wav = os.path.join(workdir, "upload.wav")
+    with open(upload, "wb") as f:
+        f.write(data)
+    write_wav(wav, decode_pcm(upload))
+    with open(wav, "rb") as f:
+        return f.read()
+
+
+def memory_path(data: bytes, workdir: str) -> np.ndarray:
+    return decode_pcm(data)
+
+
+def measure(func, data: bytes, workdir: str, repeat: int) -> tuple[float, float]:
+    func(data, workdir)  # 워밍업
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(data, workdir)
+    elapsed = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    func(data, workdir)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, nargs="+", default=[10, 60, 180])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'input':>12} {'path':>7} {'ms':>8} {'ms/MB':>8} {'peak MB':>8} {'peak/MB':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for seconds in args.seconds:
+            data = make_webm_bytes(seconds)
+            size_mb = len(data) / 1024 / 1024
+            for name, func in (("disk", disk_path), ("memory", memory_path)):
+                elapsed, peak = measure(func, data, workdir, args.repeat)
+                peak_mb = peak / 1024 / 1024
+                print(
+                    f"{f'{seconds:.0f}s/{size_mb:.2f}MB':>12} {name:>7} {elapsed * 1000:>8.1f}"
+                    f" {elapsed * 1000 / size_mb:>8.1f} {peak_mb:>8.2f} {peak_mb / size_mb:>8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
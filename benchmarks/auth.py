@@ -0,0 +1,109 @@
+"""
+요청당 인증 오버헤드: 매번 jose.jwt.decode(기존) vs 검증된 토큰 캐시
+
+function: 인증 함수만 반복 호출한 평균 시간 (사용자 수만큼 다른 토큰을 돌아가며 사용)
+asgi:     인증이 있는 라우트와 없는 라우트를 같은 ASGI 앱에서 호출한 시간 차이 (서버 네트워크 제외)
+  python -m benchmarks.auth --users 1 100 10000 --calls 20000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Cookie, Depends, FastAPI
+from fastapi.exceptions import HTTPException
+from jose import JWTError, jwt
+
+from app.dependencies import ALGORITHM, ISSUER, SECRET_KEY, TokenCache, get_current_user, token_cache
+from benchmarks.common import make_auth_cookie
+
+
+def uncached(access_token: str | None = Cookie(default=None, alias="ACCESS_TOKEN")):
+    """통합 이전에 라우터마다 있던 의존성과 같은 방식 (동기 함수라 스레드 풀에서 실행)"""
+    if access_token is None:
+        raise HTTPException(status_code=401)
+    try:
+        payload = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM], issuer=ISSUER)
+    except JWTError:
+        raise HTTPException(status_code=401)
+    return {"id": payload["sub"], "username": payload.get("username")}
+
+
+def bench_function(tokens: list[str], calls: int) -> tuple[float, float]:
+    started = time.perf_counter()
+    for i in range(calls):
+        jwt.decode(tokens[i % len(tokens)], SECRET_KEY, algorithms=[ALGORITHM], issuer=ISSUER)
+    plain = (time.perf_counter() - started) / calls
+
+    cache = TokenCache([SECRET_KEY])
+    for token in tokens:
+        cache.authenticate(token)
+    started = time.perf_counter()
+    for i in range(calls):
+        cache.authenticate(tokens[i % len(tokens)])
+    cached = (time.perf_counter() - started) / calls
+    return plain, cached
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/none")
+    async def no_auth():
+        return {}
+
+    @app.get("/uncached")
+    async def with_uncached(user: dict = Depends(uncached)):
+        return {}
+
+    @app.get("/cached")
+    async def with_cached(user: dict = Depends(get_current_user)):
+        return {}
+
+    return app
+
+
+async def bench_asgi(tokens: list[str], calls: int, concurrency: int) -> dict[str, float]:
+    transport = httpx.ASGITransport(app=make_app())
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/none", "/uncached", "/cached"):
+            token_cache.clear()
+            counter = iter(range(calls))
+
+            async def worker():
+                for i in counter:
+                    response = await client.get(path, cookies={"ACCESS_TOKEN": tokens[i % len(tokens)]})
+                    assert response.status_code == 200, response.status_code
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            results[path] = (time.perf_counter() - started) / calls
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 100, 10000], help="돌아가며 쓰는 서로 다른 토큰 수")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--asgi-calls", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'users':>6} {'decode µs':>10} {'cached µs':>10} {'speedup':>8}")
+    for users in args.users:
+        tokens = [make_auth_cookie(f"u{i}")["ACCESS_TOKEN"] for i in range(users)]
+        plain, cached = bench_function(tokens, args.calls)
+        print(f"{users:>6} {plain * 1e6:>10.1f} {cached * 1e6:>10.1f} {plain / cached:>7.1f}x")
+
+    tokens = [make_auth_cookie(f"u{i}")["ACCESS_TOKEN"] for i in range(min(args.users))]
+    results = asyncio.run(bench_asgi(tokens, args.asgi_calls, args.concurrency))
+    base = results["/none"]
+    print(f"\nASGI 요청 {args.asgi_calls}건, 동시 {args.concurrency} (토큰 {len(tokens)}개)")
+    print(f"{'route':>10} {'µs/req':>8} {'auth µs':>8} {'max RPS':>8}")
+    for path, per_request in results.items():
+        print(f"{path:>10} {per_request * 1e6:>8.1f} {(per_request - base) * 1e6:>8.1f} {1 / per_request:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+문장 N개를 하나씩 처리(번역 1회 + TTS 1회씩 순서대로)할 때와 일괄 처리(run_batch)할 때의 시간과 LLM 호출 수 비교
+
+  python -m benchmarks.batch --records 200 --latency-ms 300
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.common import run_stub
+
+
+async def run(count: int, workdir: str):
+    from app.services import processor_service
+    from app.services.batch_service import BatchRecord, run_batch
+    from app.services.clone_service import generate_speech_stream
+    from app.services.http_clients import upstreams
+    from app.services.translation_service import translate
+
+    calls = 0
+    original = processor_service.chat_completion
+
+    async def counting(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return await original(*args, **kwargs)
+
+    # translation_service가 가져다 쓴 이름을 바꿔야 호출 수가 집계됨
+    from app.services import translation_service
+    translation_service.chat_completion = counting
+
+    upstreams.open()
+    langs = ["English", "Japanese", "Chinese"]
+    print(f"{'mode':>10} {'records':>8} {'LLM calls':>10} {'total s':>8} {'rec/s':>7}")
+    for mode in ("one-by-one", "batch"):
+        records = [BatchRecord(f"r{i}", f"{mode} 안내 문장 {i}번입니다.", langs[i % 3], voice="v1") for i in range(count)]
+        calls = 0
+        started = time.perf_counter()
+        if mode == "batch":
+            async for _ in run_batch(records, os.path.join(workdir, mode)):
+                pass
+        else:
+            for record in records:
+                translation = await translate(record.text, record.target_lang)
+                async for _ in generate_speech_stream(translation.text, record.voice):
+                    pass
+        elapsed = time.perf_counter() - started
+        print(f"{mode:>10} {count:>8} {calls:>10} {elapsed:>8.2f} {count / elapsed:>7.1f}")
+    await upstreams.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir, run_stub(latency_ms=args.latency_ms) as stub_url:
+        os.environ.update({
+            "OPENAI_API_KEY": "sk-bench",
+            "OPENAI_BASE_URL": f"{stub_url}/v1",
+            "ELEVENLABS_API_KEY": "bench",
+            "ELEVENLABS_BASE_URL": stub_url,
+            "TTS_CACHE_DIR": os.path.join(workdir, "tts"),
+            "TRANSLATION_CACHE_DB": os.path.join(workdir, "translations.db"),
+        })
+        asyncio.run(run(args.records, workdir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+벤치마크 스크립트 공통 도구: 스텁/앱 서버 기동, 인증 쿠키, 테스트 음성 생성
+"""
+import io
+import math
+import os
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from contextlib import contextmanager
+
+from jose import jwt
+
+# 앱과 같은 환경 변수(JWT_SECRET_KEY 등)에서 읽은 값으로 서명
+from app.dependencies import ALGORITHM as JWT_ALGORITHM, ISSUER as JWT_ISSUER, SECRET_KEY as JWT_SECRET_KEY
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_auth_cookie(user_id: str, username: str | None = None, ttl_s: int = 3600) -> dict:
+    now = int(time.time())
+    token = jwt.encode(
+        {"sub": str(user_id), "username": username or f"bench{user_id}", "iss": JWT_ISSUER, "iat": now, "exp": now + ttl_s},
+        JWT_SECRET_KEY,
+        algorithm=JWT_ALGORITHM,
+    )
+    return {"ACCESS_TOKEN": token}
+
+
+def make_wav_bytes(seconds: float = 3.0, sample_rate: int = 16000, freq: float = 220.0) -> bytes:
+    """사인파 음성을 16-bit mono WAV로 생성"""
+    n = int(seconds * sample_rate)
+    frames = b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * freq * i / sample_rate))) for i in range(n)
+    )
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(frames)
+    return buf.getvalue()
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"port {port} did not open within {timeout}s")
+
+
+def make_self_signed_cert(directory: str) -> tuple[str, str]:
+    """스텁을 HTTPS로 띄우기 위한 자체 서명 인증서 (openssl 필요)"""
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+         "-days", "1", "-subj", "/CN=127.0.0.1"],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+def process_rss_mb(pid: int) -> float:
+    """프로세스와 자식 프로세스(uvicorn 워커)의 상주 메모리 합계 (Linux /proc 기준, 없으면 0)"""
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pending += [int(child) for child in f.read().split()]
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            continue
+    return total_kb / 1024
+
+
+@contextmanager
+def run_stub(latency_ms: float = 300, chunk_delay_ms: float = 20, chunks: int = 20,
+             token_delay_ms: float = 0, completion_sentences: int = 0, tls: bool = False,
+             upload_kbps: float = 0, unique_transcripts: bool = False, faults: dict | None = None):
+    """
+    스텁 업스트림 서버를 별도 프로세스로 띄우고 base URL을 반환
+    faults: 장애 주입 옵션 (예: {"error_rate": 0.1, "stall_rate": 0.05, "stall_ms": 3000})
+    """
+    port = free_port()
+    cmd = [sys.executable, "-m", "benchmarks.stub_upstreams", "--port", str(port),
+           "--latency-ms", str(latency_ms), "--chunk-delay-ms", str(chunk_delay_ms), "--chunks", str(chunks),
+           "--token-delay-ms", str(token_delay_ms), "--completion-sentences", str(completion_sentences),
+           "--upload-kbps", str(upload_kbps)]
+    if unique_transcripts:
+        cmd.append("--unique-transcripts")
+    for name, value in (faults or {}).items():
+        cmd += [f"--{name.replace('_', '-')}", str(value)]
+    with tempfile.TemporaryDirectory() as cert_dir:
+        if tls:
+            cert, key = make_self_signed_cert(cert_dir)
+            cmd += ["--tls-cert", cert, "--tls-key", key]
+        proc = subprocess.Popen(cmd, cwd=REPO_ROOT, stdout=subprocess.DEVNULL)
+        try:
+            wait_for_port(port)
+            yield f"{'https' if tls else 'http'}://127.0.0.1:{port}"
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+@contextmanager
+def run_app(stub_url: str, extra_env: dict | None = None, workers: int = 1):
+    """스텁을 바라보도록 설정한 FastAPI 앱을 uvicorn 프로세스로 띄움"""
+    port = free_port()
+    workdir = tempfile.mkdtemp(prefix="bench_app_")  # 캐시/레지스트리 파일이 저장소를 오염시키지 않도록
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": REPO_ROOT,
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "ELEVENLABS_API_KEY": "xi-bench",
+        "ELEVENLABS_BASE_URL": stub_url,
+        "TTS_CACHE_DIR": os.path.join(workdir, "tts"),
+        "TRANSLATION_CACHE_DB": os.path.join(workdir, "translations.db"),
+        "VOICE_REGISTRY_DB": os.path.join(workdir, "voices.db"),
+        "JOB_AUDIO_DIR": os.path.join(workdir, "jobs"),
+        "BATCH_DIR": os.path.join(workdir, "batches"),
+        "LEGACY_VOICE_MAP": "",
+    })
+    env.update(extra_env or {})
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        yield f"http://127.0.0.1:{port}", proc
+    finally:
+        proc.terminate()
+        proc.wait()
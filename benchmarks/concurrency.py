@@ -0,0 +1,93 @@
+"""
+동시 클라이언트 수(N)에 따른 /api/generate-content 처리량 측정
+
+업스트림 호출이 이벤트 루프를 막지 않으면 N이 늘어날수록 처리량이 거의 선형으로 증가해야 합니다.
+  python -m benchmarks.concurrency --clients 1 2 4 8 16 --requests 32 --latency-ms 300
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import make_auth_cookie, make_wav_bytes, percentile, run_app, run_stub
+
+
+async def _one_request(client: httpx.AsyncClient, user_id: str, sample: bytes) -> float:
+    started = time.perf_counter()
+    async with client.stream(
+        "POST",
+        "/api/generate-content",
+        data={"mode": "upload", "target_lang": "English", "domain": "none"},
+        files={"audio": ("sample.wav", sample, "audio/wav")},
+        cookies=make_auth_cookie(user_id),
+    ) as response:
+        response.raise_for_status()
+        async for _ in response.aiter_bytes():
+            pass
+    return time.perf_counter() - started
+
+
+async def _page_request(client: httpx.AsyncClient) -> float:
+    started = time.perf_counter()
+    response = await client.get("/select.html", cookies=make_auth_cookie("page"))
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def run_level(base_url: str, clients: int, total: int, sample: bytes) -> dict:
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+    latencies: list[float] = []
+    page_latencies: list[float] = []
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def worker():
+            while not queue.empty():
+                i = queue.get_nowait()
+                latencies.append(await _one_request(client, f"c{clients}-{i}", sample))
+
+        async def page_prober(stop: asyncio.Event):
+            # 무거운 요청이 도는 동안에도 가벼운 HTML 페이지가 빠르게 응답하는지 확인
+            while not stop.is_set():
+                page_latencies.append(await _page_request(client))
+                await asyncio.sleep(0.05)
+
+        stop = asyncio.Event()
+        prober = asyncio.create_task(page_prober(stop))
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(clients)))
+        finally:
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await prober
+
+    return {
+        "clients": clients,
+        "requests": total,
+        "throughput_rps": total / elapsed,
+        "p50_s": percentile(latencies, 50),
+        "p99_s": percentile(latencies, 99),
+        "page_p99_ms": percentile(page_latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    sample = make_wav_bytes(2.0)
+    with run_stub(latency_ms=args.latency_ms) as stub_url, run_app(stub_url) as (base_url, _):
+        print(f"{'N':>4} {'req/s':>8} {'p50(s)':>8} {'p99(s)':>8} {'page p99(ms)':>13}")
+        for n in args.clients:
+            r = asyncio.run(run_level(base_url, n, max(args.requests, n), sample))
+            print(f"{r['clients']:>4} {r['throughput_rps']:>8.2f} {r['p50_s']:>8.3f} {r['p99_s']:>8.3f} {r['page_p99_ms']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
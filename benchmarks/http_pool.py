@@ -0,0 +1,78 @@
+"""
+요청마다 새 클라이언트를 만드는 방식(기존)과 공유 연결 풀의 요청당 지연 비교
+
+스텁을 HTTPS로 띄워 TCP + TLS 핸드셰이크 비용까지 포함해 측정합니다.
+루프백에서는 왕복 지연이 거의 없으므로, 실제 업스트림에서는 RTT x (1 + TLS 왕복 수)만큼 차이가 더 커집니다.
+  python -m benchmarks.http_pool --requests 200 --concurrency 1 8
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import percentile, run_stub
+
+# 스텁의 즉시 응답하는 엔드포인트 (업스트림 처리 시간을 제외하고 연결 비용만 보기 위함)
+PATH = "/v1/voices/bench"
+
+
+async def _per_request(base_url: str) -> float:
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, verify=False) as client:
+        (await client.delete(PATH)).raise_for_status()
+    return time.perf_counter() - started
+
+
+async def _pooled(client: httpx.AsyncClient) -> float:
+    started = time.perf_counter()
+    (await client.delete(PATH)).raise_for_status()
+    return time.perf_counter() - started
+
+
+async def _run(make_call, requests: int, concurrency: int) -> list[float]:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            return await make_call()
+
+    return await asyncio.gather(*[one() for _ in range(requests)])
+
+
+async def run(base_url: str, requests: int, concurrency_levels: list[int]):
+    from app.services.http_clients import HTTP2_ENABLED, _new_client
+
+    pooled = _new_client(base_url, {}, httpx.Timeout(30.0, connect=5.0), verify=False)  # 자체 서명 인증서
+    print(f"HTTP/2: {HTTP2_ENABLED}")
+    print(f"{'mode':>12} {'conc':>5} {'p50':>8} {'p99':>8} {'mean':>8}  (ms)")
+    try:
+        for concurrency in concurrency_levels:
+            results = {}
+            for name, call in (("per-request", lambda: _per_request(base_url)), ("pooled", lambda: _pooled(pooled))):
+                await _run(call, min(concurrency * 2, requests), concurrency)  # 워밍업
+                samples = await _run(call, requests, concurrency)
+                results[name] = samples
+                print(
+                    f"{name:>12} {concurrency:>5} {percentile(samples, 50) * 1000:>8.2f}"
+                    f" {percentile(samples, 99) * 1000:>8.2f} {sum(samples) / len(samples) * 1000:>8.2f}"
+                )
+            saved = (sum(results["per-request"]) - sum(results["pooled"])) / requests
+            print(f"{'saved/req':>12} {concurrency:>5} {saved * 1000:>8.2f}")
+    finally:
+        await pooled.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--no-tls", action="store_true", help="HTTP로 측정 (TCP 핸드셰이크만)")
+    args = parser.parse_args()
+
+    with run_stub(latency_ms=0, tls=not args.no_tls) as stub_url:
+        asyncio.run(run(stub_url, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
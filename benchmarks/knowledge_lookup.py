@@ -0,0 +1,71 @@
+"""
+용어집 크기에 따른 색인 구축/조회 비용 측정 (Aho-Corasick 색인 vs 용어별 부분 문자열 검사)
+
+  python -m benchmarks.knowledge_lookup --sizes 100 1000 10000 50000
+"""
+import argparse
+import random
+import time
+
+from app.services.knowledge_service import GlossaryEntry, KnowledgeIndex, _term_variants, normalize
+
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호"
+
+
+def synthetic_entries(n: int, seed: int = 0) -> list[GlossaryEntry]:
+    rng = random.Random(seed)
+    entries, seen = [], set()
+    while len(entries) < n:
+        if rng.random() < 0.5:
+            term = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+        else:
+            term = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))).upper()
+        if term in seen:
+            continue
+        seen.add(term)
+        entries.append(GlossaryEntry(term, f"{term}에 대한 정의", _term_variants(term)))
+    return entries
+
+
+def naive_lookup(entries: list[GlossaryEntry], text: str) -> list[GlossaryEntry]:
+    normalized = normalize(text)
+    return [e for e in entries if any(v in normalized for v in e.aliases)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--text-terms", type=int, default=5, help="입력 문장에 섞어 넣을 용어 개수")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'terms':>7} {'build(ms)':>10} {'index(us)':>10} {'naive(us)':>10} {'matched':>8}")
+    for size in args.sizes:
+        entries = synthetic_entries(size)
+        picked = random.Random(1).sample(entries, min(args.text_terms, size))
+        text = "오늘 회의에서는 " + ", ".join(e.term for e in picked) + " 에 대해 논의하고 다음 주까지 정리하기로 했습니다. " * 2
+
+        started = time.perf_counter()
+        domain = KnowledgeIndex.build_domain(entries)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        index = KnowledgeIndex(knowledge_dir="", check_interval=float("inf"))
+        index.reload()  # 빈 디렉터리로 한 번 색인해 두어야 조회 때 다시 읽지 않음
+        index._domains["bench"] = domain
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            matched = index.lookup("bench", text)
+        index_us = (time.perf_counter() - started) / args.repeat * 1e6
+
+        naive_repeat = max(1, args.repeat // 20)
+        started = time.perf_counter()
+        for _ in range(naive_repeat):
+            naive_lookup(entries, text)
+        naive_us = (time.perf_counter() - started) / naive_repeat * 1e6
+
+        print(f"{size:>7} {build_ms:>10.1f} {index_us:>10.1f} {naive_us:>10.1f} {len(matched):>8}")
+
+
+if __name__ == "__main__":
+    main()
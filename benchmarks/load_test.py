@@ -0,0 +1,192 @@
+"""
+배포 전 성능 회귀 확인용 부하 테스트 (실제 API 비용 없음)
+
+스텁 업스트림(OpenAI 채팅/음성 인식/음성 합성, ElevenLabs 목소리 등록/스트리밍 합성)과 앱을 띄우고,
+엔드포인트별로 동시 클라이언트 수를 늘려 가며 처리량, 지연(p50/p95/p99), 첫 바이트까지의 시간(TTFB),
+앱 프로세스 메모리(RSS)를 측정합니다.
+  python -m benchmarks.load_test --endpoints generate stt tts stt-tts --clients 1 4 16 --requests 32
+  python -m benchmarks.load_test --save baseline.json
+  python -m benchmarks.load_test --baseline baseline.json --tolerance 0.2   # 회귀가 있으면 종료 코드 1
+
+기본적으로 요청마다 인식 결과/문장이 달라 번역·TTS 캐시가 적중하지 않는 경로를 측정합니다 (--warm이면 같은 입력 반복).
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import make_auth_cookie, make_wav_bytes, percentile, process_rss_mb, run_app, run_stub
+
+ENDPOINTS = ("generate", "stt", "tts", "stt-tts")
+
+
+class Scenario:
+    """엔드포인트 하나에 보낼 요청을 만듦. 응답 본문을 끝까지 읽으면서 첫 바이트 시각을 기록"""
+
+    def __init__(self, name: str, sample: bytes, warm: bool):
+        self.name = name
+        self.sample = sample
+        self.warm = warm
+        self._counter = itertools.count()
+
+    def request(self) -> dict:
+        n = next(self._counter)
+        files = {"audio": ("sample.wav", self.sample, "audio/wav")}
+        if self.name == "generate":
+            return {"url": "/api/generate-content", "data": {"mode": "upload", "target_lang": "English"}, "files": files}
+        if self.name == "stt":
+            return {"url": "/stt/", "files": files}
+        if self.name == "tts":
+            text = "부하 테스트용 문장입니다." + ("" if self.warm else f" {n}")
+            return {"url": "/tts/", "data": {"text": text}}
+        if self.name == "stt-tts":
+            return {"url": "/stt-tts/", "files": files}
+        raise ValueError(self.name)
+
+
+async def _one(client: httpx.AsyncClient, scenario: Scenario, cookies: dict) -> tuple[float, float, bool]:
+    started = time.perf_counter()
+    ttfb = None
+    request = scenario.request()
+    async with client.stream("POST", request["url"], data=request.get("data"), files=request.get("files"), cookies=cookies) as response:
+        async for _ in response.aiter_bytes():
+            if ttfb is None:
+                ttfb = time.perf_counter() - started
+        ok = response.status_code < 400
+    elapsed = time.perf_counter() - started
+    return elapsed, ttfb if ttfb is not None else elapsed, ok
+
+
+async def run_level(base_url: str, pid: int, scenario: Scenario, clients: int, total: int, users: list[dict]) -> dict:
+    latencies, ttfbs = [], []
+    errors = 0
+    peak_rss = process_rss_mb(pid)
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                i = queue.get_nowait()
+                try:
+                    elapsed, ttfb, ok = await _one(client, scenario, users[i % len(users)])
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(elapsed)
+                ttfbs.append(ttfb)
+                errors += not ok
+
+        async def sample_memory(stop: asyncio.Event):
+            nonlocal peak_rss
+            while not stop.is_set():
+                peak_rss = max(peak_rss, process_rss_mb(pid))
+                await asyncio.sleep(0.1)
+
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_memory(stop))
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(clients)))
+        finally:
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await sampler
+
+    return {
+        "endpoint": scenario.name,
+        "clients": clients,
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": total / elapsed,
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "p99_s": percentile(latencies, 99),
+        "ttfb_p50_s": percentile(ttfbs, 50),
+        "ttfb_p95_s": percentile(ttfbs, 95),
+        "peak_rss_mb": peak_rss,
+    }
+
+
+async def warm_up(base_url: str, users: list[dict], sample: bytes):
+    """사용자별 목소리 등록을 미리 끝내, 측정 구간에 최초 1회 복제 비용이 섞이지 않게 함"""
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        await asyncio.gather(*(
+            client.post("/api/voice-sample", files={"audio": ("sample.wav", sample, "audio/wav")}, cookies=cookies)
+            for cookies in users
+        ))
+        await asyncio.sleep(1.0)
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """기준 결과보다 p95가 tolerance 이상 느려지거나 처리량이 tolerance 이상 줄어든 항목"""
+    previous = {(r["endpoint"], r["clients"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = previous.get((r["endpoint"], r["clients"]))
+        if base is None:
+            continue
+        label = f"{r['endpoint']} N={r['clients']}"
+        if r["p95_s"] > base["p95_s"] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {base['p95_s']:.3f}s → {r['p95_s']:.3f}s")
+        if r["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{label}: 처리량 {base['throughput_rps']:.2f} → {r['throughput_rps']:.2f} req/s")
+        if r["errors"] > base["errors"]:
+            regressions.append(f"{label}: 오류 {base['errors']} → {r['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="동시 수준마다 보낼 요청 수 (최소 clients)")
+    parser.add_argument("--users", type=int, default=8, help="요청을 나눠 보낼 사용자(JWT) 수")
+    parser.add_argument("--latency-ms", type=float, default=300, help="스텁 업스트림의 첫 응답 지연")
+    parser.add_argument("--chunk-delay-ms", type=float, default=20, help="스텁 TTS 스트림 청크 간격")
+    parser.add_argument("--chunks", type=int, default=20, help="스텁 TTS 스트림 청크 수")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--warm", action="store_true", help="같은 입력을 반복해 캐시 적중 경로를 측정")
+    parser.add_argument("--save", help="결과를 JSON으로 저장 (다음 실행의 --baseline으로 사용)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 성능 저하 비율")
+    args = parser.parse_args()
+
+    sample = make_wav_bytes(2.0)
+    users = [make_auth_cookie(f"load{i}") for i in range(max(1, args.users))]
+    results = []
+    with run_stub(
+        latency_ms=args.latency_ms, chunk_delay_ms=args.chunk_delay_ms, chunks=args.chunks, unique_transcripts=not args.warm
+    ) as stub_url, run_app(stub_url, workers=args.workers) as (base_url, proc):
+        asyncio.run(warm_up(base_url, users, sample))
+        print(f"{'endpoint':>9} {'N':>4} {'req/s':>8} {'p50(s)':>8} {'p95(s)':>8} {'p99(s)':>8}"
+              f" {'ttfb50':>8} {'ttfb95':>8} {'RSS MB':>8} {'err':>4}")
+        for name in args.endpoints:
+            scenario = Scenario(name, sample, args.warm)
+            for n in args.clients:
+                r = asyncio.run(run_level(base_url, proc.pid, scenario, n, max(args.requests, n), users))
+                results.append(r)
+                print(f"{name:>9} {n:>4} {r['throughput_rps']:>8.2f} {r['p50_s']:>8.3f} {r['p95_s']:>8.3f} {r['p99_s']:>8.3f}"
+                      f" {r['ttfb_p50_s']:>8.3f} {r['ttfb_p95_s']:>8.3f} {r['peak_rss_mb']:>8.1f} {r['errors']:>4}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"회귀: {line}")
+        if regressions:
+            sys.exit(1)
+        print("기준 결과 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+업스트림 장애 주입 시 재시도/hedge/회로 차단 효과
+
+스텁이 일부 요청에 503을 돌려주고(error-rate) 일부는 오래 멈추게(stall-rate) 한 상태에서 /tts/를 호출해
+오류율과 지연(p50/p95/p99)을 설정별로 비교합니다. 마지막으로 업스트림이 완전히 죽은 경우(outage)에
+회로가 열린 뒤 얼마나 빨리 실패하는지 확인합니다.
+  python -m benchmarks.resilience --requests 200 --error-rate 0.1 --stall-rate 0.05 --stall-ms 3000
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import time
+
+import httpx
+
+from benchmarks.common import make_auth_cookie, percentile, run_app, run_stub
+
+_counter = itertools.count()
+
+
+async def call(client: httpx.AsyncClient, cookies: dict) -> tuple[float, int]:
+    started = time.perf_counter()
+    # 문장을 매번 바꿔 TTS 캐시가 적중하지 않게 함
+    response = await client.post("/tts/", data={"text": f"장애 주입 테스트 {next(_counter)}"}, cookies=cookies)
+    return time.perf_counter() - started, response.status_code
+
+
+async def run_requests(base_url: str, total: int, concurrency: int) -> tuple[list[float], collections.Counter]:
+    cookies = make_auth_cookie("resilience")
+    latencies, statuses = [], collections.Counter()
+    remaining = iter(range(total))
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def worker():
+            for _ in remaining:
+                elapsed, status = await call(client, cookies)
+                latencies.append(elapsed)
+                statuses[status] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses
+
+
+def report(label: str, latencies: list[float], statuses: collections.Counter):
+    errors = sum(count for status, count in statuses.items() if status >= 400)
+    print(
+        f"{label:>14} {percentile(latencies, 50):>7.3f} {percentile(latencies, 95):>7.3f} {percentile(latencies, 99):>7.3f}"
+        f" {errors / max(1, sum(statuses.values())) * 100:>6.1f}%  {dict(sorted(statuses.items()))}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--stall-ms", type=float, default=3000)
+    parser.add_argument("--hedge-ms", type=float, default=300, help="hedge 설정에서 두 번째 요청을 보내기까지 기다리는 시간")
+    args = parser.parse_args()
+
+    faults = {"error_rate": args.error_rate, "stall_rate": args.stall_rate, "stall_ms": args.stall_ms, "fault_seed": 1}
+    # 오류율 비교가 회로 차단에 가려지지 않도록 앞의 세 설정에서는 회로가 열리지 않게 함
+    configs = [
+        ("no-retry", {"UPSTREAM_MAX_ATTEMPTS": "1", "CIRCUIT_FAILURE_THRESHOLD": "1000000"}),
+        ("retry", {"CIRCUIT_FAILURE_THRESHOLD": "1000000"}),
+        ("retry+hedge", {"CIRCUIT_FAILURE_THRESHOLD": "1000000", "OPENAI_HEDGE_AFTER_MS": str(args.hedge_ms)}),
+    ]
+
+    print(f"장애: 오류 {args.error_rate:.0%}, 멈춤 {args.stall_rate:.0%} × {args.stall_ms:.0f}ms, 기본 지연 {args.latency_ms:.0f}ms")
+    print(f"{'config':>14} {'p50(s)':>7} {'p95(s)':>7} {'p99(s)':>7} {'errors':>7}  status")
+    with run_stub(latency_ms=args.latency_ms, faults=faults) as stub_url:
+        for label, env in configs:
+            with run_app(stub_url, extra_env=env) as (base_url, _):
+                report(label, *asyncio.run(run_requests(base_url, args.requests, args.concurrency)))
+
+    # 업스트림이 완전히 죽은 경우: 처음 몇 번은 재시도 끝에 실패하고, 회로가 열린 뒤에는 바로 503
+    with run_stub(latency_ms=args.latency_ms, faults={"error_rate": 1.0}) as stub_url:
+        with run_app(stub_url, extra_env={"CIRCUIT_RESET_SECONDS": "60"}) as (base_url, _):
+            warmup, statuses = asyncio.run(run_requests(base_url, 5, 1))
+            report("outage(first5)", warmup, statuses)
+            report("outage(open)", *asyncio.run(run_requests(base_url, args.requests, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
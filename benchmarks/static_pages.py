@@ -0,0 +1,80 @@
+"""
+HTML 페이지 응답 비용: 매번 파일을 읽는 FileResponse(기존) vs 메모리 캐시(압축본, ETag/304)
+
+file:   stat + FileResponse (비압축)
+memory: 메모리에 올린 gzip/brotli 압축본
+304:    브라우저가 ETag로 다시 확인하는 경우 (본문 없음)
+  python -m benchmarks.static_pages --requests 2000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import FileResponse
+
+from app.main import STATIC_DIR
+from app.utils.static_pages import StaticPageCache, brotli
+
+PAGES = ["select.html", "process.html", "result.html"]
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    pages = StaticPageCache(STATIC_DIR, PAGES)
+    pages.reload(force=True)
+
+    @app.get("/file/{name}")
+    async def file_page(name: str):
+        path = STATIC_DIR / name
+        if not path.exists():
+            return Response(status_code=404)
+        return FileResponse(path)
+
+    @app.get("/memory/{name}")
+    async def memory_page(request: Request, name: str):
+        return pages.response(request, name)
+
+    return app
+
+
+async def bench(client: httpx.AsyncClient, url: str, headers: dict, requests: int) -> tuple[float, int]:
+    sent = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(url, headers=headers)
+        assert response.status_code in (200, 304), response.status_code
+        sent += len(response.content) if not response.headers.get("content-encoding") else int(
+            response.headers.get("content-length", 0)
+        )
+    return (time.perf_counter() - started) / requests, sent // requests
+
+
+async def run(requests: int):
+    transport = httpx.ASGITransport(app=make_app())
+    encoding = "br, gzip" if brotli is not None else "gzip"
+    print(f"Accept-Encoding: {encoding}")
+    print(f"{'page':>13} {'path':>7} {'µs/req':>8} {'bytes':>7}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in PAGES:
+            first = await client.get(f"/memory/{name}", headers={"accept-encoding": encoding})
+            cases = (
+                ("file", f"/file/{name}", {"accept-encoding": encoding}),
+                ("memory", f"/memory/{name}", {"accept-encoding": encoding}),
+                ("304", f"/memory/{name}", {"accept-encoding": encoding, "if-none-match": first.headers["etag"]}),
+            )
+            for label, url, headers in cases:
+                per_request, size = await bench(client, url, headers, requests)
+                print(f"{name:>13} {label:>7} {per_request * 1e6:>8.1f} {size:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
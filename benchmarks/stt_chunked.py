@@ -0,0 +1,71 @@
+"""
+긴 녹음의 STT 지연: 한 번에 업로드(serial) vs 무음 지점에서 나눠 동시에 인식(chunked)
+
+스텁의 음성 인식 엔드포인트는 --upload-kbps로 요청 본문 크기에 비례한 시간을 씁니다
+(업로드 + 인식 시간이 음성 길이에 비례한다고 가정). 동시 구간 수가 늘수록
+전체 시간이 구간 합계가 아니라 가장 긴 구간 쪽으로 줄어드는지 확인합니다.
+  python -m benchmarks.stt_chunked --minutes 5 10 --concurrency 1 4 8
+"""
+import argparse
+import asyncio
+import math
+import os
+import time
+
+import numpy as np
+
+from benchmarks.common import run_stub
+from benchmarks.audio_decode import encode_webm
+
+
+def make_recording(minutes: float, sample_rate: int = 48000) -> bytes:
+    """4초 발화 + 0.6초 쉼이 반복되고, 중간에 쉬지 않고 1분 동안 말하는 구간이 있는 녹음"""
+    def tone(seconds: float) -> np.ndarray:
+        t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+        return (0.3 * np.sin(2 * math.pi * 220 * t)).astype(np.float32)
+
+    pause = np.zeros(int(0.6 * sample_rate), dtype=np.float32)
+    parts, total = [], 0.0
+    while total < minutes * 60:
+        if len(parts) == 20:
+            parts.append(tone(60))
+            total += 60
+        parts += [tone(4), pause]
+        total += 4.6
+    return encode_webm(np.concatenate(parts), sample_rate)
+
+
+async def run(recordings: dict[str, bytes], concurrency: list[int]):
+    from app.services import stt_service
+
+    print(f"{'input':>8} {'mode':>12} {'chunks':>7} {'longest s':>10} {'total s':>8}")
+    for name, data in recordings.items():
+        runs = [("serial", 0, 1)] + [(f"chunked x{n}", stt_service.STT_CHUNK_SECONDS, n) for n in concurrency]
+        for mode, chunk_seconds, parallel in runs:
+            stt_service.STT_CHUNK_SECONDS = chunk_seconds
+            stt_service.STT_CHUNK_CONCURRENCY = parallel
+            prepared = stt_service.prepare_audio(data, "record.webm")
+            chunks = stt_service.plan_chunks(prepared.pcm)
+            longest = max(end - start for start, end, _ in chunks) / 16000
+            started = time.perf_counter()
+            await stt_service.transcribe_audio(data, "record.webm")
+            elapsed = time.perf_counter() - started
+            print(f"{name:>8} {mode:>12} {len(chunks):>7} {longest:>10.1f} {elapsed:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=float, nargs="+", default=[5])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--upload-kbps", type=float, default=200)
+    args = parser.parse_args()
+
+    recordings = {f"{m:g}min": make_recording(m) for m in args.minutes}
+    with run_stub(latency_ms=args.latency_ms, upload_kbps=args.upload_kbps) as stub_url:
+        os.environ.update({"OPENAI_API_KEY": "sk-bench", "OPENAI_BASE_URL": f"{stub_url}/v1"})
+        asyncio.run(run(recordings, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+STT 업로드 전처리(무음 제거, Opus 압축)에 따른 업로드 크기와 지연 비교
+
+스텁의 음성 인식 엔드포인트가 --upload-kbps 속도의 업링크를 흉내 냅니다.
+  python -m benchmarks.stt_preprocess --speech 10 20 --upload-kbps 2000
+
+legacy:   무음 유지, 16kHz WAV 업로드 (webm→wav 변환 후 업로드하던 기존 방식)
+original: 무음 유지, 받은 파일 그대로 업로드
+trim-wav: 앞뒤 무음 제거 후 WAV
+trim-opus: 앞뒤 무음 제거 후 Ogg/Opus (기본값)
+"""
+import argparse
+import asyncio
+import math
+import os
+import time
+
+import numpy as np
+
+from benchmarks.common import run_stub
+from benchmarks.audio_decode import encode_webm
+
+MODES = {
+    "legacy": (False, "wav"),
+    "original": (False, "original"),
+    "trim-wav": (True, "wav"),
+    "trim-opus": (True, "opus"),
+}
+
+
+def make_clip(speech_s: float, lead_s: float, tail_s: float) -> bytes:
+    """앞뒤에 무음이 붙은 webm/opus 녹음"""
+    sample_rate = 48000
+    t = np.arange(int(speech_s * sample_rate), dtype=np.float32) / sample_rate
+    speech = (0.3 * np.sin(2 * math.pi * 220 * t)).astype(np.float32)
+    silence = lambda s: np.zeros(int(s * sample_rate), dtype=np.float32)  # noqa: E731
+    return encode_webm(np.concatenate([silence(lead_s), speech, silence(tail_s)]), sample_rate)
+
+
+async def run(clips: dict[str, bytes]):
+    from app.services import stt_preprocess
+    from app.services.stt_service import transcribe_audio
+
+    print(f"{'clip':>12} {'mode':>10} {'orig KB':>8} {'sent KB':>8} {'saved %':>8} {'ms':>8}")
+    for name, data in clips.items():
+        for mode, (trim, upload_format) in MODES.items():
+            stt_preprocess.STT_TRIM_SILENCE = trim
+            stt_preprocess.STT_UPLOAD_FORMAT = upload_format
+            before = dict(stt_preprocess.upload_stats)
+            started = time.perf_counter()
+            await transcribe_audio(data, "record.webm")
+            elapsed = (time.perf_counter() - started) * 1000
+            sent = stt_preprocess.upload_stats["bytes_uploaded"] - before["bytes_uploaded"]
+            print(
+                f"{name:>12} {mode:>10} {len(data) / 1024:>8.1f} {sent / 1024:>8.1f}"
+                f" {(1 - sent / len(data)) * 100:>8.1f} {elapsed:>8.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--speech", type=float, nargs="+", default=[10, 20])
+    parser.add_argument("--lead", type=float, default=2.0, help="앞쪽 무음(초)")
+    parser.add_argument("--tail", type=float, default=3.0, help="뒤쪽 무음(초)")
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--upload-kbps", type=float, default=2000)
+    args = parser.parse_args()
+
+    clips = {f"{s:.0f}s speech": make_clip(s, args.lead, args.tail) for s in args.speech}
+    clips["silent"] = make_clip(0, args.lead + args.tail, 0)
+
+    with run_stub(latency_ms=args.latency_ms, upload_kbps=args.upload_kbps) as stub_url:
+        os.environ.update({"OPENAI_API_KEY": "sk-bench", "OPENAI_BASE_URL": f"{stub_url}/v1"})
+        asyncio.run(run(clips))
+
+
+if __name__ == "__main__":
+    main()
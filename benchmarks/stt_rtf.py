@@ -0,0 +1,103 @@
+"""
+로컬 faster-whisper와 API 방식 음성 인식의 실시간 비율(RTF)과 처리량 비교
+
+RTF = 처리 시간 / 음성 길이 (1보다 작을수록 실시간보다 빠름)
+처리량 = 동시 N개 처리 시 벽시계 1초당 처리한 음성 길이(초)
+
+  python -m benchmarks.stt_rtf --clips a.wav b.webm --concurrency 1 4
+  WHISPER_MODEL=base python -m benchmarks.stt_rtf --seconds 5 15 30
+
+--clips를 주지 않으면 사인파 음성을 만들어 사용합니다 (VAD가 음성이 아니라고 판단해 실제 음성보다 빠르게 끝날 수 있음).
+API 쪽은 스텁 서버의 고정 지연(--api-latency-ms)으로 왕복을 흉내 냅니다.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import wave
+
+from benchmarks.common import make_wav_bytes, percentile, run_stub
+
+
+def _duration(path: str) -> float:
+    try:
+        with wave.open(path, "rb") as w:
+            return w.getnframes() / w.getframerate()
+    except wave.Error:
+        import av
+
+        with av.open(path) as container:
+            return float(container.duration or 0) / 1_000_000
+
+
+async def _measure(transcribe, clips: list[tuple[str, float]], concurrency: int) -> tuple[list[float], float]:
+    gate = asyncio.Semaphore(concurrency)
+    rtfs = []
+
+    async def one(path, duration):
+        async with gate:
+            started = time.perf_counter()
+            await transcribe(path)
+            rtfs.append((time.perf_counter() - started) / duration)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(path, duration) for path, duration in clips])
+    return rtfs, time.perf_counter() - started
+
+
+async def run(clips: list[tuple[str, float]], concurrency_levels: list[int], rounds: int):
+    # 환경 변수를 설정한 뒤에 임포트해야 스텁 주소를 사용함
+    from app.services.stt_service import transcribe_with_api, transcribe_with_local
+    from app.services.whisper_engine import whisper_engine, WHISPER_MODEL, WHISPER_COMPUTE_TYPE
+
+    audio = {}
+    for path, _ in clips:
+        with open(path, "rb") as f:
+            audio[path] = f.read()
+
+    started = time.perf_counter()
+    backends = {"api": lambda path: transcribe_with_api(audio[path], os.path.basename(path))}
+    if whisper_engine.load():
+        print(f"로컬 모델 로딩: {time.perf_counter() - started:.1f}s ({WHISPER_MODEL}, {WHISPER_COMPUTE_TYPE})")
+        await transcribe_with_local(audio[clips[0][0]])  # 워밍업
+        backends["local"] = lambda path: transcribe_with_local(audio[path])
+    else:
+        print(f"로컬 모델을 사용할 수 없어 API만 측정합니다: {whisper_engine.load_error}")
+
+    audio_total = sum(duration for _, duration in clips) * rounds
+    print(f"클립 {len(clips)}개 x {rounds}회, 총 {audio_total:.1f}s 음성")
+    print(f"{'backend':>8} {'conc':>5} {'RTF p50':>8} {'RTF p95':>8} {'audio s/s':>10}")
+    for name, transcribe in backends.items():
+        for concurrency in concurrency_levels:
+            rtfs, elapsed = await _measure(transcribe, clips * rounds, concurrency)
+            print(
+                f"{name:>8} {concurrency:>5} {percentile(rtfs, 50):>8.3f} {percentile(rtfs, 95):>8.3f}"
+                f" {audio_total / elapsed:>10.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clips", nargs="*", default=[])
+    parser.add_argument("--seconds", type=float, nargs="+", default=[5, 15, 30], help="--clips가 없을 때 만들 음성 길이")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--api-latency-ms", type=float, default=1200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir, run_stub(latency_ms=args.api_latency_ms) as stub_url:
+        paths = list(args.clips)
+        for i, seconds in enumerate(args.seconds if not paths else []):
+            path = os.path.join(workdir, f"clip{i}.wav")
+            with open(path, "wb") as f:
+                f.write(make_wav_bytes(seconds))
+            paths.append(path)
+        clips = [(path, _duration(path)) for path in paths]
+
+        os.environ.update({"OPENAI_API_KEY": "sk-bench", "OPENAI_BASE_URL": f"{stub_url}/v1"})
+        asyncio.run(run(clips, args.concurrency, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
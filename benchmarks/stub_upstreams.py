@@ -0,0 +1,225 @@
+"""
+OpenAI / ElevenLabs API를 흉내 내는 로컬 스텁 서버 (벤치마크 전용)
+
+실제 API 비용 없이 지연 시간만 재현합니다. 장애 주입 옵션으로 오류 응답(503/429)과 응답 지연(stall)을 섞을 수 있습니다.
+  python -m benchmarks.stub_upstreams --port 9100 --latency-ms 300
+  python -m benchmarks.stub_upstreams --port 9100 --error-rate 0.1 --stall-rate 0.05 --stall-ms 5000
+"""
+import argparse
+import asyncio
+import json
+import random
+import uuid
+
+from starlette.applications import Starlette
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+
+def create_app(
+    latency_ms: float = 300,
+    chunk_delay_ms: float = 20,
+    chunks: int = 20,
+    chunk_size: int = 1024,
+    token_delay_ms: float = 0,
+    completion_sentences: int = 0,
+    upload_kbps: float = 0,
+    unique_transcripts: bool = False,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    retry_after: float | None = None,
+    stall_rate: float = 0.0,
+    stall_ms: float = 0,
+    fault_seed: int | None = None,
+) -> Starlette:
+    """
+    latency_ms: 모든 엔드포인트의 첫 응답까지 지연
+    chunk_delay_ms / chunks: TTS 스트림 청크 간격과 개수
+    token_delay_ms: LLM 토큰(단어) 하나를 생성하는 데 걸리는 시간
+    completion_sentences: 0보다 크면 LLM이 이 개수만큼의 긴 문장을 생성 (0이면 입력 마지막 줄을 되돌려줌)
+    upload_kbps: 0보다 크면 음성 인식 요청 본문 크기만큼 업로드 시간을 흉내 냄 (느린 업링크)
+    unique_transcripts: 음성 인식 결과에 일련번호를 붙여 번역/TTS 캐시가 적중하지 않게 함 (부하 테스트용)
+    error_rate / error_status / retry_after: 이 비율의 요청에 오류 상태로 응답 (retry_after가 있으면 Retry-After 헤더)
+    stall_rate / stall_ms: 이 비율의 요청은 응답 전에 stall_ms만큼 더 멈춤 (꼬리 지연 재현)
+    """
+    latency = latency_ms / 1000
+    chunk_delay = chunk_delay_ms / 1000
+    token_delay = token_delay_ms / 1000
+    fake_mp3 = b"\xff\xf3" + b"\x00" * (chunk_size - 2)
+    transcript_count = 0
+    rng = random.Random(fault_seed)
+
+    def faulty(handler):
+        async def wrapped(request: Request):
+            roll = rng.random()
+            if roll < error_rate:
+                await request.body()
+                headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else None
+                return JSONResponse(
+                    {"error": {"message": "stub fault injection", "type": "server_error"}},
+                    status_code=error_status, headers=headers,
+                )
+            if roll < error_rate + stall_rate:
+                await asyncio.sleep(stall_ms / 1000)
+            try:
+                return await handler(request)
+            except ClientDisconnect:
+                # hedge로 보낸 요청 중 늦은 쪽은 클라이언트가 끊음
+                return Response(status_code=499)
+        return wrapped
+
+    def completion_text(prompt: str) -> str:
+        last_line = prompt.strip().splitlines()[-1]
+        if last_line.startswith('["'):  # 일괄 번역: 같은 개수의 JSON 배열로 응답
+            try:
+                return json.dumps([f"[stub] {item}" for item in json.loads(last_line)], ensure_ascii=False)
+            except json.JSONDecodeError:
+                pass
+        if completion_sentences > 0:
+            return " ".join(
+                f"This is generated sentence number {i + 1} of the stub translation output." for i in range(completion_sentences)
+            )
+        return f"[stub] {prompt.strip().splitlines()[-1][-200:]}"
+
+    async def chat_stream(model: str, text: str, include_usage: bool):
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+        def event(delta: dict, finish_reason=None) -> str:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        yield event({"role": "assistant", "content": ""})
+        for i, word in enumerate(text.split(" ")):
+            await asyncio.sleep(token_delay)
+            yield event({"content": word if i == 0 else f" {word}"})
+        yield event({}, "stop")
+        if include_usage:
+            words = len(text.split(" "))
+            usage = {"prompt_tokens": 0, "completion_tokens": words, "total_tokens": words}
+            yield f"data: {json.dumps({'id': completion_id, 'object': 'chat.completion.chunk', 'created': 0, 'model': model, 'choices': [], 'usage': usage})}\n\n"
+        yield "data: [DONE]\n\n"
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        prompt = body["messages"][-1]["content"]
+        text = completion_text(prompt)
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            return StreamingResponse(chat_stream(body.get("model", "stub"), text, include_usage), media_type="text/event-stream")
+        # 스트리밍이 아니면 전체 토큰 생성 시간만큼 기다린 뒤 한 번에 응답
+        await asyncio.sleep(token_delay * len(text.split(" ")))
+        return JSONResponse({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(prompt), "completion_tokens": 16, "total_tokens": len(prompt) + 16},
+        })
+
+    async def transcriptions(request: Request):
+        body = await request.body()
+        upload = len(body) * 8 / (upload_kbps * 1000) if upload_kbps > 0 else 0
+        await asyncio.sleep(latency + upload)
+        text = "안녕하세요. 벤치마크용 음성입니다."
+        if unique_transcripts:
+            nonlocal transcript_count
+            transcript_count += 1
+            text += f" ({transcript_count})"
+        return JSONResponse({"text": text})
+
+    async def speech(request: Request):
+        await request.body()
+        await asyncio.sleep(latency)
+        return Response(fake_mp3 * chunks, media_type="audio/mpeg")
+
+    async def voices_add(request: Request):
+        await request.body()
+        await asyncio.sleep(latency)
+        return JSONResponse({"voice_id": uuid.uuid4().hex[:20]})
+
+    async def voices_delete(request: Request):
+        return JSONResponse({"status": "ok"})
+
+    async def tts_stream(request: Request):
+        await request.body()
+        await asyncio.sleep(latency)
+
+        async def body():
+            for _ in range(chunks):
+                yield fake_mp3
+                await asyncio.sleep(chunk_delay)
+
+        return StreamingResponse(body(), media_type="audio/mpeg")
+
+    async def tts(request: Request):
+        await request.body()
+        await asyncio.sleep(latency + chunk_delay * chunks)
+        return Response(fake_mp3 * chunks, media_type="audio/mpeg")
+
+    return Starlette(routes=[
+        Route("/v1/chat/completions", faulty(chat_completions), methods=["POST"]),
+        Route("/v1/audio/transcriptions", faulty(transcriptions), methods=["POST"]),
+        Route("/v1/audio/speech", faulty(speech), methods=["POST"]),
+        Route("/v1/voices/add", faulty(voices_add), methods=["POST"]),
+        Route("/v1/voices/{voice_id}", faulty(voices_delete), methods=["DELETE"]),
+        Route("/v1/text-to-speech/{voice_id}/stream", faulty(tts_stream), methods=["POST"]),
+        Route("/v1/text-to-speech/{voice_id}", faulty(tts), methods=["POST"]),
+    ])
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--chunk-delay-ms", type=float, default=20)
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--token-delay-ms", type=float, default=0)
+    parser.add_argument("--completion-sentences", type=int, default=0)
+    parser.add_argument("--upload-kbps", type=float, default=0)
+    parser.add_argument("--unique-transcripts", action="store_true")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 상태로 응답할 요청 비율")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, help="오류 응답에 붙일 Retry-After (초)")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="응답 전에 오래 멈출 요청 비율")
+    parser.add_argument("--stall-ms", type=float, default=0)
+    parser.add_argument("--fault-seed", type=int, help="장애 주입 난수 시드 (재현용)")
+    parser.add_argument("--tls-cert", help="지정하면 HTTPS로 제공 (핸드셰이크 비용 측정용)")
+    parser.add_argument("--tls-key")
+    args = parser.parse_args()
+
+    app = create_app(
+        args.latency_ms,
+        args.chunk_delay_ms,
+        args.chunks,
+        token_delay_ms=args.token_delay_ms,
+        completion_sentences=args.completion_sentences,
+        upload_kbps=args.upload_kbps,
+        unique_transcripts=args.unique_transcripts,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        stall_rate=args.stall_rate,
+        stall_ms=args.stall_ms,
+        fault_seed=args.fault_seed,
+    )
+    scheme = "https" if args.tls_cert else "http"
+    print(json.dumps({"stub": f"{scheme}://127.0.0.1:{args.port}", "latency_ms": args.latency_ms}))
+    uvicorn.run(
+        app, host="127.0.0.1", port=args.port, log_level="warning",
+        ssl_certfile=args.tls_cert, ssl_keyfile=args.tls_key,
+    )
@@ -0,0 +1,57 @@
+"""
+첫 오디오 바이트까지의 시간(TTFB) 비교: 전체 번역 후 TTS(full) vs 문장 단위 파이프라인(sentence)
+
+긴 번역문일수록 full 모드는 "LLM 전체 생성 시간 + TTS 시작 시간"을 기다리고,
+sentence 모드는 "첫 문장 생성 시간 + TTS 시작 시간"만 기다립니다.
+  python -m benchmarks.ttfb --sentences 1 4 12 --token-delay-ms 30
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import make_auth_cookie, make_wav_bytes, percentile, run_app, run_stub
+
+
+async def measure(base_url: str, stream_mode: str, sample: bytes, repeat: int) -> dict:
+    ttfbs, totals = [], []
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, cookies=make_auth_cookie("ttfb")) as client:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            first = None
+            async with client.stream(
+                "POST",
+                "/api/generate-content",
+                data={"mode": "upload", "target_lang": "English", "stream_mode": stream_mode},
+                files={"audio": ("sample.wav", sample, "audio/wav")},
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    if first is None and chunk:
+                        first = time.perf_counter() - started
+            ttfbs.append(first)
+            totals.append(time.perf_counter() - started)
+    return {"ttfb_p50": percentile(ttfbs, 50), "total_p50": percentile(totals, 50)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, nargs="+", default=[1, 4, 12])
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--token-delay-ms", type=float, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sample = make_wav_bytes(1.0)
+    print(f"{'sentences':>9} {'mode':>9} {'TTFB p50(ms)':>13} {'total p50(ms)':>14}")
+    for n in args.sentences:
+        with run_stub(latency_ms=args.latency_ms, token_delay_ms=args.token_delay_ms, completion_sentences=n) as stub_url, \
+                run_app(stub_url) as (base_url, _):
+            for mode in ("full", "sentence"):
+                r = asyncio.run(measure(base_url, mode, sample, args.repeat))
+                print(f"{n:>9} {mode:>9} {r['ttfb_p50'] * 1000:>13.0f} {r['total_p50'] * 1000:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+TTS 디스크 캐시 적중/미스 지연 비교 (p50/p99, 첫 바이트와 전체)
+
+스텁 업스트림을 띄운 뒤 clone_service.generate_speech_stream 을 직접 호출합니다.
+  python -m benchmarks.tts_cache --phrases 20 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.common import percentile, run_stub
+
+
+async def _consume(stream) -> tuple[float, float]:
+    started = time.perf_counter()
+    first = None
+    async for chunk in stream:
+        if first is None and chunk:
+            first = time.perf_counter() - started
+    return first, time.perf_counter() - started
+
+
+async def run(phrases: int, repeat: int):
+    # 환경 변수를 설정한 뒤에 임포트해야 스텁 주소와 임시 캐시 디렉터리를 사용함
+    from app.services.audio_cache import audio_cache
+    from app.services.clone_service import generate_speech_stream
+
+    misses, hits = [], []
+    texts = [f"안녕하세요, 자주 쓰는 안내 문구 {i}번입니다." for i in range(phrases)]
+    for text in texts:
+        misses.append(await _consume(generate_speech_stream(text, "bench-voice")))
+    for _ in range(repeat):
+        for text in texts:
+            hits.append(await _consume(generate_speech_stream(text, "bench-voice")))
+
+    print(f"{'':>5} {'n':>5} {'TTFB p50':>9} {'TTFB p99':>9} {'total p50':>10} {'total p99':>10}  (ms)")
+    for name, samples in (("miss", misses), ("hit", hits)):
+        ttfb = [s[0] for s in samples]
+        total = [s[1] for s in samples]
+        print(
+            f"{name:>5} {len(samples):>5} {percentile(ttfb, 50) * 1000:>9.1f} {percentile(ttfb, 99) * 1000:>9.1f}"
+            f" {percentile(total, 50) * 1000:>10.1f} {percentile(total, 99) * 1000:>10.1f}"
+        )
+    print(audio_cache.stats())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--phrases", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    with run_stub(latency_ms=args.latency_ms) as stub_url, tempfile.TemporaryDirectory() as cache_dir:
+        os.environ.update({
+            "OPENAI_API_KEY": "sk-bench",
+            "ELEVENLABS_API_KEY": "xi-bench",
+            "ELEVENLABS_BASE_URL": stub_url,
+            "TTS_CACHE_DIR": cache_dir,
+        })
+        asyncio.run(run(args.phrases, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# python -m pytest 가 아닌 pytest 로 실행해도 app 패키지를 찾을 수 있도록 저장소 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
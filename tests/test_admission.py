@@ -0,0 +1,159 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from jose import jwt
+from starlette.responses import PlainTextResponse
+
+from app.dependencies import ALGORITHM, ISSUER, SECRET_KEY
+from app.services.admission import AdmissionController, AdmissionMiddleware, AdmissionRejected
+
+
+def test_per_user_limit_rejects_immediately():
+    async def run():
+        controller = AdmissionController(max_concurrent=10, queue_size=10, queue_timeout=1, per_user=2)
+        await controller.acquire("a")
+        await controller.acquire("a")
+        with pytest.raises(AdmissionRejected) as info:
+            await controller.acquire("a")
+        assert (info.value.status_code, info.value.reason) == (429, "user_limit")
+        assert info.value.retry_after >= 1
+        # 다른 사용자는 영향을 받지 않음
+        await controller.acquire("b")
+        controller.release("a", 0.1)
+        await controller.acquire("a")
+
+    asyncio.run(run())
+
+
+def test_queue_full_rejects_with_retry_after():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, queue_size=1, queue_timeout=5, per_user=0)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as info:
+            await controller.acquire("c")
+        assert (info.value.status_code, info.value.reason) == (503, "queue_full")
+        assert info.value.retry_after >= 1
+        controller.release("a", 0.1)
+        await waiting
+
+    asyncio.run(run())
+
+
+def test_queue_timeout_rejects_and_cleans_up():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, queue_size=5, queue_timeout=0.05, per_user=0)
+        await controller.acquire("a")
+        with pytest.raises(AdmissionRejected) as info:
+            await controller.acquire("b")
+        assert (info.value.status_code, info.value.reason) == (503, "timeout")
+        assert controller.stats()["waiting"] == 0
+        assert controller.stats()["users"] == 1
+
+    asyncio.run(run())
+
+
+def test_slots_are_handed_over_in_fifo_order():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, queue_size=5, queue_timeout=5, per_user=0)
+        order = []
+
+        async def request(user_id: str):
+            await controller.acquire(user_id)
+            order.append(user_id)
+
+        await controller.acquire("first")
+        tasks = [asyncio.create_task(request(name)) for name in ("b", "c", "d")]
+        await asyncio.sleep(0)
+        # 대기자가 있으면 새 요청이 자리를 가로채지 못함
+        assert (controller.stats()["running"], controller.stats()["waiting"]) == (1, 3)
+        for holder in ("first", "b", "c"):
+            controller.release(holder, 0.1)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert order == ["b", "c", "d"]
+        controller.release("d", 0.1)
+        assert controller.stats()["running"] == 0
+        assert controller.stats()["users"] == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_releases_its_place():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, queue_size=5, queue_timeout=5, per_user=0)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert controller.stats()["waiting"] == 0
+        controller.release("a", 0.1)
+        assert controller.stats()["running"] == 0
+        assert controller.stats()["users"] == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_after_handover_passes_slot_on():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, queue_size=5, queue_timeout=5, per_user=0)
+        await controller.acquire("a")
+        b = asyncio.create_task(controller.acquire("b"))
+        c = asyncio.create_task(controller.acquire("c"))
+        await asyncio.sleep(0)
+        # b에게 자리를 넘긴 직후 b가 깨어나기 전에 취소
+        controller.release("a", 0.1)
+        b.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await b
+        await c
+        assert controller.stats()["running"] == 1
+        controller.release("c", 0.1)
+        assert controller.stats()["running"] == 0
+
+    asyncio.run(run())
+
+
+def test_retry_after_follows_service_time_and_queue_depth():
+    async def run():
+        controller = AdmissionController(max_concurrent=2, queue_size=5, queue_timeout=5, per_user=0)
+        before = controller.retry_after(10)
+        for _ in range(10):
+            await controller.acquire("a")
+            controller.release("a", 10.0)
+        assert controller.retry_after(10) > before
+        assert controller.retry_after(9) > controller.retry_after(1)
+        assert controller.retry_after(0) >= 1
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("path", ["/api/generate-content", "/api/batch", "/api/voice-sample", "/stt/", "/tts/"])
+def test_middleware_limits_upstream_routes(path):
+    async def app(scope, receive, send):
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    async def run():
+        controller = AdmissionController(max_concurrent=4, queue_size=4, queue_timeout=1, per_user=1)
+        transport = httpx.ASGITransport(app=AdmissionMiddleware(app, controller))
+        cookies = {"ACCESS_TOKEN": jwt.encode(
+            {"sub": "42", "username": "tester", "iss": ISSUER, "exp": int(time.time()) + 60}, SECRET_KEY, algorithm=ALGORITHM
+        )}
+        async with httpx.AsyncClient(transport=transport, base_url="http://app", cookies=cookies) as client:
+            assert (await client.post(path)).status_code == 200
+            assert controller.stats()["running"] == 0
+            await controller.acquire("42")
+            response = await client.post(path)
+            assert response.status_code == 429
+            assert response.json()["reason"] == "user_limit"
+            assert "retry-after" in response.headers
+            # GET과 제한 대상이 아닌 경로는 그대로 통과
+            assert (await client.get(path)).status_code == 200
+            assert (await client.post("/api/jobs/x")).status_code == 200
+
+    asyncio.run(run())
@@ -0,0 +1,281 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import generator
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import PRIORITIES, JobQueue, QueueFull
+from app.services.resilience import UpstreamError
+from app.services.translation_service import TranslationResult
+
+
+def _events(job) -> list[str]:
+    return [event["event"] for event in job.events]
+
+
+async def _wait(job, timeout: float = 2.0):
+    async with asyncio.timeout(timeout):
+        while not job.done:
+            await job.wait_update(0.05)
+
+
+def test_runs_by_priority_then_submission_order(tmp_path):
+    async def run():
+        queue = JobQueue(workers=1, audio_dir=str(tmp_path))
+        queue.start()
+        order, gate = [], asyncio.Event()
+
+        def runner(name):
+            async def run_job(job):
+                if name == "blocker":
+                    await gate.wait()
+                order.append(name)
+            return run_job
+
+        try:
+            blocker = queue.submit("u", runner("blocker"))
+            await asyncio.sleep(0)
+            jobs = [
+                queue.submit("u", runner("low"), PRIORITIES["low"]),
+                queue.submit("u", runner("normal-1")),
+                queue.submit("u", runner("high"), PRIORITIES["high"]),
+                queue.submit("u", runner("normal-2")),
+            ]
+            assert queue.position(blocker) is None  # 이미 실행 중
+            assert [queue.position(job) for job in jobs] == [3, 1, 0, 2]
+            gate.set()
+            for job in jobs:
+                await _wait(job)
+        finally:
+            await queue.stop()
+        assert order == ["blocker", "high", "normal-1", "normal-2", "low"]
+
+    asyncio.run(run())
+
+
+def test_follow_replays_events_in_order(tmp_path):
+    async def run():
+        queue = JobQueue(workers=1, audio_dir=str(tmp_path))
+        queue.start()
+
+        async def runner(job):
+            job.report("stt_done", source_text="a")
+            await asyncio.sleep(0.01)
+            job.report("translated", translated_text="b")
+
+        try:
+            job = queue.submit("u", runner)
+            live = [event["event"] async for event in queue.follow(job, heartbeat=5)]
+            replay = [event["event"] async for event in queue.follow(job, heartbeat=5)]
+        finally:
+            await queue.stop()
+        assert live == replay == ["queued", "started", "stt_done", "translated", "done"]
+        assert job.result["source_text"] == "a" and job.result["translated_text"] == "b"
+        assert "timings" in job.result
+
+    asyncio.run(run())
+
+
+def test_follow_sends_heartbeat_while_idle(tmp_path):
+    async def run():
+        queue = JobQueue(workers=1, audio_dir=str(tmp_path))
+        queue.start()
+        gate = asyncio.Event()
+
+        async def runner(job):
+            await gate.wait()
+
+        try:
+            job = queue.submit("u", runner)
+            seen = []
+            async for event in queue.follow(job, heartbeat=0.02):
+                seen.append(None if event is None else event["event"])
+                if event is None:
+                    gate.set()
+        finally:
+            await queue.stop()
+        assert seen[:2] == ["queued", "started"]
+        assert None in seen
+        assert seen[-1] == "done"
+
+    asyncio.run(run())
+
+
+def test_failure_is_reported_with_detail(tmp_path):
+    async def run():
+        queue = JobQueue(workers=1, audio_dir=str(tmp_path))
+        queue.start()
+
+        async def runner(job):
+            raise HTTPException(status_code=400, detail="잘못된 요청")
+
+        try:
+            job = queue.submit("u", runner)
+            await _wait(job)
+        finally:
+            await queue.stop()
+        assert job.status == "failed"
+        assert job.error == "잘못된 요청"
+        assert (job.events[-1]["event"], job.events[-1]["error"]) == ("failed", "잘못된 요청")
+
+    asyncio.run(run())
+
+
+def test_stop_fails_running_job(tmp_path):
+    async def run():
+        queue = JobQueue(workers=1, audio_dir=str(tmp_path))
+        queue.start()
+
+        async def runner(job):
+            await asyncio.sleep(10)
+
+        job = queue.submit("u", runner)
+        await asyncio.sleep(0.01)
+        assert job.status == "running"
+        await queue.stop()
+        assert job.status == "failed"
+        assert _events(job) == ["queued", "started", "failed"]
+        assert job.finished is not None
+
+    asyncio.run(run())
+
+
+def test_rejects_when_full_and_hides_other_users_jobs(tmp_path):
+    async def run():
+        queue = JobQueue(workers=1, max_pending=1, audio_dir=str(tmp_path))
+        queue.start()
+        gate = asyncio.Event()
+
+        async def runner(job):
+            await gate.wait()
+
+        try:
+            running = queue.submit("u", runner)
+            await asyncio.sleep(0)
+            queue.submit("u", runner)
+            with pytest.raises(QueueFull):
+                queue.submit("u", runner)
+            assert queue.get(running.id, "u") is running
+            assert queue.get(running.id, "someone-else") is None
+            gate.set()
+        finally:
+            await queue.stop()
+
+    asyncio.run(run())
+
+
+def test_finished_jobs_expire_with_their_audio(tmp_path):
+    async def run():
+        queue = JobQueue(workers=1, ttl=0, audio_dir=str(tmp_path))
+        queue.start()
+
+        async def runner(job):
+            job.audio_path = queue.audio_path(job)
+            with open(job.audio_path, "wb") as f:
+                f.write(b"mp3")
+
+        try:
+            job = queue.submit("u", runner)
+            await _wait(job)
+            assert os.path.exists(job.audio_path)
+            queue.submit("u", runner)  # 접수할 때 만료된 작업을 정리
+            await asyncio.sleep(0.05)
+        finally:
+            await queue.stop()
+        assert queue.get(job.id, "u") is None
+        assert not os.path.exists(job.audio_path)
+
+    asyncio.run(run())
+
+
+def test_start_removes_only_dead_workers_dirs(tmp_path, monkeypatch):
+    dead, alive, other = tmp_path / "999999", tmp_path / "12345", tmp_path / "keep"
+    for path in (dead, alive, other):
+        path.mkdir()
+    monkeypatch.setattr(job_queue_module, "_process_alive", lambda pid: pid == 12345)
+
+    async def run():
+        queue = JobQueue(workers=1, audio_dir=str(tmp_path))
+        queue.start()
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(run())
+    assert not dead.exists()
+    assert alive.exists() and other.exists()
+    assert queue.audio_dir == str(tmp_path / str(os.getpid()))
+
+
+@pytest.fixture
+def generate_job(tmp_path, monkeypatch):
+    """generate-content job 실행부(_run_generate_job)의 업스트림 호출을 모두 스텁으로 바꿈"""
+    queue = JobQueue(workers=1, audio_dir=str(tmp_path))
+    stubs = {"back_translate": "안녕하세요"}
+
+    async def prepare_source(*args):
+        return "안녕하세요", None
+
+    async def translate(text, target_lang, glossary, domain="none"):
+        return TranslationResult(text="Hello")
+
+    async def back_translate(text, target_lang):
+        await asyncio.sleep(0.01)
+        if isinstance(stubs["back_translate"], Exception):
+            raise stubs["back_translate"]
+        return stubs["back_translate"]
+
+    async def voice_id(user_id, speaker_ref):
+        return "voice"
+
+    async def speech(text, voice_id):
+        yield b"mp3-1"
+        yield b"mp3-2"
+
+    monkeypatch.setattr(generator, "job_queue", queue)
+    monkeypatch.setattr(generator, "_prepare_source", prepare_source)
+    monkeypatch.setattr(generator, "find_domain_entries", lambda domain, text: [])
+    monkeypatch.setattr(generator, "translate", translate)
+    monkeypatch.setattr(generator, "back_translate", back_translate)
+    monkeypatch.setattr(generator, "get_or_create_voice_id", voice_id)
+    monkeypatch.setattr(generator, "generate_speech_stream", speech)
+    monkeypatch.setattr(generator, "_release_upload", lambda user_id, path: None)
+
+    async def run():
+        queue.start()
+        try:
+            job = queue.submit("u", lambda job: generator._run_generate_job(
+                job, "text", "English", "none", "안녕하세요", None, None, None
+            ))
+            events = [event async for event in queue.follow(job, heartbeat=5)]
+        finally:
+            await queue.stop()
+        return job, events
+
+    return stubs, run
+
+
+def test_generate_job_emits_stages_in_order(generate_job):
+    stubs, run = generate_job
+    job, events = asyncio.run(run())
+
+    assert [event["event"] for event in events] == [
+        "queued", "started", "stt_done", "translated", "audio_ready", "back_translated", "done",
+    ]
+    assert job.result["translated_text"] == "Hello"
+    assert job.result["back_translated_text"] == "안녕하세요"
+    assert job.result["audio_bytes"] == len(b"mp3-1mp3-2")
+    with open(job.audio_path, "rb") as f:
+        assert f.read() == b"mp3-1mp3-2"
+
+
+def test_generate_job_survives_back_translation_failure(generate_job):
+    stubs, run = generate_job
+    stubs["back_translate"] = UpstreamError("openai", "503 unavailable", status_code=503)
+    job, events = asyncio.run(run())
+
+    assert job.status == "done"
+    assert events[-2]["event"] == "back_translated"
+    assert events[-2]["back_translated_text"] is None
+    assert "503" in events[-2]["back_translated_text_error"]
@@ -0,0 +1,115 @@
+import os
+
+from app.services.knowledge_service import KnowledgeIndex, find_domain_entries, parse_csv, parse_txt
+from app.utils.aho_corasick import AhoCorasick
+
+
+def _matches(patterns: list[str], text: str) -> list[tuple[int, int, str]]:
+    matcher = AhoCorasick()
+    for pattern in patterns:
+        matcher.add(pattern, pattern)
+    return list(matcher.iter_matches(text))
+
+
+def test_aho_corasick_reports_overlapping_and_suffix_matches():
+    assert _matches(["he", "she", "his", "hers"], "ushers") == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+    assert _matches(["a", "aa"], "aaa") == [(0, 1, "a"), (0, 2, "aa"), (1, 2, "a"), (1, 3, "aa"), (2, 3, "a")]
+    assert _matches(["트랜잭션", "잭"], "분산 트랜잭션") == [(5, 6, "잭"), (3, 7, "트랜잭션")]
+    assert _matches(["abc"], "xyz") == []
+
+
+def test_aho_corasick_rebuilds_after_add():
+    matcher = AhoCorasick()
+    matcher.add("", "ignored")
+    matcher.add("cat", 1)
+    assert [value for _, _, value in matcher.iter_matches("cat dog")] == [1]
+    matcher.add("dog", 2)
+    assert [value for _, _, value in matcher.iter_matches("cat dog")] == [1, 2]
+    assert len(matcher) == 2
+
+
+GLOSSARY = """용어,설명
+ACID,트랜잭션의 네 가지 성질
+RAG (Retrieval-Augmented Generation),검색 증강 생성
+더티 리드,커밋되지 않은 데이터를 읽는 현상
+커밋(COMMIT),"트랜잭션 확정, 되돌릴 수 없음"
+"""
+
+
+def _index(tmp_path) -> KnowledgeIndex:
+    (tmp_path / "db.csv").write_text(GLOSSARY, encoding="utf-8")
+    index = KnowledgeIndex(str(tmp_path))
+    index.reload(force=True)
+    return index
+
+
+def _terms(index: KnowledgeIndex, text: str) -> list[str]:
+    return [entry.term for entry in index.lookup("db", text)]
+
+
+def test_ascii_terms_match_only_on_word_boundaries(tmp_path):
+    index = _index(tmp_path)
+    assert _terms(index, "a placid lake") == []
+    assert _terms(index, "ACIDS are not ACID-compliant") == ["ACID"]
+    assert _terms(index, "(acid)") == ["ACID"]
+    assert _terms(index, "acid123") == []
+
+
+def test_korean_text_around_ascii_terms_is_a_boundary(tmp_path):
+    index = _index(tmp_path)
+    # 한글 조사가 바로 붙어도 영문 용어는 인정
+    assert _terms(index, "ACID를 보장하고 RAG로 답합니다") == ["ACID", "RAG (Retrieval-Augmented Generation)"]
+    # 한글 용어는 단어 경계를 따지지 않음 (조사/어미가 붙는 경우가 대부분)
+    assert _terms(index, "커밋을 하기 전에") == ["커밋(COMMIT)"]
+
+
+def test_aliases_spacing_and_case(tmp_path):
+    index = _index(tmp_path)
+    assert _terms(index, "retrieval-augmented   generation") == ["RAG (Retrieval-Augmented Generation)"]
+    assert _terms(index, "commit 후에는") == ["커밋(COMMIT)"]
+    assert _terms(index, "더티리드가 생기면") == ["더티 리드"]
+    assert _terms(index, "더티\n리드") == ["더티 리드"]
+
+
+def test_returns_each_entry_once_in_first_appearance_order(tmp_path):
+    index = _index(tmp_path)
+    assert _terms(index, "커밋 전에 더티 리드, 그리고 다시 커밋과 ACID") == ["커밋(COMMIT)", "더티 리드", "ACID"]
+    assert _terms(index, "") == []
+    assert index.lookup("unknown", "ACID") == []
+
+
+def test_parsers():
+    entries = parse_csv(GLOSSARY)
+    assert [entry.term for entry in entries] == ["ACID", "RAG (Retrieval-Augmented Generation)", "더티 리드", "커밋(COMMIT)"]
+    assert entries[3].definition == "트랜잭션 확정, 되돌릴 수 없음"
+    assert entries[3].aliases == ["커밋(commit)", "커밋", "commit"]
+
+    entries = parse_txt("인덱스:\n검색을 빠르게 하는\n자료 구조\n\n잘못된 블록\n\n뷰:\n가상 테이블\n")
+    assert [(entry.term, entry.definition) for entry in entries] == [("인덱스", "검색을 빠르게 하는 자료 구조"), ("뷰", "가상 테이블")]
+
+
+def test_reload_picks_up_changed_added_and_removed_files(tmp_path):
+    index = _index(tmp_path)
+    (tmp_path / "web.txt").write_text("쿠키:\n브라우저 저장소\n", encoding="utf-8")
+    path = tmp_path / "db.csv"
+    path.write_text("용어,설명\nMVCC,다중 버전 동시성 제어\n", encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    index.reload()
+    assert index.domains == ["db", "web"]
+    assert _terms(index, "MVCC와 ACID") == ["MVCC"]
+
+    path.unlink()
+    index.reload()
+    assert index.domains == ["web"]
+
+
+def test_lookup_indexes_on_first_use_without_start(tmp_path):
+    (tmp_path / "db.csv").write_text(GLOSSARY, encoding="utf-8")
+    assert _terms(KnowledgeIndex(str(tmp_path)), "ACID") == ["ACID"]
+
+
+def test_find_domain_entries_skips_none_domain():
+    assert find_domain_entries("none", "ACID") == []
+    assert find_domain_entries("", "ACID") == []
@@ -0,0 +1,135 @@
+import json
+
+import pytest
+
+from app.services import prompt_builder
+from app.services.knowledge_service import GlossaryEntry
+from app.services.prompt_builder import (
+    SYSTEM_PROMPT,
+    build_back_translation_prompt,
+    build_batch_translation_prompt,
+    build_translation_prompt,
+    count_tokens,
+)
+
+
+class ByteEncoding:
+    """UTF-8 바이트 하나를 토큰 하나로 보는 인코더 (tiktoken처럼 한글 한 글자가 여러 토큰으로 나뉨)"""
+
+    def encode(self, text: str, disallowed_special=()) -> list[int]:
+        return list(text.encode("utf-8"))
+
+    def decode(self, tokens: list[int], errors: str = "replace") -> str:
+        return bytes(tokens).decode("utf-8", errors=errors)
+
+
+@pytest.fixture(params=["bytes", "estimate"], autouse=True)
+def encoding(request, monkeypatch):
+    # tiktoken BPE 파일 없이도 두 경로(인코더 / 바이트 길이 근사치)를 모두 확인
+    encoder = ByteEncoding() if request.param == "bytes" else None
+    monkeypatch.setattr(prompt_builder, "get_encoding", lambda: encoder)
+    prompt_builder._static_tokens.cache_clear()
+    yield request.param
+    prompt_builder._static_tokens.cache_clear()
+
+
+def _entries(count: int) -> list[GlossaryEntry]:
+    return [GlossaryEntry(f"용어{i}", f"용어{i}에 대한 꽤 긴 설명 문장입니다 " * 3) for i in range(count)]
+
+
+def _message_tokens(prompt) -> int:
+    return sum(count_tokens(message["content"]) + 4 for message in prompt.messages)
+
+
+def _assert_within(prompt, budget: int, encoding: str):
+    assert prompt.prompt_tokens <= budget
+    if encoding == "bytes":
+        # 바이트 인코더는 조각별 토큰 수의 합이 전체와 같으므로 실제 메시지로도 확인
+        assert _message_tokens(prompt) == prompt.prompt_tokens
+
+
+def test_short_source_fits_untouched():
+    prompt = build_translation_prompt("안녕하세요", "English", _entries(2), budget=4000)
+
+    assert prompt.messages[0] == {"role": "system", "content": SYSTEM_PROMPT}
+    assert prompt.messages[1]["content"].endswith("English 언어로 번역해줘.\n안녕하세요")
+    assert prompt.messages[1]["content"].startswith("[전문 용어 사전]\n- 용어0:")
+    assert not prompt.source_truncated
+    assert prompt.glossary_used == ["용어0", "용어1"] and prompt.glossary_dropped == []
+    assert prompt.max_completion_tokens == count_tokens("안녕하세요") * 2 + 64
+
+
+def test_system_message_does_not_depend_on_request():
+    first = build_translation_prompt("안녕", "English", _entries(1))
+    second = build_translation_prompt("다른 문장", "Japanese")
+    assert first.messages[0] == second.messages[0]
+
+
+def test_long_source_is_truncated_to_budget(encoding):
+    source = "가나다라마바사 아자차카타파하. " * 300
+    prompt = build_translation_prompt(source, "English", _entries(3), budget=500)
+
+    assert prompt.source_truncated
+    assert prompt.glossary_used == []
+    assert prompt.glossary_dropped == ["용어0", "용어1", "용어2"]
+    _assert_within(prompt, 500, encoding)
+    kept = prompt.messages[1]["content"].split("번역해줘.\n", 1)[1]
+    assert source.startswith(kept)
+    assert "�" not in kept
+
+
+def test_glossary_fills_remaining_budget_in_order():
+    entries = _entries(50)
+    prompt = build_translation_prompt("짧은 문장", "English", entries, budget=4000)
+
+    assert 0 < len(prompt.glossary_used) < 50
+    assert prompt.glossary_used == [entry.term for entry in entries[:len(prompt.glossary_used)]]
+    assert prompt.glossary_dropped == [entry.term for entry in entries[len(prompt.glossary_used):]]
+    glossary = prompt.messages[1]["content"].split("\n\n", 1)[0]
+    assert count_tokens(glossary) <= prompt_builder.GLOSSARY_TOKEN_BUDGET
+
+
+def test_glossary_uses_only_what_the_source_leaves(encoding):
+    source = "가" * 350
+    # 시스템 지시와 원문을 넣고 용어 몇 개만 들어갈 정도의 예산
+    budget = count_tokens(SYSTEM_PROMPT) + count_tokens(source) + 300
+    prompt = build_translation_prompt(source, "English", _entries(50), budget=budget)
+
+    assert not prompt.source_truncated
+    assert prompt.glossary_used and prompt.glossary_dropped
+    _assert_within(prompt, budget, encoding)
+
+
+def test_smaller_entry_after_dropped_one_still_fits():
+    entries = [GlossaryEntry("긴 용어", "설명 " * 400), GlossaryEntry("짧은 용어", "짧은 설명")]
+    prompt = build_translation_prompt("문장", "English", entries, budget=4000)
+    assert prompt.glossary_used == ["짧은 용어"]
+    assert prompt.glossary_dropped == ["긴 용어"]
+
+
+def test_completion_budget_is_capped(monkeypatch):
+    monkeypatch.setattr(prompt_builder, "MAX_COMPLETION_TOKENS", 100)
+    assert build_translation_prompt("가" * 1000, "English").max_completion_tokens == 100
+
+
+def test_back_translation_prompt_truncates(encoding):
+    prompt = build_back_translation_prompt("Hello world. " * 500, budget=300)
+    assert prompt.source_truncated
+    _assert_within(prompt, 300, encoding)
+
+
+def test_batch_prompt_keeps_sources_and_trims_glossary():
+    sources = [f"{i}번째 안내 방송 문장입니다." for i in range(10)]
+    prompt = build_batch_translation_prompt(sources, "English", _entries(50))
+
+    assert json.loads(prompt.messages[1]["content"].rsplit("\n", 1)[1]) == sources
+    assert prompt.glossary_used and prompt.glossary_dropped
+    assert len(prompt.glossary_used) + len(prompt.glossary_dropped) == 50
+    assert prompt.prompt_tokens == _message_tokens(prompt)
+
+
+def test_truncation_never_splits_a_character():
+    for max_tokens in range(1, 10):
+        kept = prompt_builder.truncate_to_tokens("가나다", max_tokens)
+        assert "가나다".startswith(kept)
+        assert count_tokens(kept) <= max_tokens
@@ -0,0 +1,218 @@
+import asyncio
+import itertools
+import time
+
+import httpx
+import pytest
+
+from app.services.resilience import (
+    CircuitBreaker,
+    ResilientTransport,
+    RetryPolicy,
+    UpstreamError,
+    UpstreamUnavailable,
+    as_upstream_error,
+    deadline,
+    parse_retry_after,
+    upstream_errors,
+)
+
+_names = itertools.count()
+
+
+def _transport(handler, **policy) -> ResilientTransport:
+    # 회로 차단기는 업스트림 이름별로 공유되므로 테스트마다 새 이름을 씀
+    policy = {"backoff_base": 0.001, "backoff_max": 0.001, "idempotent_paths": ("/idem",), **policy}
+    return ResilientTransport(f"test-{next(_names)}", httpx.MockTransport(handler), RetryPolicy(**policy))
+
+
+def _send(transport: ResilientTransport, method: str = "POST", path: str = "/idem") -> httpx.Response:
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+            return await client.request(method, path)
+    return asyncio.run(run())
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert 0 < parse_retry_after(time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 60))) <= 60
+
+
+def test_upstream_error_status():
+    assert UpstreamError("openai", "x", status_code=503).http_status == 503
+    assert UpstreamError("openai", "x", status_code=429).http_status == 503
+    assert UpstreamError("openai", "x", status_code=400).http_status == 502
+    assert UpstreamError("openai", "x", status_code=500, retry_after=1).http_status == 503
+    assert UpstreamUnavailable("openai", "x").http_status == 503
+
+
+def test_upstream_errors_maps_transport_errors_only():
+    with pytest.raises(UpstreamUnavailable):
+        with upstream_errors("openai"):
+            raise httpx.ConnectError("refused")
+    with pytest.raises(KeyError):
+        with upstream_errors("openai"):
+            raise KeyError("not an upstream error")
+    cause = UpstreamError("openai", "inner")
+    wrapped = RuntimeError("wrapped")
+    wrapped.__cause__ = cause
+    assert as_upstream_error(wrapped, "openai") is cause
+
+
+def test_retries_idempotent_request_until_success():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503 if len(calls) < 3 else 200)
+
+    assert _send(_transport(handler, max_attempts=3)).status_code == 200
+    assert len(calls) == 3
+
+
+def test_gives_up_and_returns_last_response():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502, text="bad gateway")
+
+    response = _send(_transport(handler, max_attempts=2))
+    assert response.status_code == 502
+    assert len(calls) == 2
+
+
+def test_non_idempotent_request_is_not_retried_on_5xx_but_is_on_429():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    assert _send(_transport(handler, max_attempts=3), path="/voices/add").status_code == 500
+    assert len(calls) == 1
+
+    statuses = iter([429, 200])
+    assert _send(_transport(lambda request: httpx.Response(next(statuses)), max_attempts=3), path="/voices/add").status_code == 200
+
+
+def test_non_idempotent_request_retried_only_when_not_sent():
+    attempts = []
+
+    def refused(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200)
+
+    assert _send(_transport(refused, max_attempts=3), path="/voices/add").status_code == 200
+
+    def read_error(request):
+        raise httpx.ReadError("reset")
+
+    with pytest.raises(UpstreamUnavailable):
+        _send(_transport(read_error, max_attempts=3), path="/voices/add")
+
+
+def test_retry_after_longer_than_deadline_is_not_waited():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503, headers={"Retry-After": "30"})
+
+    started = time.monotonic()
+    response = _send(_transport(handler, max_attempts=3, deadline=1.0))
+    assert response.status_code == 503
+    assert len(calls) == 1
+    assert time.monotonic() - started < 1.0
+
+
+def test_outer_deadline_applies():
+    async def slow(request):
+        await asyncio.sleep(0.2)
+        return httpx.Response(200)
+
+    transport = _transport(slow)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+            with deadline(0.0):
+                await client.post("/idem")
+
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(run())
+
+
+def test_circuit_opens_then_half_opens():
+    breaker = CircuitBreaker("test-breaker", threshold=2, reset_timeout=0.05)
+    breaker.acquire()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(UpstreamUnavailable) as info:
+        breaker.acquire()
+    assert info.value.retry_after >= 1.0
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    breaker.acquire()  # 시험 호출 하나만 허용
+    with pytest.raises(UpstreamUnavailable):
+        breaker.acquire()
+    breaker.record_failure()  # 시험 호출 실패 → 다시 open
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_open_circuit_fails_fast_without_calling_upstream():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    transport = _transport(handler, max_attempts=1)
+    transport.breaker.threshold = 2
+    transport.breaker.reset_timeout = 60
+    _send(transport)
+    _send(transport)
+    with pytest.raises(UpstreamUnavailable):
+        _send(transport)
+    assert len(calls) == 2
+
+
+def test_hedge_returns_faster_second_response():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(1.0)
+            return httpx.Response(200, text="slow")
+        return httpx.Response(200, text="fast")
+
+    started = time.monotonic()
+    response = _send(_transport(handler, hedge_after=0.05))
+    assert response.text == "fast"
+    assert len(calls) == 2
+    assert time.monotonic() - started < 0.5
+
+
+def test_no_hedge_for_non_idempotent_request():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.1)
+        return httpx.Response(200)
+
+    _send(_transport(handler, hedge_after=0.01), path="/voices/add")
+    assert len(calls) == 1
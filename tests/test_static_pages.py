@@ -0,0 +1,149 @@
+import asyncio
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.utils import static_pages
+from app.utils.static_pages import StaticPageCache
+
+BODY = "<html><body>" + "안녕하세요 " * 200 + "</body></html>"
+
+
+@pytest.fixture
+def page_dir(tmp_path):
+    (tmp_path / "index.html").write_text(BODY, encoding="utf-8")
+    (tmp_path / "tiny.html").write_text("<p>", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def cache(page_dir):
+    cache = StaticPageCache(str(page_dir), ["index.html", "tiny.html", "missing.html"], check_interval=0.01)
+    cache.reload(force=True)
+    return cache
+
+
+@pytest.fixture
+def client(cache):
+    app = FastAPI()
+
+    @app.get("/{name}")
+    def page(request: Request, name: str):
+        return cache.response(request, name)
+
+    return TestClient(app)
+
+
+def _get(client: TestClient, name: str = "index.html", encoding: str = "identity", **headers):
+    return client.get(f"/{name}", headers={"Accept-Encoding": encoding, **headers})
+
+
+def test_serves_identity_with_validators(client, cache):
+    response = _get(client)
+    assert response.status_code == 200
+    assert response.text == BODY
+    assert response.headers["content-type"] == "text/html; charset=utf-8"
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == f'"{cache.get("index.html").etag}"'
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert "last-modified" in response.headers
+
+
+def test_serves_precompressed_gzip(client, cache):
+    response = _get(client, encoding="gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == f'"{cache.get("index.html").etag}-gzip"'
+    assert gzip.decompress(cache.get("index.html").variants["gzip"]).decode() == BODY
+    assert response.text == BODY
+
+
+def test_respects_zero_quality(client):
+    response = _get(client, encoding="gzip;q=0, identity")
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.skipif(static_pages.brotli is None, reason="brotli가 설치되어 있지 않음")
+def test_prefers_brotli(client, cache):
+    response = _get(client, encoding="gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["etag"] == f'"{cache.get("index.html").etag}-br"'
+
+
+def test_skips_compression_that_does_not_shrink(client, cache):
+    assert set(cache.get("tiny.html").variants) == {"identity"}
+    assert "content-encoding" not in _get(client, "tiny.html", encoding="gzip").headers
+
+
+def test_if_none_match_returns_304_for_any_encoding(client):
+    identity_etag = _get(client).headers["etag"]
+    gzip_etag = _get(client, encoding="gzip").headers["etag"]
+
+    for etag in (identity_etag, gzip_etag, f"W/{gzip_etag}", '"other", ' + identity_etag, "*"):
+        response = _get(client, encoding="gzip", **{"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == gzip_etag
+    assert _get(client, **{"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_if_modified_since(client):
+    last_modified = _get(client).headers["last-modified"]
+    assert _get(client, **{"If-Modified-Since": last_modified}).status_code == 304
+    assert _get(client, **{"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"}).status_code == 200
+    assert _get(client, **{"If-Modified-Since": "garbage"}).status_code == 200
+
+
+def test_missing_page_is_404(client):
+    assert _get(client, "missing.html").status_code == 404
+    assert _get(client, "unlisted.html").status_code == 404
+
+
+def _change(page_dir, text: str):
+    path = page_dir / "index.html"
+    path.write_text(text, encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def test_get_does_not_touch_files(cache, page_dir, monkeypatch):
+    # 요청 처리(get) 중에는 stat/압축을 하지 않고 마지막으로 읽어 둔 페이지를 씀
+    monkeypatch.setattr(static_pages, "_build", lambda *args: pytest.fail("rebuilt on the request path"))
+    _change(page_dir, "<html>changed</html>")
+    assert cache.get("index.html").variants["identity"] == BODY.encode()
+
+
+def test_reloads_changed_page(client, cache, page_dir):
+    old_etag = _get(client).headers["etag"]
+    _change(page_dir, "<html>changed</html>")
+    cache.reload()
+
+    response = _get(client, **{"If-None-Match": old_etag})
+    assert response.status_code == 200
+    assert response.text == "<html>changed</html>"
+    assert response.headers["etag"] != old_etag
+    assert cache.stats()["pages"] == 2
+
+
+def test_background_task_picks_up_changes(cache, page_dir):
+    async def run():
+        cache.start()
+        try:
+            _change(page_dir, "<html>changed in background</html>")
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if cache.get("index.html").variants["identity"] != BODY.encode():
+                    break
+        finally:
+            await cache.stop()
+
+    asyncio.run(run())
+    assert cache.get("index.html").variants["identity"] == b"<html>changed in background</html>"
+
+
+def test_loads_on_first_use_without_start(page_dir):
+    cache = StaticPageCache(str(page_dir), ["index.html"])
+    assert cache.get("index.html").variants["identity"] == BODY.encode()
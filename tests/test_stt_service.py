@@ -0,0 +1,97 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services import stt_preprocess, stt_service
+from app.services.resilience import UpstreamError
+from app.utils.audio_decode import SAMPLE_RATE
+
+
+def _speech(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+
+
+def test_transcribe_chunks_counts_uploaded_bytes(monkeypatch):
+    uploads = []
+
+    async def fake_api(audio_bytes: bytes, filename: str) -> str:
+        uploads.append(len(audio_bytes))
+        return f"part{len(uploads)}"
+
+    monkeypatch.setattr(stt_service, "STT_BACKEND", "api")
+    monkeypatch.setattr(stt_service, "transcribe_with_api", fake_api)
+    pcm = _speech(3.0)
+    chunks = [(0, SAMPLE_RATE, False), (SAMPLE_RATE, 2 * SAMPLE_RATE, False), (2 * SAMPLE_RATE, len(pcm), False)]
+    before = stt_preprocess.upload_stats["bytes_uploaded"]
+
+    text = asyncio.run(stt_service.transcribe_chunks(pcm, chunks))
+
+    assert sorted(text.split()) == ["part1", "part2", "part3"]
+    assert len(uploads) == 3
+    assert stt_preprocess.upload_stats["bytes_uploaded"] - before == sum(uploads)
+
+
+def _stub_chunks(monkeypatch, delays: list[float], fail_at: int | None = None) -> dict:
+    # 구간 i의 PCM을 모두 i로 채우고, 인코딩 결과의 첫 바이트로 어느 구간인지 알아냄
+    state = {"running": 0, "peak": 0, "cancelled": 0}
+
+    async def fake_api(audio_bytes: bytes, filename: str) -> str:
+        index = audio_bytes[0]
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await asyncio.sleep(delays[index])
+            if index == fail_at:
+                raise UpstreamError("openai", "boom", status_code=503)
+            return f"w{index}"
+        except asyncio.CancelledError:
+            state["cancelled"] += 1
+            raise
+        finally:
+            state["running"] -= 1
+
+    monkeypatch.setattr(stt_service, "STT_BACKEND", "api")
+    monkeypatch.setattr(stt_service, "encode_for_upload", lambda pcm: (bytes([int(pcm[0])]), "audio.wav"))
+    monkeypatch.setattr(stt_service, "transcribe_with_api", fake_api)
+    return state
+
+
+def _numbered_pcm(count: int, size: int = 100) -> tuple[np.ndarray, list[tuple[int, int, bool]]]:
+    pcm = np.repeat(np.arange(count, dtype=np.int16), size)
+    return pcm, [(i * size, (i + 1) * size, False) for i in range(count)]
+
+
+def test_transcribe_chunks_keeps_order_and_bounds_parallelism(monkeypatch):
+    # 뒤 구간일수록 먼저 끝나도 결과는 원래 순서대로 이어 붙여야 함
+    state = _stub_chunks(monkeypatch, delays=[0.06, 0.05, 0.04, 0.03, 0.02, 0.01])
+    monkeypatch.setattr(stt_service, "STT_CHUNK_CONCURRENCY", 2)
+    pcm, chunks = _numbered_pcm(6)
+
+    assert asyncio.run(stt_service.transcribe_chunks(pcm, chunks)) == "w0 w1 w2 w3 w4 w5"
+    assert state["peak"] == 2
+
+
+def test_transcribe_chunks_joins_overlapping_parts(monkeypatch):
+    monkeypatch.setattr(stt_service, "STT_BACKEND", "api")
+    monkeypatch.setattr(stt_service, "encode_for_upload", lambda pcm: (bytes([int(pcm[0])]), "audio.wav"))
+    parts = ["오늘은 날씨가 정말", "날씨가 정말 좋네요", "그럼 내일 봬요"]
+
+    async def fake_api(audio_bytes: bytes, filename: str) -> str:
+        return parts[audio_bytes[0]]
+
+    monkeypatch.setattr(stt_service, "transcribe_with_api", fake_api)
+    pcm, chunks = _numbered_pcm(3)
+    chunks[1] = (*chunks[1][:2], True)
+
+    assert asyncio.run(stt_service.transcribe_chunks(pcm, chunks)) == "오늘은 날씨가 정말 좋네요 그럼 내일 봬요"
+
+
+def test_transcribe_chunks_failure_cancels_rest_and_raises_upstream_error(monkeypatch):
+    state = _stub_chunks(monkeypatch, delays=[0.01, 1.0, 1.0, 1.0], fail_at=0)
+    pcm, chunks = _numbered_pcm(4)
+
+    with pytest.raises(UpstreamError):
+        asyncio.run(stt_service.transcribe_chunks(pcm, chunks))
+    assert state["cancelled"] == 3
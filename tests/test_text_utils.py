@@ -0,0 +1,33 @@
+from app.utils.text_utils import join_overlapping
+
+
+def test_drops_repeated_words_at_the_seam():
+    assert join_overlapping("a b c d e", "d e f g") == "a b c d e f g"
+
+
+def test_no_overlap_concatenates():
+    assert join_overlapping("hello world", "foo bar") == "hello world foo bar"
+    assert join_overlapping("", "foo bar") == "foo bar"
+    assert join_overlapping("hello world", "") == "hello world"
+
+
+def test_right_entirely_inside_overlap():
+    assert join_overlapping("a b c d", "c d") == "a b c d"
+    assert join_overlapping("a b c d", "a b c d") == "a b c d"
+
+
+def test_word_cut_at_boundary_uses_right_side():
+    assert join_overlapping("오늘 날씨가 좋", "날씨가 좋네요 정말") == "오늘 날씨가 좋네요 정말"
+
+
+def test_ignores_punctuation_and_case():
+    assert join_overlapping("Hello, World.", "world. next one") == "Hello, world. next one"
+
+
+def test_match_far_from_the_seam_is_not_an_overlap():
+    assert join_overlapping("a b c d e f", "b x y z") == "a b c d e f b x y z"
+
+
+def test_only_looks_at_the_window():
+    left = " ".join(f"w{i}" for i in range(30))
+    assert join_overlapping(left, "w5 new", window=10) == f"{left} w5 new"
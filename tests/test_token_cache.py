@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.dependencies import ALGORITHM, ISSUER, TokenCache, authenticate
+
+
+def _token(key: str = "current", **claims) -> str:
+    payload = {"sub": "42", "username": "tester", "iss": ISSUER, "exp": int(time.time()) + 60, **claims}
+    payload = {name: value for name, value in payload.items() if value is not None}
+    return jwt.encode(payload, key, algorithm=ALGORITHM)
+
+
+def _assert_unauthorized(cache: TokenCache, token: str):
+    with pytest.raises(HTTPException) as info:
+        cache.authenticate(token)
+    assert info.value.status_code == 401
+
+
+def test_valid_token_is_cached():
+    cache = TokenCache(["current"])
+    token = _token()
+    assert cache.authenticate(token) == {"id": "42", "username": "tester"}
+    assert cache.authenticate(token) == {"id": "42", "username": "tester"}
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_rejects_expired_wrong_issuer_and_bad_signature():
+    cache = TokenCache(["current"])
+    _assert_unauthorized(cache, _token(exp=int(time.time()) - 10))
+    _assert_unauthorized(cache, _token(iss="someone-else"))
+    _assert_unauthorized(cache, _token(key="other"))
+    _assert_unauthorized(cache, "not-a-jwt")
+    assert cache.stats()["entries"] == 0
+
+
+def test_rejects_missing_claims():
+    cache = TokenCache(["current"])
+    _assert_unauthorized(cache, _token(username=None))
+    _assert_unauthorized(cache, _token(sub=None))
+
+
+def test_cached_entry_expires_with_token(monkeypatch):
+    cache = TokenCache(["current"])
+    exp = int(time.time()) + 60
+    token = _token(exp=exp)
+    cache.authenticate(token)
+    cache.authenticate(token)
+    assert cache.stats()["hits"] == 1
+
+    # 캐시 시계만 exp 이후로 옮기면 캐시를 쓰지 않고 다시 검증함
+    monkeypatch.setattr("app.dependencies.time.time", lambda: exp + 1)
+    cache.authenticate(token)
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 2)
+
+
+def test_key_rotation_accepts_previous_keys_and_clears_cache():
+    cache = TokenCache(["old"])
+    old_token = _token(key="old")
+    cache.authenticate(old_token)
+
+    cache.set_keys("new", ["old"])
+    assert cache.stats()["entries"] == 0
+    assert cache.authenticate(old_token)["id"] == "42"
+    assert cache.authenticate(_token(key="new"))["id"] == "42"
+
+    # 이전 키를 목록에서 빼면 캐시에 남아 있던 토큰도 더는 통과하지 않음
+    cache.set_keys("new")
+    _assert_unauthorized(cache, old_token)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TokenCache(["current"], max_entries=2)
+    first, second, third = (_token(sub=str(n)) for n in range(3))
+    cache.authenticate(first)
+    cache.authenticate(second)
+    cache.authenticate(first)  # first를 최근 사용으로 올림
+    cache.authenticate(third)  # second가 밀려남
+    assert cache.stats()["entries"] == 2
+
+    hits = cache.stats()["hits"]
+    cache.authenticate(first)
+    assert cache.stats()["hits"] == hits + 1
+    cache.authenticate(second)
+    assert cache.stats()["hits"] == hits + 1
+
+
+def test_missing_cookie_is_unauthorized():
+    with pytest.raises(HTTPException) as info:
+        authenticate(None)
+    assert info.value.status_code == 401
@@ -0,0 +1,66 @@
+import numpy as np
+
+from app.utils.audio_decode import SAMPLE_RATE
+from app.utils.vad import VAD_FRAME_MS, chunk_bounds, frame_levels
+
+FRAME = SAMPLE_RATE * VAD_FRAME_MS // 1000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16)
+
+
+def _assert_covers(pcm: np.ndarray, bounds: list[tuple[int, int, bool]]):
+    assert bounds[0][0] == 0
+    assert bounds[-1][1] == len(pcm)
+    assert not bounds[0][2]
+    for (start, end, _), (next_start, _, overlapped) in zip(bounds, bounds[1:]):
+        assert start < end
+        assert (next_start < end) == overlapped
+        assert next_start <= end
+
+
+def test_short_audio_is_one_chunk():
+    # chunk_s + search_s보다 짧으면 자르지 않음
+    pcm = _tone(2.9)
+    assert chunk_bounds(pcm, chunk_s=2.0, search_s=1.0) == [(0, len(pcm), False)]
+
+
+def test_cuts_on_silence_without_overlap():
+    # 1.7초 발화 + 0.3초 쉼을 반복하면 경계는 모두 쉼 안에 놓이고 겹치지 않음
+    pcm = np.concatenate([np.concatenate([_tone(1.7), _silence(0.3)]) for _ in range(5)])
+    bounds = chunk_bounds(pcm, chunk_s=2.0, overlap_s=1.0, search_s=1.0)
+
+    assert len(bounds) > 1
+    _assert_covers(pcm, bounds)
+    levels = frame_levels(pcm, FRAME)
+    for start, end, overlapped in bounds[1:]:
+        assert not overlapped
+        assert levels[start // FRAME] < -100
+    for (_, end, _), (next_start, _, _) in zip(bounds, bounds[1:]):
+        assert end == next_start
+
+
+def test_continuous_speech_overlaps_by_overlap_seconds():
+    pcm = _tone(10.0)
+    bounds = chunk_bounds(pcm, chunk_s=2.0, overlap_s=1.0, search_s=1.0)
+
+    assert len(bounds) > 1
+    _assert_covers(pcm, bounds)
+    half = int(1.0 * SAMPLE_RATE / 2)
+    for (_, end, _), (next_start, _, overlapped) in zip(bounds, bounds[1:]):
+        assert overlapped
+        assert end - next_start == 2 * half
+    # 마지막 구간이 지나치게 짧아지지 않음
+    assert bounds[-1][1] - bounds[-1][0] >= 2.0 * SAMPLE_RATE
+
+
+def test_chunk_lengths_stay_near_target():
+    pcm = _tone(20.0)
+    for start, end, _ in chunk_bounds(pcm, chunk_s=4.0, overlap_s=0.5, search_s=1.0)[:-1]:
+        assert 3.0 * SAMPLE_RATE <= end - start <= 4.5 * SAMPLE_RATE